@@ -19,6 +19,10 @@ if any(x in sys.argv for x in freeze_cmds):
     #
     from cx_Freeze import setup, Executable
 
+    # decode the images into the bundle, so the frozen game starts quickly.
+    from stuntcat.bundle import main as build_bundle
+    build_bundle([])
+
     import cx_Freeze.hooks
     if not hasattr(cx_Freeze.hooks, 'load_pymunk'):
         def load_pymunk(finder, module):
@@ -42,7 +46,8 @@ if any(x in sys.argv for x in freeze_cmds):
     # Dependencies are automatically detected, but it might need fine tuning.
     build_exe_options = {
         "packages": [
-            "os", "pygame", "sys", "typing", "random", "pyscroll", "pytmx", "thorpy", "pymunk"
+            "os", "pygame", "sys", "typing", "random", "pyscroll", "pytmx", "thorpy", "pymunk",
+            "numpy",
         ],
         "excludes": ["tkinter"],
     }
@@ -99,6 +104,7 @@ setup(
         "pytmx",
         "thorpy",
         "pymunk>=5.4.2",
+        "numpy",
     ],
     version=__version__,
     extras_require={
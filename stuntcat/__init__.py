@@ -3,6 +3,15 @@ Stuntcat the game
 """
 __version__ = "0.2.1.dev1"
 
-from stuntcat import game
+
+def __getattr__(name):
+    """Import the game when it is first asked for, so importing is quick."""
+    if name == "game":
+        # pylint:disable=import-outside-toplevel
+        from stuntcat import game
+
+        return game
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
 
 __all__ = ["game"]
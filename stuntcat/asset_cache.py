@@ -0,0 +1,187 @@
+""" A memory limited cache of loaded images, sounds and maps.
+
+Every asset has an estimate of the memory it uses. When the cache goes
+over its budget, the least recently used assets are dropped, and will
+be loaded again if they are asked for. Scenes pin the assets they need,
+so those are never dropped while the scene is running.
+
+::Example::
+
+    >>> cache = AssetCache(max_bytes=64 * 1024 * 1024)
+    >>> cache.put(("image", "shark.png", False, True), shark_surf)
+    >>> cache.pin(scene, [("image", "shark.png", False, True)])
+    >>> cache.get(("image", "shark.png", False, True))
+    >>> cache.release(scene)
+    >>> cache.stats()
+
+"""
+from collections import OrderedDict
+
+import pygame
+
+from stuntcat.rotation_cache import surface_bytes
+
+
+def sound_bytes(asound):
+    """
+    Estimate the memory used by the samples of a sound.
+
+    :param asound: the pygame.mixer.Sound.
+    """
+    init = pygame.mixer.get_init()
+    if not init:
+        return 0
+    frequency, size, channels = init
+    return int(asound.get_length() * frequency) * channels * (abs(size) // 8)
+
+
+def asset_bytes(value):
+    """
+    Estimate the memory used by an asset.
+
+    :param value: a surface, sound or map.
+    """
+    if isinstance(value, pygame.Surface):
+        return surface_bytes(value)
+    if pygame.mixer and isinstance(value, pygame.mixer.Sound):
+        return sound_bytes(value)
+    # a map, with a list of tile or chunk images.
+    return sum(
+        surface_bytes(image)
+        for image in getattr(value, "images", ())
+        if isinstance(image, pygame.Surface)
+    )
+
+
+class AssetCache:
+    """
+    Loaded assets by key, least recently used dropped first.
+
+    Keys are asset tuples, like ("image", "shark.png", False, True).
+
+    :param max_bytes: most memory to use, None for no limit.
+    """
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self._assets = OrderedDict()
+        self._sizes = {}
+        self._pins = {}
+
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._assets)
+
+    def __contains__(self, key):
+        return key in self._assets
+
+    def get(self, key):
+        """
+        Return a cached asset.
+
+        :param key: the asset tuple.
+        :return: the asset, or None if it is not loaded.
+        """
+        value = self._assets.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._assets.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """
+        Add an asset, dropping old ones if over budget.
+
+        :param key: the asset tuple.
+        :param value: the loaded asset.
+        :return: the asset.
+        """
+        self.discard(key)
+        self._assets[key] = value
+        self._sizes[key] = asset_bytes(value)
+        self.bytes += self._sizes[key]
+        self._evict(keep=key)
+        return value
+
+    def discard(self, key):
+        """
+        Drop an asset, if it is cached.
+
+        :param key: the asset tuple.
+        """
+        if key in self._assets:
+            del self._assets[key]
+            self.bytes -= self._sizes.pop(key)
+
+    def _evict(self, keep=None):
+        """Drop unpinned assets, oldest first, until under budget."""
+        if self.max_bytes is None or self.bytes <= self.max_bytes:
+            return
+        for key in list(self._assets):
+            if self.bytes <= self.max_bytes:
+                break
+            if key == keep or key in self._pins:
+                continue
+            self.discard(key)
+            self.evictions += 1
+
+    def pin(self, owner, keys):
+        """
+        Keep assets while an owner, like a scene, needs them.
+
+        Assets can be pinned before they are loaded.
+
+        :param owner: who needs them, passed to release() later.
+        :param keys: the asset tuples.
+        """
+        for key in keys:
+            self._pins.setdefault(key, set()).add(owner)
+
+    def release(self, owner):
+        """
+        Let the assets pinned by an owner be dropped again.
+
+        :param owner: as passed to pin().
+        """
+        for key in list(self._pins):
+            owners = self._pins[key]
+            owners.discard(owner)
+            if not owners:
+                del self._pins[key]
+        self._evict()
+
+    def pinned(self):
+        """
+        How much memory the pinned assets use.
+        """
+        return sum(self._sizes.get(key, 0) for key in self._pins)
+
+    def clear(self):
+        """
+        Forget all of the assets, and pins.
+        """
+        self._assets.clear()
+        self._sizes.clear()
+        self._pins.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """
+        Counters, for showing how well the cache works.
+
+        :return: dict of entries, bytes, pinned_bytes, hits, misses and evictions.
+        """
+        return {
+            "entries": len(self._assets),
+            "bytes": self.bytes,
+            "pinned_bytes": self.pinned(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,218 @@
+""" Which assets each scene needs, and loading them ahead of time.
+
+The manifest lists the images, sounds and maps of a scene. A Preloader
+decodes them on a thread pool, while the LoadingScene shows how
+far along it is. Then the scene finds everything in the resources
+caches, and creating it doesn't touch the disk.
+
+::Example::
+
+    >>> preloader = Preloader(MANIFEST["CatUniScene"])
+    >>> preloader.start()
+    >>> # each frame
+    >>> preloader.update()
+    >>> preloader.progress
+    0.5
+
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from stuntcat import resources
+
+
+def image(name, convert=False, convert_alpha=False):
+    """An image asset, loaded like gfx(name, convert, convert_alpha)."""
+    return ("image", name, convert, convert_alpha)
+
+
+def sound(name):
+    """A sound asset, loaded like sfx(name)."""
+    return ("sound", name, False, False)
+
+
+def tmx_map(name):
+    """A map asset, loaded like tmx_map(name)."""
+    return ("map", name, False, False)
+
+
+MANIFEST = {
+    "CatUniScene": [
+        image("background.png", convert=True),
+        image("cat_unicycle1.png", convert_alpha=True),
+        image("cat_unicycle2.png", convert_alpha=True),
+        image("cat_unicycle3.png", convert_alpha=True),
+        image("cat_unicycle4.png", convert_alpha=True),
+        image("fish_red.png", convert_alpha=True),
+        image("fish_yellow.png", convert_alpha=True),
+        image("fish_green.png", convert_alpha=True),
+        image("ring.png", convert_alpha=True),
+        image("shark.png", convert_alpha=True),
+        image("shark_laser.png", convert_alpha=True),
+        sound("cat_jump.ogg"),
+        sound("eatfish.ogg"),
+        sound("splash.ogg"),
+        sound("cat_crash.ogg"),
+        sound("foot_elephant.ogg"),
+        sound("default_shark.ogg"),
+        sound("shark_appear.ogg"),
+        sound("shark_attacks.ogg"),
+        sound("shark_gone.ogg"),
+        sound("shark_lazer.ogg"),
+        sound("applause.ogg"),
+        sound("cat_shot.ogg"),
+        sound("boo.ogg"),
+        sound("cat_meow01.ogg"),
+        sound("cat_meow02.ogg"),
+        sound("cat_meow03.ogg"),
+        sound("boing1.ogg"),
+        sound("boing2.ogg"),
+        sound("boing3.ogg"),
+        sound("unicycle.ogg"),
+    ],
+    "PlatformerScene": [
+        image("background.png", convert=True),
+        image("cat.png", convert_alpha=True),
+        image("wheel.png", convert_alpha=True),
+        image("seat.png", convert_alpha=True),
+        image("yarnball.png", convert_alpha=True),
+        sound("cat_wheel.ogg"),
+        sound("cat_jump.ogg"),
+        tmx_map("untitled.tmx"),
+    ],
+}
+
+
+def _can_load(asset):
+    """Sounds can only be loaded when the mixer is working."""
+    return asset[0] != "sound" or bool(pygame.mixer and pygame.mixer.get_init())
+
+
+def _decode(asset):
+    """
+    The part of loading an asset that can happen in another thread.
+
+    Maps convert their tiles as they load, so they are left for the
+    main thread.
+    """
+    kind, name = asset[:2]
+    if kind == "image":
+        return resources.decode_image(name)
+    if kind == "sound":
+        return resources.decode_sound(name)
+    return None
+
+
+def _store(asset, decoded):
+    """The main thread part of loading, putting it in the caches."""
+    kind, name, convert, convert_alpha = asset
+    if kind == "image":
+        resources.cache_gfx(name, decoded, convert, convert_alpha)
+    elif kind == "sound":
+        resources.cache_sfx(name, decoded)
+    else:
+        resources.tmx_map(name)
+
+
+def load_assets(assets, owner=None):
+    """
+    Load assets straight away, skipping ones already loaded.
+
+    :param assets: list of assets, like MANIFEST["CatUniScene"].
+    :param owner: pin the assets in the cache for this, like a scene.
+                  Give it to resources.CACHE.release() when done.
+    """
+    if owner is not None:
+        resources.CACHE.pin(owner, assets)
+    assets = [asset for asset in assets if _can_load(asset)]
+    resources.load_batch(
+        images=[asset[1:] for asset in assets if asset[0] == "image"],
+        sounds=[asset[1] for asset in assets if asset[0] == "sound"],
+    )
+    for asset in assets:
+        if asset[0] == "map":
+            resources.tmx_map(asset[1])
+
+
+class Preloader:
+    """
+    Loads assets in the background.
+
+    Images and sounds are decoded on a thread pool. Converting images for
+    the display and storing them happens in update(), a few milliseconds
+    a frame, as pygame surfaces can only be converted on the main thread.
+
+    :param assets: list of assets, like MANIFEST["CatUniScene"].
+    :param max_workers: threads to decode with, picked by python if None.
+    """
+
+    def __init__(self, assets, max_workers=None):
+        self.assets = [
+            asset
+            for asset in assets
+            if _can_load(asset) and not resources.is_cached(*asset)
+        ]
+        self.loaded = 0
+        self.max_workers = max_workers
+        self._executor = None
+        self._futures = None
+
+    def start(self):
+        """Start decoding in the background."""
+        if self._futures is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            self._futures = [
+                self._executor.submit(_decode, asset) for asset in self.assets
+            ]
+            # the threads exit once the queued decodes are done.
+            self._executor.shutdown(wait=False)
+
+    def cancel(self):
+        """
+        Stop decoding, waiting for the assets already being decoded.
+
+        Call before pygame.quit(), as decoding needs pygame.
+        """
+        if self._futures is not None:
+            for future in self._futures:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+
+    @property
+    def done(self):
+        """Are all of the assets loaded?"""
+        return self.loaded == len(self.assets)
+
+    @property
+    def progress(self):
+        """How much is loaded, from 0.0 to 1.0."""
+        if not self.assets:
+            return 1.0
+        return self.loaded / float(len(self.assets))
+
+    def _store_next(self):
+        """Store the next asset, in manifest order, waiting for it."""
+        _store(self.assets[self.loaded], self._futures[self.loaded].result())
+        self.loaded += 1
+
+    def update(self, budget=5.0):
+        """
+        Store decoded assets, for up to budget ms. Call every frame.
+
+        :param budget: about how many ms to spend.
+        """
+        if self._futures is None:
+            return
+        end_time = time.perf_counter() + budget / 1000.0
+        while not self.done and time.perf_counter() < end_time:
+            if not self._futures[self.loaded].done():
+                break
+            self._store_next()
+
+    def finish(self):
+        """Wait for the rest of the assets to load."""
+        self.start()
+        while not self.done:
+            self._store_next()
@@ -0,0 +1,182 @@
+""" A single file of already decoded images, for starting quickly.
+
+Decoding PNGs is slow, and opening many files is slow on some disks,
+and when frozen. The bundle has the raw RGBA pixels of every image in
+data/images, one after another, with an index at the start. It is
+memory mapped, and surfaces are made straight from the mapped pixels.
+
+Build it after changing any images:
+
+    python -m stuntcat.bundle
+
+resources.gfx uses it if it is there, otherwise it loads the PNGs. The
+size, modified time and hash of each PNG are kept in the index, so a PNG
+changed since the bundle was built is loaded instead of its old pixels.
+
+::Example::
+
+    >>> bundle = ImageBundle('stuntcat/data/images.bundle')
+    >>> surf = bundle.load('shark.png')
+
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+
+import pygame
+
+from stuntcat.cache_paths import data_path, file_hash
+
+MAGIC = b"STUNTCAT"
+BUNDLE_VERSION = 2
+BUNDLE_NAME = "images.bundle"
+_HEADER = struct.Struct("<8sII")  # magic, version, index size.
+_ALIGN = 64
+
+# pygame 2 renamed tostring to tobytes.
+_TOBYTES = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+
+
+def surface_pixels(surf, pixel_format="RGBA"):
+    """
+    The pixels of a surface as bytes, for the bundle and baked maps.
+
+    :param surf: the surface.
+    :param pixel_format: like "RGBA" or "RGB".
+    """
+    return _TOBYTES(surf, pixel_format)
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def build_bundle(images_path, bundle_path):
+    """
+    Decode every image in a directory, and write them into a bundle.
+
+    :param images_path: directory of images.
+    :param bundle_path: the bundle file to write.
+    :return: how many images were written.
+    """
+    names = sorted(
+        name
+        for name in os.listdir(images_path)
+        if name.lower().endswith((".png", ".jpg", ".bmp", ".gif"))
+    )
+    pixels = []
+    index = {}
+    for name in names:
+        path = os.path.join(images_path, name)
+        surf = pygame.image.load(path)
+        pixels.append(surface_pixels(surf))
+        stat = os.stat(path)
+        index[name] = [
+            0,
+            surf.get_width(),
+            surf.get_height(),
+            stat.st_size,
+            stat.st_mtime_ns,
+            file_hash(path),
+        ]
+
+    # the pixels start after the header and index, so offsets depend on
+    # the index size. Offsets are padded to a fixed width to settle it.
+    index_size = len(json.dumps(index)) + len(names) * 12
+    offset = _aligned(_HEADER.size + index_size)
+    for name, data in zip(names, pixels):
+        index[name][0] = offset
+        offset = _aligned(offset + len(data))
+    index_bytes = json.dumps(index).encode("utf-8").ljust(index_size)
+
+    with open(bundle_path, "wb") as bundle_file:
+        bundle_file.write(_HEADER.pack(MAGIC, BUNDLE_VERSION, index_size))
+        bundle_file.write(index_bytes)
+        for name, data in zip(names, pixels):
+            bundle_file.seek(index[name][0])
+            bundle_file.write(data)
+    return len(names)
+
+
+class ImageBundle:
+    """
+    A memory mapped bundle made by build_bundle.
+
+    The mapping is copy on write, so drawing on a loaded surface
+    changes that surface only, and never the file.
+
+    :param path: the bundle file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as bundle_file:
+            magic, version, index_size = _HEADER.unpack(
+                bundle_file.read(_HEADER.size)
+            )
+            if magic != MAGIC or version != BUNDLE_VERSION:
+                raise ValueError(
+                    "%s is not a version %s bundle" % (path, BUNDLE_VERSION)
+                )
+            self.index = json.loads(bundle_file.read(index_size).decode("utf-8"))
+            self._map = mmap.mmap(bundle_file.fileno(), 0, access=mmap.ACCESS_COPY)
+        self._view = memoryview(self._map)
+        self._current = {}
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def is_current(self, name, source_path):
+        """
+        Is the bundled image the same as its source file?
+
+        Checked by size and modified time, and by hash if only the time
+        changed, like after a fresh checkout.
+
+        :param name: image file name.
+        :param source_path: the image file it was decoded from.
+        :return: True if it is, or if the source file isn't there.
+        """
+        if name not in self._current:
+            try:
+                stat = os.stat(source_path)
+            except OSError:
+                return True  # only the bundle was shipped.
+            size, mtime_ns, sha1 = self.index[name][3:]
+            self._current[name] = stat.st_size == size and (
+                stat.st_mtime_ns == mtime_ns or file_hash(source_path) == sha1
+            )
+        return self._current[name]
+
+    def load(self, name):
+        """
+        Make a surface of an image, using the mapped pixels.
+
+        :param name: image file name.
+        :return: a 32 bit RGBA surface, not converted for the display.
+        """
+        offset, width, height = self.index[name][:3]
+        data = self._view[offset : offset + width * height * 4]
+        return pygame.image.frombuffer(data, (width, height), "RGBA")
+
+
+def main(args=None):
+    """
+    Build the bundle for the game data.
+
+    :param args: optional directory of images, and bundle path.
+    """
+    args = sys.argv[1:] if args is None else args
+    images_path = args[0] if args else os.path.join(data_path(), "images")
+    if len(args) > 1:
+        bundle_path = args[1]
+    else:
+        bundle_path = os.path.join(data_path(), BUNDLE_NAME)
+    count = build_bundle(images_path, bundle_path)
+    print("%s images bundled into %s" % (count, bundle_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+""" Where the game data is, and where things made from it are cached.
+
+Caches of decoded sounds and baked maps go in the user cache directory,
+and are named by a hash of the file they were made from, so they are
+made again when it changes.
+
+::Example::
+
+    >>> default_cache_path("maps")
+    '/home/cat/.cache/stuntcat/maps'
+    >>> file_hash(os.path.join(data_path(), "maps", "untitled.tmx"))
+    '3f786850e387550fdab836ed7e6dc881de23001b'
+
+"""
+import hashlib
+import os
+
+
+def data_path():
+    """
+    Get the path for the data directory.
+
+    :return: The path.
+    """
+    if os.path.exists("data"):
+        path = "data"
+    else:
+        path = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            "data",
+        )
+    return path
+
+
+def default_cache_path(name="sounds"):
+    """
+    A directory in the stuntcat user cache directory.
+
+    :param name: directory in the stuntcat cache, for each thing cached.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "stuntcat", name)
+
+
+def file_hash(path):
+    """
+    sha1 hex digest of a file.
+
+    :param path: the file.
+    """
+    with open(path, "rb") as afile:
+        return hashlib.sha1(afile.read()).hexdigest()
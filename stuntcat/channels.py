@@ -0,0 +1,180 @@
+""" For sharing the mixer channels between the sound effects.
+
+Sounds play in named groups of channels, so a burst of boings can't use
+up the channels the cat being shot needs. Each sound has a priority and
+a most voices it can play at once. When a group is full, the new sound
+takes the channel of a lower priority one, or is dropped.
+
+::Example::
+
+    >>> channels = ChannelManager()
+    >>> channels.play(sfx('boing1.ogg'), 'boing1.ogg')
+    >>> channels.stats()
+    {'played': 1, 'stolen': 0, 'limited': 0, 'dropped': 0, ...}
+
+"""
+from collections import Counter
+
+import pygame
+
+# group name: how many channels it has.
+GROUPS = {
+    "cat": 3,
+    "shark": 3,
+    "effects": 6,
+    "crowd": 2,
+    "loops": 2,
+}
+
+# sound name: (group, priority, most voices at once). Higher priority
+# sounds steal channels from lower ones.
+SOUNDS = {
+    "cat_shot.ogg": ("cat", 10, 1),
+    "cat_crash.ogg": ("cat", 9, 1),
+    "cat_jump.ogg": ("cat", 4, 1),
+    "cat_wheel.ogg": ("cat", 4, 1),
+    "cat_meow01.ogg": ("cat", 3, 1),
+    "cat_meow02.ogg": ("cat", 3, 1),
+    "cat_meow03.ogg": ("cat", 3, 1),
+    "shark_lazer.ogg": ("shark", 8, 2),
+    "shark_attacks.ogg": ("shark", 7, 1),
+    "shark_appear.ogg": ("shark", 6, 1),
+    "shark_gone.ogg": ("shark", 6, 1),
+    "default_shark.ogg": ("shark", 5, 1),
+    "foot_elephant.ogg": ("effects", 6, 1),
+    "eatfish.ogg": ("effects", 5, 2),
+    "splash.ogg": ("effects", 3, 2),
+    "boing1.ogg": ("effects", 2, 1),
+    "boing2.ogg": ("effects", 2, 1),
+    "boing3.ogg": ("effects", 2, 1),
+    "applause.ogg": ("crowd", 2, 1),
+    "boo.ogg": ("crowd", 2, 1),
+    "unicycle.ogg": ("loops", 10, 1),
+}
+
+# for sounds not in SOUNDS.
+DEFAULT_SOUND = ("effects", 0, 2)
+
+
+class ChannelManager:
+    """
+    Plays sounds on reserved channels, in groups, by priority.
+
+    The channels are reserved, so pygame won't pick them for sounds
+    played straight with Sound.play().
+
+    :param groups: group name to number of channels, like GROUPS.
+    :param sounds: sound name to (group, priority, max voices), like SOUNDS.
+    """
+
+    def __init__(self, groups=None, sounds=None):
+        self.groups = GROUPS if groups is None else groups
+        self.sounds = SOUNDS if sounds is None else sounds
+        self._channels = None
+        self._total = sum(self.groups.values())
+        # channel id: (sound name, priority, when it started).
+        self._voices = {}
+        self._started = 0
+
+        self.played = 0
+        self.stolen = 0
+        self.limited = 0
+        self.dropped = 0
+        self.dropped_sounds = Counter()
+
+    def _setup(self):
+        """Reserve the channels, once the mixer is going."""
+        if pygame.mixer.get_num_channels() < self._total:
+            pygame.mixer.set_num_channels(self._total)
+        pygame.mixer.set_reserved(self._total)
+        self._voices.clear()
+
+        self._channels = {}
+        first = 0
+        for name, count in self.groups.items():
+            self._channels[name] = list(range(first, first + count))
+            first += count
+
+    def _playing(self, channel_id):
+        """The voice on a channel, or None if it has finished."""
+        voice = self._voices.get(channel_id)
+        if voice is not None and not pygame.mixer.Channel(channel_id).get_busy():
+            del self._voices[channel_id]
+            voice = None
+        return voice
+
+    def _pick_channel(self, name, group, priority, max_voices):
+        """
+        Find a channel for a sound, counting what had to happen.
+
+        :return: channel id, or None to drop the sound.
+        """
+        free = []
+        same = []
+        others = []
+        for channel_id in self._channels[group]:
+            voice = self._playing(channel_id)
+            if voice is None:
+                free.append(channel_id)
+            elif voice[0] == name:
+                same.append((voice[2], channel_id))
+            else:
+                others.append((voice[1], voice[2], channel_id))
+
+        if len(same) >= max_voices:
+            # too many of this sound, restart the oldest one.
+            self.limited += 1
+            return min(same)[1]
+        if free:
+            return free[0]
+
+        stealable = [voice for voice in others if voice[0] <= priority]
+        if stealable:
+            # the lowest priority, then the oldest.
+            self.stolen += 1
+            return min(stealable)[2]
+        return None
+
+    def play(self, asound, name, loops=0, fade_ms=0):
+        """
+        Play a sound in its group.
+
+        :param asound: the pygame.mixer.Sound.
+        :param name: the sound file name, to look up in sounds.
+        :param loops: as for Sound.play.
+        :param fade_ms: as for Sound.play.
+        :return: the Channel it plays on, or None if it was dropped.
+        """
+        if not pygame.mixer.get_init():
+            return None
+        if self._channels is None or pygame.mixer.get_num_channels() < self._total:
+            # first time, or the mixer was started again.
+            self._setup()
+
+        group, priority, max_voices = self.sounds.get(name, DEFAULT_SOUND)
+        channel_id = self._pick_channel(name, group, priority, max_voices)
+        if channel_id is None:
+            self.dropped += 1
+            self.dropped_sounds[name] += 1
+            return None
+
+        channel = pygame.mixer.Channel(channel_id)
+        channel.play(asound, loops=loops, fade_ms=fade_ms)
+        self._started += 1
+        self._voices[channel_id] = (name, priority, self._started)
+        self.played += 1
+        return channel
+
+    def stats(self):
+        """
+        Counters, for showing how often sounds were cut off.
+
+        :return: dict of played, stolen, limited, dropped and dropped_sounds.
+        """
+        return {
+            "played": self.played,
+            "stolen": self.stolen,
+            "limited": self.limited,
+            "dropped": self.dropped,
+            "dropped_sounds": dict(self.dropped_sounds),
+        }
@@ -17,19 +17,24 @@ LOCAL_PATH = os.path.abspath(os.path.dirname(__file__))
 # except ImportError:
 #     LOCAL_PATH = os.path.split(os.path.abspath(sys.argv[0]))[0]
 
-try:
-    import pygame as pg
-except ImportError:
-    pg = None
-    raise ImportError( # pylint:disable=raise-missing-from
-        "Cannot import pygame, install version 1.9.4 or higher"
-    )
+def import_pygame():
+    """
+    Import pygame when it is needed, so --help and friends are quick.
+    """
+    # pylint:disable=import-outside-toplevel
+    try:
+        import pygame
+    except ImportError:
+        raise ImportError( # pylint:disable=raise-missing-from
+            "Cannot import pygame, install version 1.9.4 or higher"
+        )
+    return pygame
 
 
 try:
-    from .main import main
+    from .main import main, parse_args
 except ImportError:
-    from stuntcat.main import main
+    from stuntcat.main import main, parse_args
 
 
 class Cli:
@@ -53,6 +58,9 @@ class Cli:
         """
         Main function
         """
+        # paths on the command line are relative to where we started.
+        options = parse_args()
+
         # figure out our directories
         # first try to get the path from the stuntcat package.
         testdata = LOCAL_PATH
@@ -77,7 +85,7 @@ class Cli:
         # run game and protect from exceptions
         try:
             # import pdb;pdb.set_trace()
-            main()
+            main(options)
         except KeyboardInterrupt:
             print("Keyboard Interrupt (Control-C)...")
         except Exception as err:
@@ -99,6 +107,7 @@ class Cli:
         Only returns if everything looks ok
         """
         msgs = []
+        pg = import_pygame()
 
         # make sure this looks like the right directory
         if not os.path.isdir(self.code_dir):
@@ -115,11 +124,10 @@ class Cli:
             msgs.append("Requires pygame 1.9.4 or Greater, You Have " + pg.ver)
 
         # check that we have FONT and IMAGE
-        if pg:
-            if not pg.font:
-                msgs.append("pg requires the SDL_ttf library, not available")
-            if not (pg.image and pg.image.get_extended()):
-                msgs.append("pg requires the SDL_image library, not available")
+        if not pg.font:
+            msgs.append("pg requires the SDL_ttf library, not available")
+        if not (pg.image and pg.image.get_extended()):
+            msgs.append("pg requires the SDL_image library, not available")
 
         if msgs:
             msg = "\n".join(msgs)
@@ -158,6 +166,7 @@ class Cli:
 
     @staticmethod
     def __pgbox(title, message):
+        pg = import_pygame()
         try:
             pg.quit()  # clean out anything running
             pg.display.init()
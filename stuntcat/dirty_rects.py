@@ -0,0 +1,231 @@
+""" For updating only the changed parts of the display, when that is faster.
+
+Scenes return the rects they drew to. Updating a few small rects is
+much faster than the whole display, but many rects covering most of the
+screen can be slower than one full flip. Overlapping rects also update
+the same pixels twice.
+
+DirtyRectUpdater merges overlapping rects, then updates them, or flips
+the whole display when they cover more than a threshold area. The
+threshold is measured as the game runs, by timing both kinds of update.
+Updating rects costs a fixed overhead and a time per pixel, which are
+fitted to the timings. Now and then rects are updated even when a flip
+is expected to be faster, so their timing can't go stale.
+
+::Example::
+
+    >>> updater = DirtyRectUpdater(screen.get_rect())
+    >>> updater.update(rects)
+    >>> updater.describe()
+    '12 rects, 8.1% area, 0.4% overlap, 3 merged, partial'
+
+"""
+import time
+
+import pygame
+
+
+def union_area(rects):
+    """
+    The area covered by some rects, counting overlaps once.
+
+    :param rects: list of pygame.Rect.
+    """
+    rects = [rect for rect in rects if rect.width > 0 and rect.height > 0]
+    if not rects:
+        return 0
+    # sweep over the x edges, adding up the covered y lengths between them.
+    edges = sorted({rect.left for rect in rects} | {rect.right for rect in rects})
+    area = 0
+    for left, right in zip(edges, edges[1:]):
+        spans = sorted(
+            (rect.top, rect.bottom)
+            for rect in rects
+            if rect.left <= left and rect.right >= right
+        )
+        covered = 0
+        top = bottom = None
+        for span_top, span_bottom in spans:
+            if bottom is None or span_top > bottom:
+                if bottom is not None:
+                    covered += bottom - top
+                top, bottom = span_top, span_bottom
+            else:
+                bottom = max(bottom, span_bottom)
+        if bottom is not None:
+            covered += bottom - top
+        area += covered * (right - left)
+    return area
+
+
+def merge_rects(rects):
+    """
+    Join overlapping rects into their bounding rects, until none overlap.
+
+    :param rects: list of pygame.Rect.
+    :return: new list of rects.
+    """
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        # keep joining while the bigger rect overlaps others.
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DirtyRectUpdater:  # pylint:disable=too-many-instance-attributes
+    """
+    Updates the display with the dirty rects, or a full flip.
+
+    :param screen_rect: the rect of the display.
+    :param full_fraction: flip when the rects cover more than this
+                          fraction of the screen, until it is measured.
+    :param smoothing: how fast the measured timings follow changes.
+    :param resample_frames: after this many full flips in a row, update
+                            rects instead, to time them again.
+    """
+
+    def __init__(
+        self, screen_rect, full_fraction=0.6, smoothing=0.1, resample_frames=60
+    ):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.full_fraction = full_fraction
+        self.smoothing = smoothing
+        self.resample_frames = resample_frames
+
+        # measured ms for a full flip, and for rect updates a fixed ms
+        # and ms per pixel of the merged rects.
+        self.full_ms = None
+        self.overhead_ms = 0.0
+        self.ms_per_pixel = None
+        # smoothed means of area, ms, area squared and area times ms of
+        # the rect updates, to fit overhead_ms and ms_per_pixel to.
+        self._means = None
+        self._full_streak = 0
+
+        # about the last frame.
+        self.count = 0
+        self.area = 0
+        self.overlap = 0
+        self.merged = 0
+        self.full = False
+
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def _smooth(self, old, new):
+        if old is None:
+            return new
+        return old + (new - old) * self.smoothing
+
+    def _fit(self, area, elapsed_ms):
+        """
+        Fit overhead_ms and ms_per_pixel to the timing of a rect update.
+
+        :param area: pixels in the merged rects updated.
+        :param elapsed_ms: how long the update took.
+        """
+        sample = (area, elapsed_ms, area * area, area * elapsed_ms)
+        if self._means is None:
+            self._means = sample
+        else:
+            self._means = tuple(
+                self._smooth(old, new) for old, new in zip(self._means, sample)
+            )
+        mean_area, mean_ms, mean_area2, mean_area_ms = self._means
+        variance = mean_area2 - mean_area * mean_area
+        covariance = mean_area_ms - mean_area * mean_ms
+        if variance > 1e-6 * mean_area2 and covariance > 0:
+            self.ms_per_pixel = covariance / variance
+            self.overhead_ms = max(0.0, mean_ms - self.ms_per_pixel * mean_area)
+        else:
+            # the areas were all about the same, so the overhead can't be
+            # told apart from the time per pixel yet.
+            self.ms_per_pixel = mean_ms / mean_area
+            self.overhead_ms = 0.0
+
+    @property
+    def threshold(self):
+        """
+        The fraction of the screen above which a full flip is used.
+        """
+        if self.full_ms is None or not self.ms_per_pixel:
+            return self.full_fraction
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        fraction = (self.full_ms - self.overhead_ms) / (
+            self.ms_per_pixel * screen_area
+        )
+        return min(1.0, max(0.0, fraction))
+
+    def update(self, rects):
+        """
+        Update the display with some dirty rects.
+
+        :param rects: list of pygame.Rect drawn to this frame.
+        """
+        rects = [self.screen_rect.clip(rect) for rect in rects]
+        covered = union_area(rects)
+        merged = merge_rects(rects)
+        screen_area = self.screen_rect.width * self.screen_rect.height
+
+        self.count = len(rects)
+        self.area = covered
+        self.overlap = sum(rect.width * rect.height for rect in rects) - covered
+        self.merged = len(rects) - len(merged)
+        # the merged rects are what is updated, so what is timed.
+        merged_area = sum(rect.width * rect.height for rect in merged)
+        self.full = merged_area > self.threshold * screen_area
+        if self.full and self._full_streak >= self.resample_frames:
+            self.full = False
+
+        start = time.perf_counter()
+        if self.full:
+            pygame.display.flip()
+            self.full_ms = self._smooth(
+                self.full_ms, (time.perf_counter() - start) * 1000
+            )
+            self.full_frames += 1
+            self._full_streak += 1
+        elif merged:
+            pygame.display.update(merged)
+            self._fit(merged_area, (time.perf_counter() - start) * 1000)
+            self.partial_frames += 1
+            self._full_streak = 0
+
+    def describe(self):
+        """
+        The last frame, for the profiler overlay.
+        """
+        screen_area = float(self.screen_rect.width * self.screen_rect.height)
+        return "%s rects, %.1f%% area, %.1f%% overlap, %s merged, %s" % (
+            self.count,
+            100 * self.area / screen_area,
+            100 * self.overlap / screen_area,
+            self.merged,
+            "full" if self.full else "partial",
+        )
+
+    def stats(self):
+        """
+        Counters about the last frame and all of them.
+
+        :return: dict of count, area, overlap, merged, full, threshold,
+                 overhead_ms, full_frames and partial_frames.
+        """
+        return {
+            "count": self.count,
+            "area": self.area,
+            "overlap": self.overlap,
+            "merged": self.merged,
+            "full": self.full,
+            "threshold": self.threshold,
+            "overhead_ms": self.overhead_ms,
+            "full_frames": self.full_frames,
+            "partial_frames": self.partial_frames,
+        }
@@ -1,9 +1,11 @@
 """
 Game Module
 """
+import contextlib
+import random
 import time
 
-from typing import List
+from typing import List, Optional
 
 try:
     import pygame
@@ -14,10 +16,13 @@ except ImportError as exc:
 
 
 from stuntcat.scenes import Scene
-from stuntcat.scenes import LoadingScene
-from stuntcat.scenes import CatUniScene
+from stuntcat.scenes.loading import LoadingScene
+from stuntcat.scenes.unisharklazer import CatUniScene
 
+from stuntcat.dirty_rects import DirtyRectUpdater
 from stuntcat.gifmaker import GifMaker
+from stuntcat.profiler import FrameProfiler
+from stuntcat.replay import ReplayRecorder
 
 
 class Game:
@@ -30,7 +35,10 @@ class Game:
     HEIGHT = 540
     FPS = 30
 
-    def __init__(self):
+    def __init__(self, seed=None):
+        """
+        :param seed: for the random numbers in the game, so it can be replayed.
+        """
         pygame.mixer.pre_init(44100, -16, 2, 512)
         pygame.init()
         pygame.font.init()
@@ -50,6 +58,8 @@ class Game:
             pass
 
         self.running = True
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.recorder = None  # type: Optional[ReplayRecorder]
 
         self.scenes = [
             LoadingScene(self),
@@ -59,6 +69,11 @@ class Game:
 
         self.gif_maker = GifMaker(seconds=2)
 
+        # F3 shows the frame timings, profile_path saves them on exit.
+        self.profile_path = None
+        self.profiler = FrameProfiler(budget=1000.0 / self.FPS)
+        self.dirty_rects = DirtyRectUpdater(self.screen.get_rect())
+
     def add_cat_scene(self):
         """
         Add the cat scene.
@@ -67,15 +82,26 @@ class Game:
         self.cat_scene.active = True
         self.scenes.append(self.cat_scene)
 
+    def _scene_phase(self, kind, scene):
+        """Profiler phase for one scene, like "tick:CatUniScene".
+
+        Inactive scenes are not timed, so they don't show as phases.
+        """
+        if not scene.active:
+            return contextlib.nullcontext()
+        return self.profiler.phase(kind + ":" + type(scene).__name__)
+
     def tick(self, time_delta):
         """
         Propagate a tick to the highest active scene.
         If a scene responds with a truthy value, the tick will
         continue to be propagated.
         """
-        for i in self.scenes[::-1]:
-            if i.active and not i.tick(time_delta):
-                break
+        with self.profiler.phase("tick"):
+            for i in self.scenes[::-1]:
+                with self._scene_phase("tick", i):
+                    if i.active and not i.tick(time_delta):
+                        break
 
         self.clock.tick(self.FPS)
 
@@ -92,28 +118,67 @@ class Game:
         # pygame.display.flip()
 
         all_rects = []
-        for ascene in self.scenes[::-1]:
-            if ascene.active:
-                rects = ascene.render()
-                if rects is not None:
-                    all_rects.extend(rects)
-                if not getattr(ascene, "propagate_render", False):
-                    break
+        with self.profiler.phase("render"):
+            for ascene in self.scenes[::-1]:
+                if ascene.active:
+                    with self._scene_phase("render", ascene):
+                        rects = ascene.render()
+                    if rects is not None:
+                        all_rects.extend(rects)
+                    if not getattr(ascene, "propagate_render", False):
+                        break
+            all_rects.extend(self.profiler.draw(self.screen))
         # print(all_rects)
-        pygame.display.update(all_rects)
+        with self.profiler.phase("display.update"):
+            self.dirty_rects.update(all_rects)
+        self.profiler.notes["dirty rects"] = self.dirty_rects.describe()
+        self.profiler.restore(self.screen)
 
     def events(self, events):
         """
         Standard event loop. Will propagate events to scenes
         following the same rules as tick and render.
+
+        :return: the events given while there was a cat scene, as it
+                 can start part way through them.
         """
-        for event in events:
-            if event.type == pygame.QUIT:
-                self.running = False
+        cat_events = []
+        with self.profiler.phase("events"):
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.running = False
+                self.profiler.event(event)
+                if self.cat_scene is not None:
+                    cat_events.append(event)
+
+                for i in self.scenes[::-1]:
+                    with self._scene_phase("events", i):
+                        if i.active and not i.event(event):
+                            break
+        return cat_events
+
+    def frame(self, time_delta, events=None):
+        """
+        Tick, render, then handle the events of one frame, recording it.
 
-            for i in self.scenes[::-1]:
-                if i.active and not i.event(event):
-                    break
+        :param time_delta: The time delta in ms.
+        :param events: the events, or None to get them after rendering.
+        :return: the events.
+        """
+        ticked = self.cat_scene is not None
+        self.tick(time_delta)
+        rendered = self.cat_scene is not None
+        self.render()
+        if events is None:
+            events = pygame.event.get()
+        cat_events = self.events(events)
+        # replays start from the frame the cat scene starts in, with only
+        # what it was there for.
+        if self.recorder is not None and self.cat_scene is not None:
+            self.recorder.record(
+                time_delta if ticked else None, cat_events, render=rendered
+            )
+        return events
 
     def mainloop(self):
         """
@@ -124,12 +189,26 @@ class Game:
         time_delta = 0
         while self.running:
             start_time = time.time()
-            self.tick(time_delta)
-            self.render()
-            events = pygame.event.get()
-            self.events(events)
+            events = self.frame(time_delta)
             time_delta = (time.time() - start_time) * 1000
             if self.gif_maker is not None:
-                self.gif_maker.update(events, self.screen)
+                with self.profiler.phase("gif_maker"):
+                    self.gif_maker.update(events, self.screen)
+            self.profiler.end_frame()
+
+        if self.recorder is not None:
+            self.recorder.close(self)
+        if self.profile_path is not None:
+            self.profiler.export(self.profile_path)
+        self.close()
 
+    def close(self):
+        """
+        Close the scenes, wait for background work, and quit pygame.
+        """
+        for scene in self.scenes:
+            scene.close()
+        if self.gif_maker is not None:
+            # gifs still saving in the background.
+            self.gif_maker.wait()
         pygame.quit()
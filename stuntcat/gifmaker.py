@@ -11,22 +11,31 @@ It relies on ffmpeg, or convert(from imagemagick being available):
     >>> gifmaker = GifMaker(seconds=2)
     >>> gifmaker.update(events, screen)
 
+Saving happens in a background thread, so the game keeps running.
+
+For instant replays, the last few seconds are always kept in a ring of
+frames made up front, so memory does not grow. Press h to save them.
+
+    >>> gifmaker = GifMaker(replay_seconds=5, scale=0.5)
 """
 
 import os
+import queue
 import subprocess
+import threading
 import time
 import shutil
-import distutils.spawn
+from typing import List, Optional
+
 import pygame as pg
 
 
 # TODO: make it work on windows (tmp path handling fixes)
 # TODO: try to use Pillow if imagemagik/ffmpeg is not installed?
 # TODO: a backend for windows? Pure python gif saving? windows built in gif saving?
-# TODO: ffmpeg backend to pipe data into ffmpeg rather than use tmp files.
-# TODO: async operation for saving.
-# TODO: scaling image to a smaller size.
+
+RECORD_KEY = pg.K_g
+INSTANT_REPLAY_KEY = pg.K_h
 
 
 def which(cmd):
@@ -34,40 +43,91 @@ def which(cmd):
     if hasattr(shutil, "which"):
         return shutil.which(cmd)
 
+    # distutils is slow to import, and only needed on old pythons.
+    import distutils.spawn  # pylint:disable=import-outside-toplevel
+
     return distutils.spawn.find_executable(cmd)
 
 
-class GifMaker:
-    """For making gif animation of a pygame.
+# pygame 2 renamed tostring to tobytes.
+_TOBYTES = getattr(pg.image, "tobytes", None) or pg.image.tostring
 
-    >>> gifmaker = GifMaker()
-    >>> gifmaker.update(events, screen)
 
-    Press K_g to start recording,
-          K_g again to finish recording.
+class FfmpegPipe:
+    """Streams frames into ffmpeg as raw RGB, as they are captured.
 
-    Uses imagemagik 'convert' or ffmpeg tool for making the gif.
+    No temporary files are written.
 
-        brew install imagemagick ffmpeg
-        apt-get install imagemagick ffmpeg
+    >>> pipe = FfmpegPipe(ffmpeg_path, '/tmp/anim.gif', (960, 540), 30)
+    >>> pipe.write(screen)
+    >>> pipe.finish()
+    """
 
-    ::Example::
+    def __init__(self, ffmpeg_path, output_path, size, fps):
+        self.output_path = output_path
+        self.size = size
+        cmd = [
+            ffmpeg_path,
+            "-loglevel",
+            "error",
+            "-y",  # overwrite output file without asking.
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgb24",
+            "-s",
+            "%sx%s" % size,
+            "-framerate",
+            str(fps),
+            "-i",
+            "-",  # frames come from stdin.
+            "-filter_complex",  # use a pallet for the gif for nicer image.
+            "[0:v] split [a][b];[a] palettegen [p];[b][p] paletteuse",
+            output_path,
+        ]
+        print(cmd)
+        self.process = subprocess.Popen(  # pylint:disable=consider-using-with
+            cmd, stdin=subprocess.PIPE
+        )
 
-    Press the K_g key to record 2 second gif.
+    def write(self, surf):
+        """Send a frame to ffmpeg. Frames must all be the same size."""
+        self.process.stdin.write(_TOBYTES(surf, "RGB"))
 
-    >>> gifmaker = GifMaker(seconds=2)
-    >>> gifmaker.update(events, screen)
+    def finish(self):
+        """No more frames, wait for ffmpeg to save the gif."""
+        self.process.stdin.close()
+        self.process.wait()
+
+
+class PngFiles:
+    """Saves frames as temporary PNG files, then joins them into a gif.
+
+    Uses ffmpeg, or convert from imagemagick.
+
+    :param prefix: start of the PNG file names, different for each gif
+                   so gifs saving at the same time don't mix up frames.
     """
 
-    def __init__(self, path="/tmp/", fps=30, seconds=None):
+    def __init__(
+        self, path, output_path, size, fps, prefix="bla"
+    ):  # pylint:disable=too-many-arguments
         self.path = path
-        self.start_saving = False
-        self.finished_saving = False
-        self.surfs = []
+        self.output_path = output_path
+        self.size = size
         self.fps = fps
-        self.seconds = seconds
+        self.prefix = prefix
+        self.image_paths = []
+
+    def write(self, surf):
+        """Save a frame."""
+        image_path = os.path.join(
+            self.path, "%s_%05d.png" % (self.prefix, len(self.image_paths))
+        )
+        self.image_paths.append(image_path)
+        pg.image.save(surf, image_path)
 
-    def _convert(self, image_paths, output_path):
+    def _convert(self):
 
         convert_path = which("convert")
         if convert_path is None:
@@ -78,15 +138,15 @@ class GifMaker:
             "-delay",
             "%s,1000" % (1000 // self.fps),
             "-size",
-            "%sx%s" % (self.surfs[0].get_width(), self.surfs[0].get_height()),
+            "%sx%s" % self.size,
         ]
-        cmd += image_paths
-        cmd += [output_path]
+        cmd += self.image_paths
+        cmd += [self.output_path]
         print(cmd)
         subprocess.call(cmd)
         return True
 
-    def _ffmpeg(self, output_path):
+    def _ffmpeg(self):
         # https://stackoverflow.com/questions/3688870/create-animated-gif-from-a-set-of-jpeg-images
 
         ffmpeg_path = which("ffmpeg")
@@ -96,46 +156,347 @@ class GifMaker:
         cmd = [
             ffmpeg_path,
             "-i",
-            os.path.join(self.path, "bla_%05d.png"),
+            os.path.join(self.path, "%s_%%05d.png" % self.prefix),
             "-y",  # overwrite output file without asking.
             "-framerate",
             str(self.fps),
             "-filter_complex",  # use a pallet for the gif for nicer image.
             "[0:v] split [a][b];[a] palettegen [p];[b][p] paletteuse",
-            output_path,
+            self.output_path,
         ]
         print(cmd)
         subprocess.call(cmd)
         return True
 
     def finish(self):
-        """Called when finished with making the gifs."""
-        print("saving images for gif")
-        output_path = "%s/anim.gif" % self.path
-        image_paths = []
-        for frame_idx, surf in enumerate(self.surfs):
-            image_path = "%s/bla_%05d.png" % (self.path, frame_idx)
-            image_paths.append(image_path)
-            pg.image.save(surf, image_path)
+        """Join the frames into a gif, and remove the PNG files."""
+        try:
+            if not (self._ffmpeg() or self._convert()):
+                raise ValueError("could not find convert or ffmpeg")
+        finally:
+            for image_path in self.image_paths:
+                os.remove(image_path)
+
+
+def scaled_size(size, scale):
+    """The size of a frame after scaling, at least 1x1."""
+    return max(1, int(size[0] * scale)), max(1, int(size[1] * scale))
+
+
+def capture_frame(screen, scale=1.0, dest=None):
+    """Copy the screen, scaling it down if needed.
+
+    :param screen: the surface to copy.
+    :param scale: 0.5 for half the width and height.
+    :param dest: a surface to copy into, rather than making a new one.
+    """
+    size = scaled_size(screen.get_size(), scale)
+    if dest is None:
+        dest = pg.Surface(size, 0, screen)
+    if size == screen.get_size():
+        dest.blit(screen, (0, 0))
+    else:
+        pg.transform.smoothscale(screen, size, dest)
+    return dest
+
+
+class FrameRing:
+    """The last few frames, in surfaces made once up front.
+
+    Capturing copies into the oldest frame, so memory never grows.
+
+    :param screen: the frames are made with its size and format.
+    :param max_frames: how many frames to keep.
+    :param scale: how the screen is scaled into the frames.
+    """
+
+    def __init__(self, screen, max_frames, scale=1.0):
+        size = scaled_size(screen.get_size(), scale)
+        self.scale = scale
+        self.frames = [pg.Surface(size, 0, screen) for _ in range(max_frames)]
+        self.next = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def nbytes(self):
+        """Memory used by the frames, in bytes."""
+        if not self.frames:
+            return 0
+        frame = self.frames[0]
+        return len(self.frames) * frame.get_height() * frame.get_pitch()
+
+    def clear(self):
+        """Forget the frames kept, keeping the surfaces to capture into."""
+        self.next = 0
+        self.count = 0
+
+    def capture(self, screen):
+        """Copy the screen over the oldest frame."""
+        if not self.frames:
+            return
+        capture_frame(screen, self.scale, self.frames[self.next])
+        self.next = (self.next + 1) % len(self.frames)
+        self.count = min(self.count + 1, len(self.frames))
+
+    def ordered(self):
+        """The frames kept, oldest first."""
+        if self.count < len(self.frames):
+            return self.frames[: self.count]
+        return self.frames[self.next :] + self.frames[: self.next]
+
+
+class GifEncoder(threading.Thread):
+    """Encodes captured frames in a background thread.
+
+    Frames wait in a bounded queue. If the encoder falls behind and the
+    queue is full, frames are dropped rather than stopping the game.
+
+    :param make_backend: called with the frame size, returns a backend
+                         with write(surf) and finish() methods.
+    :param max_queued: most frames to keep waiting for the encoder.
+    """
+
+    def __init__(self, make_backend, max_queued=120):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.make_backend = make_backend
+        self.queue = queue.Queue(maxsize=max_queued)
+        self.output_path = None
+
+        self.captured = 0
+        self.written = 0
+        self.dropped = 0
+        self.done = False
+        self.error = None
+
+    def add(self, surf):
+        """Queue a frame for encoding. Call from the game loop.
+
+        :param surf: the frame, which must not be drawn on afterwards.
+        :return: False if the queue was full, and the frame dropped.
+        """
+        try:
+            self.queue.put_nowait(surf)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.captured += 1
+        return True
+
+    def finish(self):
+        """No more frames. The encoder finishes in the background.
+
+        Never blocks for long, even if the encoder stopped with a full queue.
+        """
+        while not self.done:
+            try:
+                self.queue.put(None, timeout=0.1)
+                return
+            except queue.Full:
+                pass  # the encoder is still writing, or just stopped.
+
+    def _drain(self):
+        """Throw away the frames left, so nothing waits on the queue."""
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def run(self):
+        backend = None
+        try:
+            while True:
+                surf = self.queue.get()
+                if surf is None:
+                    break
+                if backend is None:
+                    backend = self.make_backend(surf.get_size())
+                    self.output_path = backend.output_path
+                backend.write(surf)
+                self.written += 1
+            if backend is not None:
+                backend.finish()
+        except (OSError, ValueError, pg.error) as err:
+            self.error = err
+        finally:
+            self.done = True
+            self._drain()
+
+
+class GifMaker:
+    """For making gif animation of a pygame.
+
+    >>> gifmaker = GifMaker()
+    >>> gifmaker.update(events, screen)
+
+    Press K_g to start recording,
+          K_g again to finish recording.
+          K_h to save the last replay_seconds, if set.
+
+    Uses imagemagik 'convert' or ffmpeg tool for making the gif.
+
+        brew install imagemagick ffmpeg
+        apt-get install imagemagick ffmpeg
+
+    ::Example::
+
+    Press the K_g key to record 2 second gif.
 
-        if not (self._ffmpeg(output_path) or self._convert(image_paths, output_path)):
-            raise ValueError("could not find convert or ffmpeg")
+    >>> gifmaker = GifMaker(seconds=2)
+    >>> gifmaker.update(events, screen)
+    >>> gifmaker.progress()
+    {'recording': False, 'encoding': 1, 'written': 20, 'captured': 60, ...}
 
-        for image_path in image_paths:
-            os.remove(image_path)
+    Keep the last 10 seconds at half size, to save with the K_h key.
+    That is two rings of 10 * 30 frames of 480x270, about 155MB each.
+    One keeps capturing while the other is saved.
 
-        print("%s saved" % output_path)
+    >>> gifmaker = GifMaker(replay_seconds=10, scale=0.5)
+    """
 
+    # pylint:disable=too-many-arguments,too-many-instance-attributes
+    def __init__(
+        self,
+        path="/tmp/",
+        fps=30,
+        seconds=None,
+        *,
+        stream=True,
+        max_queued=None,
+        replay_seconds=None,
+        scale=1.0,
+    ):
+        """
+        :param stream: pipe frames into ffmpeg as they are captured,
+                       if ffmpeg is installed.
+        :param max_queued: most frames waiting to be encoded, before
+                           frames are dropped. Four seconds by default.
+        :param replay_seconds: always keep this many seconds of frames,
+                               to save with the instant replay key.
+        :param scale: scale the frames by this, 0.5 is half size.
+        """
+        self.path = path
+        self.start_saving = False
+        self.finished_saving = False
+        self.fps = fps
+        self.seconds = seconds
+        self.stream = stream
+        self.max_queued = fps * 4 if max_queued is None else max_queued
+        self.replay_seconds = replay_seconds
+        self.scale = scale
+        self.ring = None  # type: Optional[FrameRing]
+        self._spare_ring = None  # type: Optional[FrameRing]
+        self._saving_replay = None  # type: Optional[GifEncoder]
+        self.encoder = None  # type: Optional[GifEncoder]
+        self._encoding = []  # type: List[GifEncoder]
+        self._gif_count = 0
+
+    def _next_name(self):
+        """A name for each gif, so gifs saving at once don't overwrite."""
+        self._gif_count += 1
+        return "anim-%s-%s" % (time.strftime("%Y%m%d-%H%M%S"), self._gif_count)
+
+    def _new_encoder(self, max_queued):
+        """An encoder saving a gif with its own name."""
+        name = self._next_name()
+        return GifEncoder(lambda size: self._make_backend(size, name), max_queued)
+
+    def _make_backend(self, size, name):
+        """Called by the encoder thread with the size of the first frame."""
+        output_path = os.path.join(self.path, name + ".gif")
+        ffmpeg_path = which("ffmpeg")
+        if self.stream and ffmpeg_path is not None:
+            return FfmpegPipe(ffmpeg_path, output_path, size, self.fps)
+        return PngFiles(self.path, output_path, size, self.fps, prefix=name)
+
+    def _poll_encoding(self):
+        """Say when background encodes have finished."""
+        for encoder in self._encoding[:]:
+            if encoder.done:
+                self._encoding.remove(encoder)
+                if encoder.error is not None:
+                    print("gif not saved:", encoder.error)
+                else:
+                    print(encoder.output_path, "saved")
+                if encoder.dropped:
+                    print(encoder.dropped, "frames dropped, encoding was too slow")
+
+    def progress(self):
+        """How the recording and encoding are going.
+
+        :return: dict with recording, how many gifs are encoding, and
+                 frames captured, written and dropped of the newest gif.
+        """
+        newest = self.encoder or (self._encoding[-1] if self._encoding else None)
+        return {
+            "recording": self.encoder is not None,
+            "encoding": len(self._encoding),
+            "captured": newest.captured if newest else 0,
+            "written": newest.written if newest else 0,
+            "dropped": newest.dropped if newest else 0,
+        }
+
+    def save_replay(self):
+        """Save the frames in the ring, the last replay_seconds.
+
+        The ring is given to the encoder, and capturing goes on in the
+        spare ring made up front. Only one replay saves at a time, so the
+        spare is never still being saved.
+
+        :return: False if there was nothing to save, or still saving.
+        """
+        if not self.ring:  # None, or no frames yet.
+            return False
+        if self._saving_replay is not None and not self._saving_replay.done:
+            print("still saving the last replay")
+            return False
+
+        frames = self.ring.ordered()
+        encoder = self._new_encoder(len(frames) + 1)
+        for frame in frames:
+            encoder.add(frame)
+        encoder.start()
+        encoder.finish()
+        self._encoding.append(encoder)
+        self._saving_replay = encoder
+        self.ring, self._spare_ring = self._spare_ring, self.ring
+        self.ring.clear()
+        print("saving the last", len(frames), "frames")
+        return True
+
+    def finish(self):
+        """Called when finished with making the gifs.
+
+        Returns straight away, the gif is saved in the background.
+        """
         self.finished_saving = False
         self.start_saving = False
 
+        if self.encoder is not None:
+            self.encoder.finish()
+            self._encoding.append(self.encoder)
+            self.encoder = None
+
+    def wait(self):
+        """Wait for all the gifs to be saved, like before exiting."""
+        for encoder in self._encoding:
+            encoder.join()
+        self._poll_encoding()
+
     def update(self, events, screen):
         """To integrate with the main program.
 
         Call it once per frame after drawing is done.
         """
+        self._poll_encoding()
         for event in events:
-            if event.type == pg.KEYDOWN and event.key == pg.K_g:
+            if event.type == pg.KEYDOWN and event.key == INSTANT_REPLAY_KEY:
+                self.save_replay()
+            if event.type == pg.KEYDOWN and event.key == RECORD_KEY:
                 if not self.start_saving:
                     self.start_saving = time.time()
                     self.finished_saving = False
@@ -147,9 +508,18 @@ class GifMaker:
         if self.finished_saving:
             self.finish()
         if self.start_saving:
-            self.surfs.append(screen.copy())
+            if self.encoder is None:
+                self.encoder = self._new_encoder(self.max_queued)
+                self.encoder.start()
+            self.encoder.add(capture_frame(screen, self.scale))
             if (
                 self.seconds is not None
                 and time.time() - self.start_saving > self.seconds
             ):
                 self.finish()
+        if self.replay_seconds is not None:
+            if self.ring is None:
+                max_frames = int(self.replay_seconds * self.fps)
+                self.ring = FrameRing(screen, max_frames, self.scale)
+                self._spare_ring = FrameRing(screen, max_frames, self.scale)
+            self.ring.capture(screen)
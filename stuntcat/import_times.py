@@ -0,0 +1,68 @@
+""" For seeing how long starting the game spends importing.
+
+Runs a new python with -X importtime, and sorts what it prints.
+
+::Example::
+
+    python -m stuntcat --import-times
+
+"""
+import os
+import subprocess
+import sys
+
+# these should only be imported when the platformer is played.
+LAZY_MODULES = ("pymunk", "pytmx")
+
+
+def import_times(module="stuntcat.game"):
+    """
+    Import a module in a new python, timing every import.
+
+    :param module: the module to import.
+    :return: list of (cumulative us, self us, module name), slowest first.
+    """
+    package_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [package_parent] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+    )
+    env.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        env=env,
+        check=True,
+    )
+
+    times = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line.
+        times.append((int(cumulative_us), int(self_us), name.rstrip()))
+    times.sort(reverse=True)
+    return times
+
+
+def print_import_times(module="stuntcat.game", top=25):
+    """
+    Print the slowest imports, with the nesting python shows.
+
+    :param module: the module to import.
+    :param top: how many imports to show.
+    """
+    times = import_times(module)
+    print("cumulative ms   self ms  module")
+    for cumulative_us, self_us, name in times[:top]:
+        print("%13.1f %9.1f  %s" % (cumulative_us / 1000.0, self_us / 1000.0, name))
+
+    names = {name.strip() for _, _, name in times}
+    total = sum(self_us for _, self_us, _ in times)
+    print("%s modules imported in %.1f ms" % (len(times), total / 1000.0))
+    for lazy in LAZY_MODULES:
+        if lazy in names:
+            print("%s was imported, but should wait for the platformer" % lazy)
@@ -1,22 +1,142 @@
 """
 Main module
 """
-from stuntcat.game import Game
+import argparse
+import os
+import sys
 
+# the game is imported when it starts, so parsing arguments is quick.
+# pylint:disable=import-outside-toplevel
 
-def main():
+
+def parse_args(args=None):
+    """
+    Parse the command line arguments.
+
+    :param args: list of arguments, sys.argv[1:] if None.
+    """
+    parser = argparse.ArgumentParser(prog="stuntcat")
+    parser.add_argument(
+        "-g",
+        action="store_true",
+        help="record gif animations with the G key (always on for now)",
+    )
+    parser.add_argument(
+        "--instant-replay",
+        metavar="SECONDS",
+        type=float,
+        help="keep the last SECONDS at half size, the H key saves them as a gif",
+    )
+    parser.add_argument("--seed", type=int, help="seed for the random numbers")
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        type=os.path.abspath,
+        help="record a replay to PATH",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        type=os.path.abspath,
+        help="play back a replay from PATH, headless and as fast as possible",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        type=os.path.abspath,
+        help="save frame timings to a .csv or .jsonl file on exit",
+    )
+    parser.add_argument(
+        "--import-times",
+        action="store_true",
+        help="show how long importing the game takes, module by module",
+    )
+    return parser.parse_args(args)
+
+
+def main(options=None):
     """
     Main function.
+
+    :param options: from parse_args, or None to parse sys.argv.
     """
+    if options is None:
+        options = parse_args()
+    if options.import_times:
+        from stuntcat.import_times import print_import_times
+
+        print_import_times()
+        return
+    if options.replay:
+        sys.exit(0 if replay_main(options.replay, options.profile) else 1)
+
     try:
-        game_main()
+        game_main(options)
     except KeyboardInterrupt:
         print("Keyboard Interrupt...")
         print("Exiting")
 
 
-def game_main():
+def game_main(options=None):
     """
     Game main function.
     """
-    Game().mainloop()
+    from stuntcat.game import Game
+    from stuntcat.gifmaker import GifMaker
+    from stuntcat.replay import ReplayRecorder
+
+    seed = options.seed if options is not None else None
+    game = Game(seed=seed)
+    if options is not None and options.record:
+        game.recorder = ReplayRecorder(options.record, game.seed)
+    if options is not None and options.profile:
+        game.profile_path = options.profile
+        game.profiler.keep_frames = True
+    if options is not None and options.instant_replay:
+        game.gif_maker = GifMaker(
+            seconds=2, replay_seconds=options.instant_replay, scale=0.5
+        )
+    game.mainloop()
+
+
+def replay_main(path, profile_path=None):
+    """
+    Play a replay without a window or sound, and check it matches.
+
+    :param path: the replay file.
+    :param profile_path: save the frame timings here, if given.
+    :return: True if the game ended the same way as when recorded.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from stuntcat.game import Game
+    from stuntcat.replay import ReplayPlayer, replay_check
+
+    player = ReplayPlayer(path)
+    game = Game(seed=player.seed)
+    game.profiler.keep_frames = profile_path is not None
+    seconds = player.play(game)
+    game_seconds = (
+        sum(time_delta or 0 for time_delta, _, _ in player.frames) / 1000.0
+    )
+    print(
+        "replayed %s frames, %.1f game seconds, in %.3f seconds"
+        % (len(player.frames), game_seconds, seconds)
+    )
+
+    for name, stats in game.profiler.summary().items():
+        print(
+            "%-24s p50 %.2fms p95 %.2fms p99 %.2fms"
+            % (name, stats["p50"], stats["p95"], stats["p99"])
+        )
+    if profile_path is not None:
+        game.profiler.export(profile_path)
+
+    check = replay_check(game)
+    game.close()
+    if player.check is not None and check != player.check:
+        print("replay does not match the recording")
+        print("recorded:", player.check)
+        print("replayed:", check)
+        return False
+    return True
@@ -0,0 +1,301 @@
+""" Tiled maps baked into one file, so they load without parsing.
+
+pytmx parses the .tmx XML and loads the tileset images every time. A
+baked map has the map size, a table of the objects, and the tile layers
+already drawn into chunks of pixels, in one file. It is memory mapped,
+and the chunk surfaces are made straight from the mapped pixels, then
+converted for the display the first time they are drawn.
+
+Baked maps are saved in the user cache directory, named by a hash of the
+.tmx file, so a map is baked again when it changes.
+
+::Example::
+
+    >>> map_cache = MapCache()
+    >>> baked = map_cache.load('stuntcat/data/maps/untitled.tmx')
+    >>> [obj.type for obj in baked.objects]
+    ['fixed', 'yarn_spawn', 'player_spawn', 'fixed', 'fixed', 'fixed', 'fixed']
+    >>> screen.blit(baked.chunk(0, 0), (0, 0))
+
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+
+import pygame
+
+from stuntcat.bundle import surface_pixels
+from stuntcat.cache_paths import default_cache_path, file_hash
+
+MAGIC = b"STUNTMAP"
+MAP_VERSION = 1
+CHUNK_SIZE = 512
+_HEADER = struct.Struct("<8sII")  # magic, version, index size.
+
+# what is kept of each map object.
+OBJECT_FIELDS = ("id", "name", "type", "x", "y", "width", "height", "properties")
+
+
+class MapObject:  # pylint:disable=too-few-public-methods
+    """
+    An object of a baked map, with the fields pytmx objects have.
+
+    :param fields: dict of the OBJECT_FIELDS.
+    """
+
+    __slots__ = OBJECT_FIELDS
+
+    def __init__(self, fields):
+        for name in OBJECT_FIELDS:
+            setattr(self, name, fields.get(name))
+
+
+class BakedMap:  # pylint:disable=too-many-instance-attributes
+    """
+    A map loaded from a baked file, used like a pytmx.TiledMap.
+
+    :param filename: the .tmx file it was baked from.
+    :param info: dict of width, height, tilewidth, tileheight, chunk_size.
+    :param objects: list of MapObject.
+    :param chunks: dict of (column, row) to chunk surfaces, replaced by
+                   converted ones as they are drawn.
+    :param source_hash: file_hash of the .tmx file, if known.
+    """
+
+    def __init__(
+        self, filename, info, objects, chunks, source_hash=None
+    ):  # pylint:disable=too-many-arguments
+        self.filename = filename
+        self.source_hash = source_hash
+        self.width = info["width"]
+        self.height = info["height"]
+        self.tilewidth = info["tilewidth"]
+        self.tileheight = info["tileheight"]
+        self.chunk_size = info["chunk_size"]
+        self.objects = objects
+        self.chunks = chunks
+        self._converted = set()
+
+    @property
+    def images(self):
+        """
+        The chunk surfaces, for counting their memory.
+        """
+        return list(self.chunks.values())
+
+    def chunk(self, column, row):
+        """
+        A chunk surface, converted for the display the first time.
+
+        The mapped pixels are RGBA, which blit slowly to the screen.
+
+        :param column: chunk column.
+        :param row: chunk row.
+        :return: the surface, or None where the map has no tiles.
+        """
+        key = (column, row)
+        chunk = self.chunks.get(key)
+        if (
+            chunk is not None
+            and key not in self._converted
+            and pygame.display.get_surface() is not None
+        ):
+            chunk = self.chunks[key] = chunk.convert_alpha()
+            self._converted.add(key)
+        return chunk
+
+    def chunk_rect(self, column, row):
+        """
+        Where a chunk goes in the map, in pixels.
+
+        :param column: chunk column.
+        :param row: chunk row.
+        """
+        return pygame.Rect(
+            column * self.chunk_size,
+            row * self.chunk_size,
+            self.chunk_size,
+            self.chunk_size,
+        )
+
+
+def map_info(tmxdata, chunk_size=CHUNK_SIZE):
+    """
+    The size of a map and its tiles, for a BakedMap.
+
+    :param tmxdata: a pytmx.TiledMap.
+    :param chunk_size: width and height of a chunk, in pixels.
+    """
+    return {
+        "width": tmxdata.width,
+        "height": tmxdata.height,
+        "tilewidth": tmxdata.tilewidth,
+        "tileheight": tmxdata.tileheight,
+        "chunk_size": chunk_size,
+    }
+
+
+def object_fields(obj):
+    """
+    The OBJECT_FIELDS of a pytmx object, as a dict.
+
+    :param obj: a pytmx.TiledObject.
+    """
+    return {name: getattr(obj, name, None) for name in OBJECT_FIELDS}
+
+
+def render_chunks(tmxdata, chunk_size=CHUNK_SIZE):
+    """
+    Draw the visible tile layers of a map into chunks.
+
+    Chunks without any tiles are left out.
+
+    :param tmxdata: a pytmx.TiledMap loaded with images.
+    :param chunk_size: width and height of a chunk, in pixels.
+    :return: dict of (column, row) to RGBA surfaces.
+    """
+    chunks = {}
+    for layer in tmxdata.visible_layers:
+        if not hasattr(layer, "tiles"):
+            continue  # object groups and image layers.
+        for tile_x, tile_y, image in layer.tiles():
+            x_pos = tile_x * tmxdata.tilewidth
+            y_pos = tile_y * tmxdata.tileheight
+            key = (x_pos // chunk_size, y_pos // chunk_size)
+            if key not in chunks:
+                chunks[key] = pygame.Surface(
+                    (chunk_size, chunk_size), pygame.SRCALPHA, 32
+                )
+            chunks[key].blit(
+                image, (x_pos - key[0] * chunk_size, y_pos - key[1] * chunk_size)
+            )
+    return chunks
+
+
+def bake(tmxdata, path, chunk_size=CHUNK_SIZE):
+    """
+    Write a baked map file.
+
+    :param tmxdata: a pytmx.TiledMap loaded with images.
+    :param path: the file to write.
+    :param chunk_size: width and height of a chunk, in pixels.
+    """
+    chunks = render_chunks(tmxdata, chunk_size)
+    keys = sorted(chunks)
+    pixels = [surface_pixels(chunks[key]) for key in keys]
+    index = {
+        "info": map_info(tmxdata, chunk_size),
+        "objects": [object_fields(obj) for obj in tmxdata.objects],
+        "chunks": [list(key) for key in keys],
+    }
+    index_bytes = json.dumps(index, default=str).encode("utf-8")
+
+    with open(path, "wb") as baked_file:
+        baked_file.write(_HEADER.pack(MAGIC, MAP_VERSION, len(index_bytes)))
+        baked_file.write(index_bytes)
+        for data in pixels:
+            baked_file.write(data)
+
+
+def load_baked(path, filename):
+    """
+    Load a baked map file, mapping the chunk pixels.
+
+    :param path: the baked file.
+    :param filename: the .tmx file it was baked from.
+    :return: BakedMap
+    """
+    with open(path, "rb") as baked_file:
+        magic, version, index_size = _HEADER.unpack(baked_file.read(_HEADER.size))
+        if magic != MAGIC or version != MAP_VERSION:
+            raise ValueError("%s is not a version %s map" % (path, MAP_VERSION))
+        index = json.loads(baked_file.read(index_size).decode("utf-8"))
+        chunks = {}
+        if index["chunks"]:
+            # copy on write, so drawing on a chunk never changes the file.
+            view = memoryview(
+                mmap.mmap(baked_file.fileno(), 0, access=mmap.ACCESS_COPY)
+            )
+            size = index["info"]["chunk_size"]
+            offset = _HEADER.size + index_size
+            for column, row in index["chunks"]:
+                data = view[offset : offset + size * size * 4]
+                chunks[(column, row)] = pygame.image.frombuffer(
+                    data, (size, size), "RGBA"
+                )
+                offset += size * size * 4
+    objects = [MapObject(fields) for fields in index["objects"]]
+    return BakedMap(filename, index["info"], objects, chunks)
+
+
+class MapCache:
+    """
+    Baked maps, saved in a directory.
+
+    :param path: directory to keep them in, the user cache if None.
+    :param chunk_size: width and height of the tile layer chunks.
+    """
+
+    def __init__(self, path=None, chunk_size=CHUNK_SIZE):
+        self.path = default_cache_path("maps") if path is None else path
+        self.chunk_size = chunk_size
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, tmx_path, map_hash=None):
+        """
+        The baked file name for a map.
+
+        :param tmx_path: the .tmx file.
+        :param map_hash: file_hash of the .tmx file, hashed if None.
+        """
+        name = os.path.splitext(os.path.basename(tmx_path))[0]
+        map_hash = file_hash(tmx_path) if map_hash is None else map_hash
+        return "%s-%s-%s.map" % (name, map_hash, self.chunk_size)
+
+    def load(self, tmx_path):
+        """
+        Load a map, baking it first if it changed since it was last baked.
+
+        Baking loads the tile images with pytmx, which converts them,
+        so call this from the main thread after the display mode is set.
+
+        :param tmx_path: the .tmx file.
+        :return: BakedMap
+        """
+        map_hash = file_hash(tmx_path)
+        baked_path = os.path.join(self.path, self.key(tmx_path, map_hash))
+        try:
+            baked = load_baked(baked_path, tmx_path)
+            baked.source_hash = map_hash
+            self.hits += 1
+            return baked
+        except (OSError, ValueError, KeyError):
+            # not baked yet, or from an older version.
+            pass
+
+        self.misses += 1
+        # pytmx is only needed to bake maps.
+        import pytmx.util_pygame  # pylint:disable=import-outside-toplevel
+
+        tmxdata = pytmx.util_pygame.load_pygame(tmx_path)
+        tmp_path = "%s.%s-%s.tmp" % (baked_path, os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            bake(tmxdata, tmp_path, self.chunk_size)
+            os.replace(tmp_path, baked_path)
+            baked = load_baked(baked_path, tmx_path)
+            baked.source_hash = map_hash
+            return baked
+        except OSError as err:
+            # the game still works without the cache, like on a read only home.
+            print("could not cache map %s: %s" % (baked_path, err))
+        return BakedMap(
+            tmx_path,
+            map_info(tmxdata, self.chunk_size),
+            [MapObject(object_fields(obj)) for obj in tmxdata.objects],
+            render_chunks(tmxdata, self.chunk_size),
+            map_hash,
+        )
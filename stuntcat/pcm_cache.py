@@ -0,0 +1,86 @@
+""" A cache of decoded sounds on disk, so ogg files are decoded once.
+
+pygame.mixer.Sound decodes the whole ogg file when it loads. The
+decoded samples are saved, named by a hash of the ogg file and the
+mixer format, and loaded from there on later runs. If the ogg file
+changes, or the mixer is set up differently, its hash or format no
+longer match, so it is decoded again.
+
+::Example::
+
+    >>> pcm_cache = PcmCache()
+    >>> asound = pcm_cache.load('stuntcat/data/sounds/boo.ogg')
+
+"""
+import mmap
+import os
+import threading
+
+import pygame
+
+from stuntcat.cache_paths import default_cache_path, file_hash
+
+
+class PcmCache:
+    """
+    Decoded sounds, saved as raw samples in a directory.
+
+    :param path: directory to keep them in, the user cache if None.
+    """
+
+    def __init__(self, path=None):
+        self.path = default_cache_path() if path is None else path
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, sound_path):
+        """
+        The cache file name for a sound, with the current mixer format.
+
+        :param sound_path: the ogg file.
+        :return: file name, or None if the mixer isn't working.
+        """
+        init = pygame.mixer.get_init()
+        if not init:
+            return None
+        frequency, size, channels = init
+        return "%s-%s-%s-%s.pcm" % (file_hash(sound_path), frequency, size, channels)
+
+    def load(self, sound_path):
+        """
+        Load a sound, from the cache if it has been decoded before.
+
+        :param sound_path: the ogg file.
+        :return: pygame.mixer.Sound
+        """
+        key = self.key(sound_path)
+        if key is None:
+            return pygame.mixer.Sound(sound_path)
+
+        pcm_path = os.path.join(self.path, key)
+        try:
+            with open(pcm_path, "rb") as pcm_file:
+                with mmap.mmap(pcm_file.fileno(), 0, access=mmap.ACCESS_READ) as pcm:
+                    asound = pygame.mixer.Sound(buffer=pcm)
+            self.hits += 1
+            return asound
+        except (OSError, ValueError):
+            # not cached yet, or empty.
+            pass
+
+        self.misses += 1
+        asound = pygame.mixer.Sound(sound_path)
+        self._save(pcm_path, asound)
+        return asound
+
+    def _save(self, pcm_path, asound):
+        """Write the samples, renaming at the end so it's never half written."""
+        tmp_path = "%s.%s-%s.tmp" % (pcm_path, os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(tmp_path, "wb") as pcm_file:
+                pcm_file.write(asound.get_raw())
+            os.replace(tmp_path, pcm_path)
+        except OSError as err:
+            # the game still works without the cache, like on a read only home.
+            print("could not cache sound %s: %s" % (pcm_path, err))
@@ -0,0 +1,231 @@
+""" For timing the parts of a frame.
+
+Game.mainloop times ticking, rendering, updating the display, handling
+events and the gif maker, and each scene inside of those. The last few
+seconds of timings are kept, to show percentiles in an overlay.
+
+Press F3 to show the overlay.
+
+::Example::
+
+    >>> profiler = FrameProfiler(budget=1000 / 30)
+    >>> with profiler.phase("tick"):
+    ...     game.tick(time_delta)
+    >>> profiler.end_frame()
+    >>> profiler.percentiles("tick")
+    {'p50': 1.2, 'p95': 2.5, 'p99': 4.0}
+
+"""
+import csv
+import json
+import time
+from collections import OrderedDict, deque
+
+import pygame
+
+OVERLAY_KEY = pygame.K_F3
+
+
+def percentile(sorted_samples, fraction):
+    """
+    Nearest rank percentile of some sorted samples.
+
+    :param sorted_samples: the samples, sorted.
+    :param fraction: 0.5 for the median, 0.99 for p99.
+    """
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(fraction * len(sorted_samples)))
+    return sorted_samples[index]
+
+
+class _Phase:
+    """Times a with block, adding to the profiler for this frame."""
+
+    __slots__ = ["profiler", "name", "start"]
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        frame = self.profiler.frame
+        frame[self.name] = frame.get(self.name, 0.0) + elapsed
+        return False
+
+
+class FrameProfiler:  # pylint:disable=too-many-instance-attributes
+    """
+    Times named phases of each frame, in ms.
+
+    :param budget: ms per frame we want to stay under, for the overlay.
+    :param window: how many frames of timings to keep for percentiles.
+    :param keep_frames: keep every frame, so they can be exported.
+    """
+
+    def __init__(self, budget=1000 / 30.0, window=300, keep_frames=False):
+        self.budget = budget
+        self.window = window
+        self.keep_frames = keep_frames
+
+        self.frame = OrderedDict()
+        self.frames = []
+        self.samples = OrderedDict()
+        self._phases = {}
+        # other things to show in the overlay, name: text.
+        self.notes = OrderedDict()
+
+        self.overlay = False
+        self._font = None
+        self._overlay_lines = []
+        self._overlay_rect = None
+        self._under_overlay = None
+        self._frame_count = 0
+
+    def phase(self, name):
+        """
+        A context manager timing a phase of this frame.
+
+        Timing a phase more than once a frame adds the times together.
+
+        :param name: the phase name, like "tick" or "tick:CatUniScene".
+        """
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+        return phase
+
+    def end_frame(self):
+        """
+        Call once at the end of every frame, to store its timings.
+        """
+        for name, elapsed in self.frame.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append(elapsed)
+        if self.keep_frames:
+            self.frames.append(self.frame)
+        self.frame = OrderedDict()
+        self._frame_count += 1
+
+    def percentiles(self, name):
+        """
+        The p50, p95 and p99 timings of a phase, over the window.
+
+        :param name: the phase name.
+        :return: dict of percentiles in ms.
+        """
+        samples = sorted(self.samples.get(name, ()))
+        return {
+            "p50": percentile(samples, 0.5),
+            "p95": percentile(samples, 0.95),
+            "p99": percentile(samples, 0.99),
+        }
+
+    def summary(self):
+        """
+        The percentiles of every phase.
+
+        :return: OrderedDict of phase name to percentiles.
+        """
+        return OrderedDict((name, self.percentiles(name)) for name in self.samples)
+
+    def event(self, event):
+        """
+        Toggles the overlay with the F3 key.
+
+        :param event: a pygame event.
+        """
+        if event.type == pygame.KEYDOWN and event.key == OVERLAY_KEY:
+            self.overlay = not self.overlay
+
+    def _overlay_text(self):
+        lines = ["ms        p50    p95    p99   (budget %.1f)" % self.budget]
+        for name, stats in self.summary().items():
+            over = " !" if stats["p95"] > self.budget else ""
+            lines.append(
+                "%-22s %6.2f %6.2f %6.2f%s"
+                % (name[:22], stats["p50"], stats["p95"], stats["p99"], over)
+            )
+        for name, text in self.notes.items():
+            lines.append("%s: %s" % (name, text))
+        return lines
+
+    def draw(self, screen):
+        """
+        Draw the overlay, if it is shown.
+
+        What was under the overlay is kept, and put back by restore()
+        after the display is updated, so scenes only drawing dirty
+        parts of the screen are not drawn over.
+
+        :param screen: the surface to draw on.
+        :return: list of rects changed on the screen.
+        """
+        rects = []
+        if self._overlay_rect is not None:
+            # where the overlay was last frame.
+            rects.append(self._overlay_rect)
+            self._overlay_rect = None
+        if not self.overlay:
+            return rects
+
+        if self._font is None:
+            self._font = pygame.font.SysFont("monospace", 14)
+        # update the text twice a second, so it can be read.
+        if not self._overlay_lines or self._frame_count % 15 == 0:
+            self._overlay_lines = self._overlay_text()
+
+        line_height = self._font.get_linesize()
+        width = max(self._font.size(line)[0] for line in self._overlay_lines)
+        rect = pygame.Rect(
+            0, 0, width + 8, line_height * len(self._overlay_lines) + 8
+        ).clip(screen.get_rect())
+
+        self._under_overlay = (rect, screen.subsurface(rect).copy())
+        screen.fill((0, 0, 0), rect)
+        for index, line in enumerate(self._overlay_lines):
+            text = self._font.render(line, True, (255, 255, 255))
+            screen.blit(text, (4, 4 + index * line_height))
+
+        self._overlay_rect = rect
+        rects.append(rect)
+        return rects
+
+    def restore(self, screen):
+        """
+        Put back what was under the overlay.
+
+        :param screen: the surface drawn on.
+        """
+        if self._under_overlay is not None:
+            rect, under = self._under_overlay
+            screen.blit(under, rect)
+            self._under_overlay = None
+
+    def export(self, path):
+        """
+        Write every kept frame to a .csv or .jsonl file.
+
+        :param path: the file path, the extension picks the format.
+        """
+        names = list(self.samples)
+        with open(path, "w", encoding="utf-8", newline="") as out_file:
+            if path.endswith(".csv"):
+                writer = csv.writer(out_file)
+                writer.writerow(["frame"] + names)
+                for index, frame in enumerate(self.frames):
+                    writer.writerow(
+                        [index] + ["%.3f" % frame.get(name, 0.0) for name in names]
+                    )
+            else:
+                for frame in self.frames:
+                    out_file.write(json.dumps(frame) + "\n")
+        print("%s frames of timings saved to %s" % (len(self.frames), path))
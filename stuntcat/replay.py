@@ -0,0 +1,178 @@
+""" For recording games, and playing them back.
+
+A replay is a json lines file. The first line has the random seed, then
+there is a line per frame with the time_delta and the events given to
+the game, and the last line has a check of the game state at the end.
+
+Recording starts when the cat scene starts, as the loading scene waits
+on the music, which does not replay. The cat scene starts part way
+through a frame, so the first frame may have no tick or render, and only
+the events after it started.
+
+::Example::
+
+    python -m stuntcat --record /tmp/game.replay
+    python -m stuntcat --replay /tmp/game.replay
+
+"""
+import json
+import time
+
+import pygame
+
+REPLAY_VERSION = 2
+_EVENT_VALUE_TYPES = (bool, int, float, str, type(None))
+
+
+def event_to_dict(event):
+    """
+    Make a json friendly dict of a pygame event.
+
+    Attributes which can't be stored, like window objects, are dropped.
+
+    :param event: the pygame event.
+    """
+    attributes = {}
+    for name, value in event.dict.items():
+        if isinstance(value, (tuple, list)):
+            if all(isinstance(item, _EVENT_VALUE_TYPES) for item in value):
+                attributes[name] = list(value)
+        elif isinstance(value, _EVENT_VALUE_TYPES):
+            attributes[name] = value
+    return {"type": event.type, "dict": attributes}
+
+
+def dict_to_event(data):
+    """
+    Make a pygame event from a dict made by event_to_dict.
+
+    :param data: the dict.
+    """
+    attributes = {
+        name: tuple(value) if isinstance(value, list) else value
+        for name, value in data["dict"].items()
+    }
+    return pygame.event.Event(data["type"], attributes)
+
+
+def replay_check(game):
+    """
+    A summary of the cat scene state, to compare a replay against.
+
+    :param game: the Game.
+    """
+    if game.cat_scene is None:
+        return None
+    sim = game.cat_scene.sim
+    return {
+        "steps": sim.steps,
+        "total_time": sim.total_time,
+        "score": sim.player_data.score,
+        "cat_location": list(sim.player_data.cat_location),
+        "cat_angle": sim.player_data.cat_angle,
+    }
+
+
+class ReplayRecorder:
+    """
+    Records the frames of a game to a replay file.
+
+    >>> game = Game(seed=1)
+    >>> game.recorder = ReplayRecorder('/tmp/game.replay', game.seed)
+    """
+
+    def __init__(self, path, seed):
+        self.path = path
+        self.frames = 0
+        self._file = open(  # pylint:disable=consider-using-with
+            path, "w", encoding="utf-8"
+        )
+        self._write({"version": REPLAY_VERSION, "seed": seed})
+
+    def _write(self, data):
+        self._file.write(json.dumps(data) + "\n")
+
+    def record(self, time_delta, events, render=True):
+        """
+        Record one frame.
+
+        :param time_delta: The time delta given to Game.tick, None if the
+                           frame was not ticked.
+        :param events: The events given to Game.events.
+        :param render: False if the frame was not rendered.
+        """
+        data = {
+            "time_delta": time_delta,
+            "events": [event_to_dict(event) for event in events],
+        }
+        if not render:
+            data["render"] = False
+        self._write(data)
+        self.frames += 1
+
+    def close(self, game):
+        """
+        Finish the replay file.
+
+        :param game: the Game, to store a check of its state.
+        """
+        self._write({"check": replay_check(game)})
+        self._file.close()
+        print("%s frames recorded to %s" % (self.frames, self.path))
+
+
+class ReplayPlayer:  # pylint:disable=too-few-public-methods
+    """
+    Reads a replay file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.seed = None
+        self.frames = []
+        self.check = None
+
+        with open(path, encoding="utf-8") as replay_file:
+            header = json.loads(replay_file.readline())
+            # version 1 replays have every frame ticked and rendered.
+            if header.get("version") not in (1, REPLAY_VERSION):
+                raise ValueError("unknown replay version in %s" % path)
+            self.seed = header["seed"]
+            for line in replay_file:
+                data = json.loads(line)
+                if "check" in data:
+                    self.check = data["check"]
+                else:
+                    self.frames.append(
+                        (
+                            data["time_delta"],
+                            [dict_to_event(event) for event in data["events"]],
+                            data.get("render", True),
+                        )
+                    )
+
+    def play(self, game):
+        """
+        Feed the frames to a game, as fast as possible.
+
+        :param game: a Game made with our seed.
+        :return: the wall clock time taken in seconds.
+        """
+        # don't wait for the frame rate.
+        game.FPS = 0
+
+        if game.cat_scene is None:
+            for scene in game.scenes[:]:
+                game.scenes.remove(scene)
+                scene.close()
+            game.add_cat_scene()
+
+        start_time = time.time()
+        for time_delta, events, render in self.frames:
+            if time_delta is not None:
+                game.tick(time_delta)
+            if render:
+                game.render()
+            game.events(events)
+            game.profiler.end_frame()
+        return time.time() - start_time
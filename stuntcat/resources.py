@@ -1,12 +1,45 @@
 """ For loading resources.
+
+Many images and sounds can be loaded at once with load_batch, which
+decodes them on a thread pool.
+
+Images come from the pre-decoded bundle, if it has been built with
+python -m stuntcat.bundle.
+
+Everything loaded is kept in CACHE, which has a memory budget.
+
+    >>> CACHE.max_bytes = 32 * 1024 * 1024
+    >>> CACHE.stats()
 """
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import pygame
 
+from stuntcat.asset_cache import AssetCache
+from stuntcat.bundle import BUNDLE_NAME, ImageBundle
+from stuntcat.cache_paths import data_path
+from stuntcat.channels import ChannelManager
+from stuntcat.map_cache import MapCache
+from stuntcat.pcm_cache import PcmCache
+
+# all of the data is about 45MB decoded, so this rarely drops anything.
+CACHE = AssetCache(max_bytes=64 * 1024 * 1024)
+
+# the opened image bundle, a list so it is only looked for once.
+_BUNDLE = []
+_BUNDLE_LOCK = threading.Lock()
 
-_SFX_CACHE = {}
-_GFX_CACHE = {}
+# decoded sounds, kept on disk between runs.
+PCM_CACHE = PcmCache()
+
+# baked maps, kept on disk between runs.
+MAP_CACHE = MapCache()
+
+# sound effects play in groups of channels, by priority.
+CHANNELS = ChannelManager()
 
 
 def distance(pos_a, pos_b):
@@ -19,22 +52,6 @@ def distance(pos_a, pos_b):
     return ((pos_a[0] - pos_b[0]) ** 2 + (pos_a[1] - pos_b[1]) ** 2) ** 0.5
 
 
-def data_path():
-    """
-    Get the path for the data directory.
-
-    :return: The path.
-    """
-    if os.path.exists("data"):
-        path = "data"
-    else:
-        path = os.path.join(
-            os.path.dirname(os.path.realpath(__file__)),
-            "data",
-        )
-    return path
-
-
 def music(amusic=None, load=True, play=True, stop=False, loop=1):
     """For loading and playing music.
 
@@ -64,6 +81,45 @@ def music_path(amusic):
     return os.path.join(data_path(), "sounds", amusic)
 
 
+def image_path(image):
+    """
+    Get the path of an image in the image data directory.
+
+    :param image: image file name.
+    """
+    return os.path.join(data_path(), "images", image)
+
+
+def sound_path(snd):
+    """
+    Get the path of a sound in the sound data directory.
+
+    :param snd: sound file name.
+    """
+    return os.path.join(data_path(), "sounds", snd)
+
+
+def map_path(amap):
+    """
+    Get the path of a map in the map data directory.
+
+    :param amap: map file name.
+    """
+    return os.path.join(data_path(), "maps", amap)
+
+
+def is_cached(kind, name, convert=False, convert_alpha=False):
+    """
+    Is an asset already loaded?
+
+    :param kind: "image", "sound" or "map".
+    :param name: file name.
+    :param convert: for images, as given to gfx.
+    :param convert_alpha: for images, as given to gfx.
+    """
+    return (kind, name, convert, convert_alpha) in CACHE
+
+
 def gfx(image, convert=False, convert_alpha=False):
     """
     Load and return an image surface from the image data directory.
@@ -73,24 +129,89 @@ def gfx(image, convert=False, convert_alpha=False):
     :param convert_alpha:
     :return: Image surface.
     """
-    gfx_key = (image, convert, convert_alpha)
-    if gfx_key in _GFX_CACHE:
-        return _GFX_CACHE[gfx_key]
+    asurf = CACHE.get(("image", image, convert, convert_alpha))
+    if asurf is not None:
+        return asurf
+    return cache_gfx(image, decode_image(image), convert, convert_alpha)
+
+
+def image_bundle():
+    """
+    The bundle of pre-decoded images, if it has been built.
 
-    path = os.path.join(data_path(), "images", image)
-    asurf = pygame.image.load(path)
+    :return: ImageBundle or None.
+    """
+    with _BUNDLE_LOCK:
+        if not _BUNDLE:
+            path = os.path.join(data_path(), BUNDLE_NAME)
+            bundle = None
+            if os.path.exists(path):
+                try:
+                    bundle = ImageBundle(path)
+                except (OSError, ValueError) as err:
+                    # like one built by an older version, the PNGs still load.
+                    print("not using %s: %s" % (path, err))
+            _BUNDLE.append(bundle)
+    return _BUNDLE[0]
+
+
+def decode_image(image):
+    """
+    Load an image without converting it, so it works in any thread.
+
+    :param image: image file name.
+    :return: Image surface.
+    """
+    bundle = image_bundle()
+    if bundle is not None and image in bundle:
+        # images of a frozen game can't be edited, so they aren't checked.
+        if getattr(sys, "frozen", False) or bundle.is_current(
+            image, image_path(image)
+        ):
+            return bundle.load(image)
+        print("%s changed, run python -m stuntcat.bundle to bundle it" % image)
+    return pygame.image.load(image_path(image))
+
+
+def decode_sound(snd):
+    """
+    Load a sound, which works in any thread.
+
+    The decoded samples come from PCM_CACHE after the first run.
+
+    :param snd: sound file name.
+    :return: The sound.
+    """
+    return PCM_CACHE.load(sound_path(snd))
+
+
+def cache_gfx(image, asurf, convert=False, convert_alpha=False):
+    """
+    Store an image loaded elsewhere, so gfx returns it.
+
+    Converting needs the display, so call this from the main thread.
+
+    :param image: image file name.
+    :param asurf: the surface, as loaded by pygame.image.load.
+    :param convert:
+    :param convert_alpha:
+    :return: Image surface.
+    """
+    gfx_key = ("image", image, convert, convert_alpha)
     if convert:
         asurf = asurf.convert()
     if convert_alpha:
         asurf = asurf.convert_alpha()
-    _GFX_CACHE[gfx_key] = asurf
-    return asurf
+    return CACHE.put(gfx_key, asurf)
 
 
 # pylint:disable=too-many-arguments
 def sfx(snd, play=False, stop=False, fadeout=None, fadein=0, loops=0):
     """
     Load and return a sound effect from the sound directory.
+
+    Playing goes through CHANNELS, which may drop low priority sounds.
+
     :param snd:
     :param play:
     :param stop:
@@ -99,19 +220,79 @@ def sfx(snd, play=False, stop=False, fadeout=None, fadein=0, loops=0):
     :param loops:
     :return: The sound.
     """
-    snd_key = snd
-    if snd_key in _SFX_CACHE:
-        asound = _SFX_CACHE[snd_key]
-    else:
-        path = os.path.join(data_path(), "sounds", snd)
-        asound = pygame.mixer.Sound(path)
-        _SFX_CACHE[snd_key] = asound
+    snd_key = ("sound", snd, False, False)
+    asound = CACHE.get(snd_key)
+    if asound is None:
+        asound = cache_sfx(snd, decode_sound(snd))
 
     # print(snd_key, play, stop, time.time())
     if play:
-        asound.play(loops=loops, fade_ms=fadein)
+        CHANNELS.play(asound, snd, loops=loops, fade_ms=fadein)
     if stop:
         asound.stop()
     if fadeout:
         asound.fadeout(fadeout)
     return asound
+
+
+def cache_sfx(snd, asound):
+    """
+    Store a sound loaded elsewhere, so sfx returns it.
+
+    :param snd: sound file name.
+    :param asound: the pygame.mixer.Sound.
+    :return: The sound.
+    """
+    return CACHE.put(("sound", snd, False, False), asound)
+
+
+def load_batch(images=(), sounds=(), max_workers=None):
+    """
+    Load many images and sounds at once, decoding them on a thread pool.
+
+    pygame lets go of the GIL while SDL decodes, so the files decode in
+    parallel. Converting the images happens here on the main thread.
+    Anything already loaded is skipped.
+
+    ::Example::
+
+    load_batch(
+        images=[("background.png", True, False), ("shark.png", False, True)],
+        sounds=["boo.ogg", "splash.ogg"],
+    )
+
+    :param images: (image, convert, convert_alpha) tuples, as given to gfx.
+    :param sounds: sound file names.
+    :param max_workers: threads to decode with, picked by python if None.
+    """
+    images = [key for key in images if not is_cached("image", *key)]
+    sounds = [snd for snd in sounds if not is_cached("sound", snd)]
+    if not images and not sounds:
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        image_futures = [
+            (key, executor.submit(decode_image, key[0])) for key in images
+        ]
+        sound_futures = [(snd, executor.submit(decode_sound, snd)) for snd in sounds]
+        for (image, convert, convert_alpha), future in image_futures:
+            cache_gfx(image, future.result(), convert, convert_alpha)
+        for snd, future in sound_futures:
+            cache_sfx(snd, future.result())
+
+
+def tmx_map(amap):
+    """
+    Load and return a tiled map from the map data directory.
+
+    The map is baked by MAP_CACHE the first time, or after it changes,
+    which converts the tile images, so call this from the main thread.
+
+    :param amap: map file name.
+    :return: map_cache.BakedMap, used like a pytmx.TiledMap.
+    """
+    map_key = ("map", amap, False, False)
+    tmxdata = CACHE.get(map_key)
+    if tmxdata is None:
+        tmxdata = CACHE.put(map_key, MAP_CACHE.load(map_path(amap)))
+    return tmxdata
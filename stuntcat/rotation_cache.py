@@ -0,0 +1,152 @@
+""" For caching rotated images.
+
+Rotating a surface every frame is slow. Angles are rounded to a
+resolution, so the rotated surfaces can be kept and looked up again.
+
+::Example::
+
+    >>> rotations = RotationCache(resolution=2.0, max_entries=100)
+    >>> image = rotations.get(cat_image, 33.3)  # rotated by 34 degrees.
+    >>> rotations.hits, rotations.misses
+
+A cache can be shared by many sprites, and limited by memory use.
+
+    >>> rotations = RotationCache(max_bytes=16 * 1024 * 1024)
+
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+def surface_bytes(surf):
+    """
+    Estimate the memory used by the pixels of a surface.
+
+    :param surf: the surface.
+    """
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+class RotationCache:
+    """
+    Rotated surfaces, by image and angle, least recently used dropped first.
+
+    :param resolution: angles are rounded to this many degrees.
+    :param max_entries: most surfaces to keep, None for no limit.
+    :param rotate: function(image, degrees) returning the rotated surface.
+    :param max_bytes: most pixel memory to keep, None for no limit.
+    """
+
+    def __init__(self, resolution=1.0, max_entries=None, rotate=None, max_bytes=None):
+        self.resolution = resolution
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.rotate = pygame.transform.rotate if rotate is None else rotate
+        self._surfs = OrderedDict()
+
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._surfs)
+
+    def key(self, image, angle):
+        """
+        The cache key for an image at an angle.
+
+        :param image: the surface to rotate.
+        :param angle: angle in degrees, counter clockwise.
+        """
+        return image, int(round(angle / self.resolution))
+
+    def get(self, image, angle):
+        """
+        Return the image rotated to the nearest angle step.
+
+        :param image: the surface to rotate.
+        :param angle: angle in degrees, counter clockwise.
+        :return: the rotated surface.
+        """
+        key = self.key(image, angle)
+        surf = self._surfs.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._surfs.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = self.rotate(image, key[1] * self.resolution)
+        self._add(key, surf)
+        return surf
+
+    def _over_budget(self):
+        return (
+            self.max_entries is not None and len(self._surfs) > self.max_entries
+        ) or (self.max_bytes is not None and self.bytes > self.max_bytes)
+
+    def _add(self, key, surf):
+        self._surfs[key] = surf
+        self.bytes += surface_bytes(surf)
+        # always keep the newest one, even if it is over budget by itself.
+        while len(self._surfs) > 1 and self._over_budget():
+            _, old = self._surfs.popitem(last=False)
+            self.bytes -= surface_bytes(old)
+            self.evictions += 1
+
+    def prewarm(self, images, min_angle, max_angle):
+        """
+        Rotate images to every angle step in a range, ahead of time.
+
+        :param images: the surfaces to rotate.
+        :param min_angle: smallest angle in degrees.
+        :param max_angle: biggest angle in degrees.
+        """
+        for _ in self.prewarm_steps(images, min_angle, max_angle):
+            pass
+
+    def prewarm_steps(self, images, min_angle, max_angle):
+        """
+        Like prewarm, rotating one image each time it is iterated, so the
+        work can be spread over frames.
+
+        >>> steps = rotations.prewarm_steps(images, -10, 10)
+        >>> for _ in itertools.islice(steps, 4):  # four this frame.
+        ...     pass
+
+        :param images: the surfaces to rotate.
+        :param min_angle: smallest angle in degrees.
+        :param max_angle: biggest angle in degrees.
+        """
+        first = int(round(min_angle / self.resolution))
+        last = int(round(max_angle / self.resolution))
+        for image in images:
+            for step in range(first, last + 1):
+                key = (image, step)
+                # it may have been rotated by get since we started.
+                if key not in self._surfs:
+                    self._add(key, self.rotate(image, step * self.resolution))
+                    yield key
+
+    def clear(self):
+        """
+        Forget all of the rotated surfaces.
+        """
+        self._surfs.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """
+        Counters, for showing how well the cache works.
+
+        :return: dict of entries, bytes, hits, misses and evictions.
+        """
+        return {
+            "entries": len(self._surfs),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
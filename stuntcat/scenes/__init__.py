@@ -1,21 +1,45 @@
 """
 Scenes module.
+
+Scenes are imported when they are first used, so starting the game
+doesn't import the platformer, with pymunk and pytmx, unless it's played.
+
+::Example::
+
+    >>> from stuntcat.scenes import CatUniScene
+    >>> scene_class = load_scene("PlatformerScene")
+
 """
+import importlib
 
 from stuntcat.scenes.scene import Scene
-from .gameover import GameOverScene
-from .loading import LoadingScene
-from .news import NewsScene
-from .settings import SettingsScene
-from .unisharklazer import CatUniScene
-from .platformer.platformer import PlatformerScene
-
-__all__ = [
-    "Scene",
-    "GameOverScene",
-    "LoadingScene",
-    "NewsScene",
-    "SettingsScene",
-    "CatUniScene",
-    "PlatformerScene",
-]
+
+# scene name: the module it is in.
+SCENES = {
+    "GameOverScene": "stuntcat.scenes.gameover",
+    "LoadingScene": "stuntcat.scenes.loading",
+    "NewsScene": "stuntcat.scenes.news",
+    "SettingsScene": "stuntcat.scenes.settings",
+    "CatUniScene": "stuntcat.scenes.unisharklazer",
+    "PlatformerScene": "stuntcat.scenes.platformer.platformer",
+}
+
+
+def load_scene(name):
+    """
+    Import a scene class, by name.
+
+    :param name: a name in SCENES, like "CatUniScene".
+    :return: the scene class.
+    """
+    return getattr(importlib.import_module(SCENES[name]), name)
+
+
+def __getattr__(name):
+    """Import scenes when they are first asked for."""
+    if name in SCENES:
+        return load_scene(name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+__all__ = ["Scene", "SCENES", "load_scene"]
@@ -4,6 +4,7 @@ Loading module.
 import pygame as pg
 
 from .scene import Scene
+from ..assets import MANIFEST, Preloader
 from ..resources import gfx, music
 
 
@@ -20,12 +21,22 @@ class LoadingScene(Scene):
         self.image = gfx("intro_screen.png", convert=True)
         music("mainmenu.ogg", play=True)
 
+        # the cat scene assets load while the music plays.
+        self.preloader = Preloader(MANIFEST["CatUniScene"])
+        self.preloader.start()
+
     def render(self):
         """
         Render the scene.
         """
         self.screen.fill((255, 0, 255))
         self.screen.blit(self.image, [0, 0])
+        if not self.preloader.done:
+            width, height = self.screen.get_size()
+            bar_rect = pg.Rect(0, height - 8, width, 8)
+            self.screen.fill((0, 0, 0), bar_rect)
+            bar_rect.width = int(width * self.preloader.progress)
+            self.screen.fill((255, 255, 255), bar_rect)
         return [self.screen.get_rect()]
 
     def tick(self, time_delta):
@@ -34,18 +45,29 @@ class LoadingScene(Scene):
 
         :param time_delta: The time delta.
         """
-        if not pg.mixer.music.get_busy():
+        self.preloader.update()
+        if not pg.mixer.music.get_busy() and self.preloader.done:
             self.next_scene()
 
     def next_scene(self):
         """
         Progress to next scene.
         """
+        # skipping the intro waits for the rest of the assets.
+        self.preloader.finish()
         self._game.scenes.remove(self)
+        self.close()
         self._game.add_cat_scene()
         self.active = False
         music(stop=True)
 
+    def close(self):
+        """
+        Called when the scene is removed, stops the preloading.
+        """
+        self.preloader.cancel()
+        Scene.close(self)
+
     def event(self, event):
         """
         Process a pygame event.
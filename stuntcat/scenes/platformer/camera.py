@@ -0,0 +1,126 @@
+"""
+Camera module.
+
+The camera is the part of the map on the screen. It follows the cat,
+only moving when the cat gets near an edge of the screen, so while the
+cat stays near the middle only the moving sprites are drawn again.
+
+Only what the camera sees is drawn. The background is made of the sky
+and the map chunks that overlap the view. Sprites of shapes outside of
+the view, found with Space.bb_query, are hidden and not updated.
+
+::Example::
+
+    >>> camera = Camera((960, 540), bounds=pygame.Rect(0, 0, 4000, 1000))
+    >>> camera.look_at((1000, 500))
+    >>> camera.to_screen((600, 300))
+    (80, 70)
+    >>> camera.follow(cat_position)
+    True
+
+"""
+import pygame
+import pymunk
+
+
+class Camera:
+    """
+    A view of part of the map, which follows a point.
+
+    :param size: (width, height) of the view, the screen size.
+    :param bounds: rect of the map the view stays in, or None.
+    :param deadzone: fraction of the view in the middle the point can
+                     move in without the camera moving.
+    :param margin: pixels around the view, where sprites are still
+                   drawn, as their images can be bigger than their shapes.
+    """
+
+    def __init__(self, size, bounds=None, deadzone=0.3, margin=64):
+        self.rect = pygame.Rect((0, 0), size)
+        self.bounds = bounds
+        self.deadzone = deadzone
+        self.margin = margin
+
+    @property
+    def offset(self):
+        """
+        Add to a map position to get the screen position.
+        """
+        return -self.rect.x, -self.rect.y
+
+    def to_screen(self, position):
+        """
+        Screen position of a map position.
+
+        :param position: (x, y) in the map.
+        """
+        return int(position[0]) - self.rect.x, int(position[1]) - self.rect.y
+
+    def follow(self, position):
+        """
+        Move the view, if the position is outside of the deadzone.
+
+        :param position: (x, y) in the map to follow, or None to stay.
+        :return: True if the view moved.
+        """
+        if position is None:
+            return False
+        old_topleft = self.rect.topleft
+        zone = self.rect.inflate(
+            -int(self.rect.width * (1 - self.deadzone)),
+            -int(self.rect.height * (1 - self.deadzone)),
+        )
+        x_pos, y_pos = int(position[0]), int(position[1])
+        if x_pos < zone.left:
+            self.rect.x += x_pos - zone.left
+        elif x_pos > zone.right:
+            self.rect.x += x_pos - zone.right
+        if y_pos < zone.top:
+            self.rect.y += y_pos - zone.top
+        elif y_pos > zone.bottom:
+            self.rect.y += y_pos - zone.bottom
+        self.clamp()
+        return self.rect.topleft != old_topleft
+
+    def look_at(self, position):
+        """
+        Center the view on a position.
+
+        :param position: (x, y) in the map.
+        """
+        self.rect.center = int(position[0]), int(position[1])
+        self.clamp()
+
+    def clamp(self):
+        """
+        Keep the view inside of the bounds.
+        """
+        if self.bounds is not None:
+            self.rect.clamp_ip(self.bounds)
+
+    def bb(self):
+        """
+        The view and its margin, as a pymunk.BB for Space.bb_query.
+        """
+        view = self.rect.inflate(self.margin * 2, self.margin * 2)
+        # pymunk.BB is (left, bottom, right, top), with bottom the smaller y.
+        return pymunk.BB(view.left, view.top, view.right, view.bottom)
+
+    def visible_chunks(self, tmxdata):
+        """
+        The map chunks that overlap the view.
+
+        :param tmxdata: the map_cache.BakedMap.
+        :return: list of ((column, row), chunk surface).
+        """
+        size = tmxdata.chunk_size
+        visible = []
+        # only look up the chunks under the view, however big the map is.
+        for row in range(self.rect.top // size, (self.rect.bottom - 1) // size + 1):
+            for column in range(
+                self.rect.left // size, (self.rect.right - 1) // size + 1
+            ):
+                chunk = tmxdata.chunk(column, row)
+                if chunk is not None:
+                    visible.append(((column, row), chunk))
+        return visible
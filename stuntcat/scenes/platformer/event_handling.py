@@ -90,7 +90,7 @@ class EventHandler:
             self.buttons[button] = PlayerInput(button)
 
     def __repr__(self):
-        print(self.event_map)
+        return repr(self.event_map)
 
     def process_event(self, event):
         """
@@ -159,7 +159,7 @@ class GamepadInput(EventHandler):
         self.init_all_joysticks()
 
     def __repr__(self):
-        print(GamepadInput.default_input_map)
+        return repr(GamepadInput.default_input_map)
 
     @staticmethod
     def init_all_joysticks():
@@ -0,0 +1,321 @@
+"""
+Physics module.
+
+How the pymunk space for a map is set up: the solver iterations, letting
+bodies that stopped moving sleep, and a spatial hash for finding which
+shapes may touch, sized from the map tiles.
+
+::Example::
+
+    >>> space = PROFILES["default"].make_space(tmxdata)
+    >>> add_static_boxes(space, rects, PROFILES["default"])
+
+Run this module to time stepping a map with hundreds of boxes and yarn
+balls, with each profile.
+
+    python -m stuntcat.scenes.platformer.physics
+
+"""
+import os
+import random
+import tempfile
+import time
+
+import pymunk
+
+from stuntcat import resources
+from .static_geometry import MAP_FIXED, map_boxes, static_boxes
+
+MAP_YARN_SPAWN = "yarn_spawn"
+BALL_RADIUS = 16
+BALL_MASS = 1
+
+
+class PhysicsProfile:  # pylint:disable=too-many-instance-attributes
+    """
+    Settings for a pymunk space.
+
+    :param gravity: (x, y) gravity.
+    :param iterations: solver iterations a step, more is stiffer.
+    :param sleep_time: seconds a body is idle before it sleeps,
+                       inf for never.
+    :param idle_speed: speed under which a body is idle, 0 for pymunk
+                       to pick one from the gravity.
+    :param spatial_hash: use a spatial hash instead of pymunk's tree.
+    :param hash_cell_tiles: spatial hash cell size, in tiles.
+    :param shared_static: put static boxes on the space's one static
+                          body, instead of a body each.
+    :param merge_static: join the fixed boxes of a map into fewer boxes.
+    """
+
+    def __init__(
+        self,
+        *,
+        gravity=(0, 1000),
+        iterations=10,
+        sleep_time=0.5,
+        idle_speed=0.0,
+        spatial_hash=True,
+        hash_cell_tiles=2,
+        shared_static=True,
+        merge_static=True,
+    ):  # pylint:disable=too-many-arguments
+        self.gravity = gravity
+        self.iterations = iterations
+        self.sleep_time = sleep_time
+        self.idle_speed = idle_speed
+        self.spatial_hash = spatial_hash
+        self.hash_cell_tiles = hash_cell_tiles
+        self.shared_static = shared_static
+        self.merge_static = merge_static
+
+    def make_space(self, tmxdata=None):
+        """
+        Make a space with these settings.
+
+        :param tmxdata: the pytmx.TiledMap the space is for, which sizes
+                        the spatial hash.
+        :return: pymunk.Space
+        """
+        space = pymunk.Space()
+        space.gravity = self.gravity
+        space.iterations = self.iterations
+        space.sleep_time_threshold = self.sleep_time
+        space.idle_speed_threshold = self.idle_speed
+        if self.spatial_hash:
+            space.use_spatial_hash(*self.hash_size(tmxdata))
+        return space
+
+    def map_boxes(self, tmxdata):
+        """
+        The fixed boxes of a map to add, merged if merge_static.
+
+        :param tmxdata: the pytmx.TiledMap.
+        :return: list of (x, y, width, height).
+        """
+        return static_boxes(tmxdata) if self.merge_static else map_boxes(tmxdata)
+
+    def hash_size(self, tmxdata=None):
+        """
+        Cell size and number of cells for the spatial hash.
+
+        :param tmxdata: the pytmx.TiledMap, or None for 32 pixel tiles.
+        :return: (dim, count) for pymunk.Space.use_spatial_hash.
+        """
+        if tmxdata is None:
+            return 32 * self.hash_cell_tiles, 1000
+        tile_size = max(tmxdata.tilewidth, tmxdata.tileheight)
+        map_cells = (tmxdata.width * tmxdata.height) // self.hash_cell_tiles ** 2
+        # pymunk suggests about 10 cells for each shape.
+        count = max(1000, map_cells, 10 * sum(1 for _ in tmxdata.objects))
+        return tile_size * self.hash_cell_tiles, count
+
+
+PROFILES = {
+    # the static boxes are kept apart from the moving shapes by pymunk,
+    # so its tree was faster than the hash with only a few hundred balls.
+    "default": PhysicsProfile(spatial_hash=False),
+    "hash": PhysicsProfile(),
+    # how the platformer set up its space before profiles.
+    "plain": PhysicsProfile(
+        sleep_time=float("inf"),
+        spatial_hash=False,
+        shared_static=False,
+        merge_static=False,
+    ),
+}
+
+
+def add_static_boxes(space, rects, profile, friction=1.0, elasticity=1.0):
+    """
+    Add static boxes to a space.
+
+    :param space: the pymunk.Space.
+    :param rects: (x, y, width, height) of each box.
+    :param profile: the PhysicsProfile, for shared_static.
+    :param friction: friction of the boxes.
+    :param elasticity: elasticity of the boxes.
+    :return: list of the pymunk.Poly shapes added.
+    """
+    shapes = []
+    for x_pos, y_pos, width, height in rects:
+        vertices = [(0, 0), (width, 0), (width, height), (0, height)]
+        if profile.shared_static:
+            body = space.static_body
+            vertices = [(x + x_pos, y + y_pos) for x, y in vertices]
+        else:
+            body = pymunk.Body(body_type=pymunk.Body.STATIC)
+            body.position = x_pos, y_pos
+            space.add(body)
+        shape = pymunk.Poly(body, vertices)
+        shape.friction = friction
+        shape.elasticity = elasticity
+        shapes.append(shape)
+    space.add(shapes)
+    return shapes
+
+
+def benchmark_objects(boxes=400, balls=200, seed=1, size=(160, 60, 32)):
+    """
+    A floor and walls of tiles, many boxes and yarn balls over them.
+
+    :param boxes: how many fixed boxes.
+    :param balls: how many yarn balls.
+    :param seed: random seed, so the objects are the same every time.
+    :param size: (width, height) of the map in tiles, and the tile size.
+    :return: list of (type, x, y, width, height).
+    """
+    rng = random.Random(seed)
+    width, height, tile = size
+    # a box for every tile of the floor and walls, like a tile map.
+    objects = [
+        (MAP_FIXED, column * tile, (height - 1) * tile, tile, tile)
+        for column in range(width)
+    ]
+    for row in range(height - 1):
+        objects.append((MAP_FIXED, 0, row * tile, tile, tile))
+        objects.append((MAP_FIXED, (width - 1) * tile, row * tile, tile, tile))
+    # boxes on their own tiles in the bottom half, so none overlap.
+    spots = [
+        (column, row)
+        for column in range(2, width - 2, 2)
+        for row in range(height // 2, height - 2)
+    ]
+    for column, row in rng.sample(spots, boxes):
+        objects.append((MAP_FIXED, column * tile, row * tile, tile, tile))
+    for _ in range(balls):
+        column, row = rng.randint(2, width - 3), rng.randint(1, height // 2 - 2)
+        objects.append((MAP_YARN_SPAWN, column * tile, row * tile, tile, tile))
+    return objects
+
+
+def make_benchmark_map(path, boxes=400, balls=200, seed=1):
+    """
+    Write a map with a floor and walls of tiles, many boxes and yarn
+    balls over them.
+
+    :param path: the .tmx file to write.
+    :param boxes: how many fixed boxes.
+    :param balls: how many yarn balls.
+    :param seed: random seed, so the map is the same every time.
+    """
+    width, height, tile = size = (160, 60, 32)
+    objects = benchmark_objects(boxes, balls, seed, size)
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<map version="1.0" orientation="orthogonal" renderorder="right-down" '
+        'width="%s" height="%s" tilewidth="%s" tileheight="%s" '
+        'nextobjectid="%s">' % (width, height, tile, tile, len(objects) + 1),
+        ' <objectgroup name="Object Layer 1">',
+    ]
+    for object_id, obj in enumerate(objects, 1):
+        # obj is (type, x, y, width, height).
+        lines.append(
+            '  <object id="%s" type="%s" x="%s" y="%s" width="%s" height="%s"/>'
+            % ((object_id,) + obj)
+        )
+    lines.extend([" </objectgroup>", "</map>", ""])
+    with open(path, "w", encoding="utf-8") as map_file:
+        map_file.write("\n".join(lines))
+
+
+def load_space(tmxdata, profile):
+    """
+    A space with the static boxes and yarn balls of a map, without sprites.
+
+    :param tmxdata: the pytmx.TiledMap.
+    :param profile: the PhysicsProfile.
+    :return: (space, list of ball bodies)
+    """
+    space = profile.make_space(tmxdata)
+    add_static_boxes(space, profile.map_boxes(tmxdata), profile)
+    balls = []
+    for obj in tmxdata.objects:
+        if obj.type == MAP_YARN_SPAWN:
+            body = pymunk.Body()
+            body.position = obj.x + BALL_RADIUS, obj.y + BALL_RADIUS
+            shape = pymunk.Circle(body, BALL_RADIUS)
+            shape.mass = BALL_MASS
+            shape.elasticity = 0.25
+            shape.friction = 1
+            space.add(body, shape)
+            balls.append(body)
+    return space, balls
+
+
+def benchmark_map_path(path=None):
+    """
+    The benchmark map, made if missing.
+
+    :param path: the .tmx file. The benchmark map if None.
+    :return: the path of the map.
+    """
+    if path is None:
+        path = resources.map_path("benchmark.tmx")
+        if not os.path.exists(path):
+            # made in the temp dir, never written into the installed package.
+            path = os.path.join(tempfile.gettempdir(), "stuntcat-benchmark.tmx")
+            make_benchmark_map(path)
+    elif not os.path.exists(path):
+        make_benchmark_map(path)
+    return path
+
+
+def time_loading(tmxdata):
+    """
+    Print how long setting up the space of a map takes with each profile.
+
+    :param tmxdata: the pytmx.TiledMap.
+    """
+    for name, profile in PROFILES.items():
+        start = time.perf_counter()
+        space, balls = load_space(tmxdata, profile)
+        load_ms = (time.perf_counter() - start) * 1000
+        shapes = len(space.shapes) - len(balls)
+        print("%s: %s static shapes, loaded in %.1f ms" % (name, shapes, load_ms))
+
+
+def time_stepping(tmxdata, seconds, step):
+    """
+    Print how long stepping a map takes with each profile, as the balls settle.
+
+    :param tmxdata: the pytmx.TiledMap.
+    :param seconds: game seconds to print timings after.
+    :param step: seconds in each space.step.
+    """
+    print("profile   game seconds   ms a step   sleeping balls")
+    for name, profile in PROFILES.items():
+        space, balls = load_space(tmxdata, profile)
+        done = 0
+        for until in seconds:
+            steps = int(round((until - done) / step))
+            start = time.perf_counter()
+            for _ in range(steps):
+                space.step(step)
+            step_ms = (time.perf_counter() - start) * 1000 / steps
+            sleeping = sum(1 for body in balls if body.is_sleeping)
+            print("%-9s %12s %11.3f %16s" % (name, until, step_ms, sleeping))
+            done = until
+
+
+def benchmark(path=None, seconds=(1, 2, 4, 8), step=1 / 300.0):
+    """
+    Time stepping the benchmark map with each profile, as the balls settle.
+
+    :param path: the .tmx file, made if missing. The benchmark map if None.
+    :param seconds: game seconds to print timings after.
+    :param step: seconds in each space.step.
+    """
+    # pylint:disable=import-outside-toplevel
+    import pytmx
+
+    path = benchmark_map_path(path)
+    tmxdata = pytmx.TiledMap(path)
+    num_objects = sum(1 for _ in tmxdata.objects)
+    print("%s: %s objects" % (os.path.basename(path), num_objects))
+    time_loading(tmxdata)
+    time_stepping(tmxdata, seconds, step)
+
+
+if __name__ == "__main__":
+    benchmark()
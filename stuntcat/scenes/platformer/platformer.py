@@ -2,29 +2,27 @@
 Platformer Module
 """
 
-from os.path import join as path_join
-
-import pymunk
-import pytmx
-
 import pygame.mixer
+import pymunk
 from pygame import Rect
-from pygame.sprite import LayeredUpdates
+from pygame.sprite import LayeredDirty
 
 from stuntcat import resources
+from stuntcat.assets import MANIFEST, load_assets
 from stuntcat.scenes.scene import Scene
 from . import actions
 from . import event_handling
 from . import sprite
 from . import unicyclecat
+from .camera import Camera
 from .model import BasicModel
+from .physics import MAP_YARN_SPAWN, PROFILES, add_static_boxes
 from .simplefsm import SimpleFSM
+from .stepper import PhysicsStepper
 
-# constants used in the map
-MAP_FIXED = "fixed"
+# constants used in the map, with MAP_YARN_SPAWN.
 MAP_SPAWN = "player_spawn"
 MAP_PLAYER_SPAWN = "player_spawn"
-MAP_YARN_SPAWN = "yarn_spawn"
 
 CONTROL = (
     ((actions.LEFT, True), "idle", "move", 1),
@@ -37,61 +35,55 @@ CONTROL = (
 )
 
 
-class PlatformerScene(Scene):
+class PlatformerScene(Scene):  # pylint:disable=too-many-instance-attributes
     """
     Platformer Scene class.
+
+    :param game: The game the scene is in.
+    :param physics: name of the PhysicsProfile in PROFILES to use.
     """
 
-    def __init__(self, game):
+    def __init__(self, game, physics="default"):
         super().__init__(game)
         self.player = None
         self.active = True
         self.fsm = None
-        self.space = pymunk.Space()
-        self.space.gravity = (0, 1000)
-        self.sprites = LayeredUpdates()
+        self.physics = PROFILES[physics]
+        self.space = None
+        self.stepper = None
+        self.tmxdata = None
+        self.first_render = True
+        self.camera = Camera(self._game.screen.get_size())
+        self.camera_moved = False
+        self.sprites = LayeredDirty(_time_threshold=1000 / 10.0)
+        # shape: its sprite, and the sprites the camera sees.
+        self.shape_sprites = {}
+        self.shown = set()
         self.event_handler = event_handling.EventQueueHandler()
         self.event_handler.print_controls()
-        self.background = resources.gfx("background.png", convert=True)
+        load_assets(MANIFEST["PlatformerScene"], owner=self)
+        self.sky = resources.gfx("background.png", convert=True)
+        # what the camera sees behind the sprites, drawn again when it moves.
+        self.background = self._game.screen.copy()
+        self.sprites.clear(self._game.screen, self.background)
         self.load()
         pygame.mixer.music.load(resources.music_path("zirkus.ogg"))
         pygame.mixer.music.play(-1)
 
-    def add_static(self, vertices, rect):
-        """
-        Add static object to scene.
-
-        :param vertices:
-        :param rect:
-        """
-        body = pymunk.Body(body_type=pymunk.Body.STATIC)
-        body.position = rect.x, rect.y
-        shape = pymunk.Poly(body, vertices)
-        shape.friction = 1.0
-        shape.elasticity = 1.0
-        self.space.add(body, shape)
-
     def load(self):
         """
         Load a scene in TMX format.
         """
+        tmxdata = resources.tmx_map("untitled.tmx")
+        self.tmxdata = tmxdata
+        self.space = self.physics.make_space(tmxdata)
+        self.stepper = PhysicsStepper(self.space)
+        boxes = self.physics.map_boxes(tmxdata)
+        add_static_boxes(self.space, boxes, self.physics)
+        self.camera.bounds = self.camera_bounds(boxes)
 
-        def box_vertices(box_x, box_y, width, height):
-            top_left = box_x, box_y
-            top_right = box_x + width, box_y
-            bottom_right = box_x + width, box_y + height
-            bottom_left = box_x, box_y + height
-            return top_left, top_right, bottom_right, bottom_left
-
-        filename = path_join("data", "maps", "untitled.tmx")
-        tmxdata = pytmx.util_pygame.load_pygame(filename)
         for obj in tmxdata.objects:
-            if obj.type == MAP_FIXED:
-                rect = Rect(obj.x, obj.y, obj.width, obj.height)
-                vertices = box_vertices(0, 0, obj.width, obj.height)
-                self.add_static(vertices, rect)
-
-            elif obj.type == MAP_YARN_SPAWN:
+            if obj.type == MAP_YARN_SPAWN:
                 ball = sprite.Ball(Rect((obj.x, obj.y), (32, 32)))
                 model = BasicModel()
                 model.sprites = [ball]
@@ -102,9 +94,94 @@ class PlatformerScene(Scene):
             elif obj.type == MAP_PLAYER_SPAWN:
                 self.player = unicyclecat.build(self.space, self.sprites)
                 self.player.position = obj.x, obj.y
+                self.track_sprites(self.player.sprites)
 
+        target = self.camera_target()
+        if target is not None:
+            self.camera.look_at(target)
         self.fsm = SimpleFSM(CONTROL, "idle")
 
+    def track_sprites(self, sprites):
+        """
+        Find these sprites by their shapes, to show them when the camera
+        sees their shape. They are hidden until then.
+
+        :param sprites: ShapeSprites in self.sprites.
+        """
+        for asprite in sprites:
+            self.shape_sprites[asprite.shape] = asprite
+            asprite.visible = 0
+            self.shown.discard(asprite)
+
+    def camera_bounds(self, boxes):
+        """
+        Where the camera can go: inside of the walls, where it's drawn.
+
+        :param boxes: the fixed boxes of the map.
+        """
+        drawn = self.sky.get_rect()
+        drawn.unionall_ip(
+            [self.tmxdata.chunk_rect(*key) for key in self.tmxdata.chunks]
+        )
+        if not boxes:
+            return drawn
+        walls = Rect(boxes[0]).unionall([Rect(box) for box in boxes])
+        inside = walls.clip(drawn)
+        return inside if inside.width and inside.height else drawn
+
+    def camera_target(self):
+        """
+        Where the camera looks, the cat's wheel, or None.
+        """
+        body = getattr(self.player, "feet", None)
+        return None if body is None else body.position
+
+    def draw_background(self):
+        """
+        Draw the sky and the map chunks the camera sees.
+
+        The sky is a picture of the arena at the top left of the map,
+        so it moves with the map. Past its edges is black.
+        """
+        sky_rect = self.sky.get_rect(topleft=self.camera.to_screen((0, 0)))
+        if not sky_rect.contains(self.background.get_rect()):
+            self.background.fill((0, 0, 0))
+        self.background.blit(self.sky, sky_rect)
+        for key, chunk in self.camera.visible_chunks(self.tmxdata):
+            chunk_rect = self.tmxdata.chunk_rect(*key)
+            self.background.blit(chunk, self.camera.to_screen(chunk_rect.topleft))
+
+    def cull_sprites(self):
+        """
+        Show the sprites with shapes the camera sees, and hide the rest.
+
+        Sprites of removed shapes are killed here, seen or not, as only
+        the shown sprites are updated.
+
+        :return: set of the shown sprites.
+        """
+        removed = [
+            shape for shape in self.shape_sprites if hasattr(shape, "needs_remove")
+        ]
+        for shape in removed:
+            asprite = self.shape_sprites.pop(shape)
+            asprite.kill()
+            self.shown.discard(asprite)
+
+        shapes = self.space.bb_query(self.camera.bb(), pymunk.ShapeFilter())
+        shown = {
+            self.shape_sprites[shape]
+            for shape in shapes
+            if shape in self.shape_sprites and self.shape_sprites[shape].alive()
+        }
+        # setting visible makes a sprite dirty, so only when it changes.
+        for asprite in self.shown - shown:
+            asprite.visible = 0
+        for asprite in shown - self.shown:
+            asprite.visible = 1
+        self.shown = shown
+        return shown
+
     def add_model(self, model):
         """
         Add a model.
@@ -113,6 +190,7 @@ class PlatformerScene(Scene):
         """
         self.sprites.add(*model.sprites)
         self.space.add(model.pymunk_objects)
+        self.track_sprites(model.sprites)
 
     def remove_model(self, model):
         """
@@ -122,25 +200,54 @@ class PlatformerScene(Scene):
         """
         self.sprites.remove(*model.sprites)
         self.space.remove(model.pymunk_objects)
+        for asprite in model.sprites:
+            self.shape_sprites.pop(asprite.shape, None)
+            self.shown.discard(asprite)
 
     def render(self):
         """
         Render scene to the screen surface.
 
+        Only the sprites that moved or turned are drawn, over the
+        background where they were, and only their rects are returned.
+        When the camera moves, everything is drawn again.
         """
         surface = self._game.screen
-        surface.blit(self.background, (0, 0))
-        self.sprites.draw(surface)
-        return [surface.get_rect()]
+        rects = []
+        if self.first_render or self.camera_moved:
+            self.first_render = False
+            self.camera_moved = False
+            self.draw_background()
+            self.sprites.repaint_rect(surface.get_rect())
+            rects.append(surface.get_rect())
+        rects.extend(self.sprites.draw(surface))
+        # LayeredDirty draws everything when drawing rects gets too slow.
+        use_update = self.sprites._use_update  # pylint:disable=protected-access
+        self._game.profiler.notes["LayeredDirty"] = (
+            "dirty rects" if use_update else "full screen"
+        )
+        return rects
 
     def tick(self, time_delta):
         """
         Tick the physics and game update loops.
         """
-        step_amount = (1 / 30.0) / 30
-        for _ in range(30):
-            self.space.step(step_amount)
-        self.sprites.update(time_delta=time_delta)
+        self.stepper.advance(time_delta)
+        self._game.profiler.notes["physics"] = self.stepper.describe()
+        if self.camera.follow(self.camera_target()):
+            self.camera_moved = True
+
+        # sprites the camera doesn't see are not turned or moved.
+        shown = self.cull_sprites()
+        for asprite in shown:
+            asprite.update(
+                time_delta=time_delta, offset=self.camera.offset, stepper=self.stepper
+            )
+        self._game.profiler.notes["camera"] = "%s of %s sprites, %s" % (
+            len(shown),
+            len(self.sprites),
+            "moved" if self.camera_moved else "still",
+        )
 
     def event(self, event):
         """
@@ -10,9 +10,33 @@ from pygame.transform import rotozoom, smoothscale
 from pymunk import Body, Circle
 
 from stuntcat import resources
+from stuntcat.rotation_cache import RotationCache
 
 BALL_MASS = 1
 
+# Rotated images shared by all ShapeSprites, one per image and degree.
+ROTATIONS = RotationCache(
+    resolution=1.0,
+    rotate=lambda image, angle: rotozoom(image, angle, 1),
+    max_bytes=32 * 1024 * 1024,
+)
+
+_SCALED = {}
+
+
+def scaled(image, size):
+    """
+    Return the image smoothscaled to a size, so sprites of the same
+    image and size share one surface (and so its rotations).
+
+    :param image: the surface.
+    :param size: (width, height) to scale to.
+    """
+    key = (image, size)
+    if key not in _SCALED:
+        _SCALED[key] = smoothscale(image, size)
+    return _SCALED[key]
+
 
 class ShapeSprite(DirtySprite):
     """
@@ -25,31 +49,60 @@ class ShapeSprite(DirtySprite):
         self.shape = shape
         self._old_angle = None
         self.image = None
-        self.rect = None
+        self.rect = Rect(0, 0, 0, 0)
         if shape and image:
             bounding_box = shape.cache_bb()
             size = (
                 int((bounding_box.right - bounding_box.left) * factor),
                 int((bounding_box.top - bounding_box.bottom) * factor),
             )
-            self.original_image = smoothscale(image, size)
+            self.original_image = scaled(image, size)
+
+    def prewarm(self, min_angle=-180, max_angle=180):
+        """
+        Rotate our image to every degree in a range, ahead of time.
+
+        :param min_angle: smallest angle in degrees.
+        :param max_angle: biggest angle in degrees.
+        """
+        ROTATIONS.prewarm([self.original_image], min_angle, max_angle)
 
     def update(self, *args, **kwargs):
         """
         Update the shape sprite.
 
+        :param offset: keyword, (x, y) added to the shape position, to
+                       draw it where the camera sees it.
+        :param stepper: keyword, the PhysicsStepper, to draw the shape
+                        between its last two physics frames.
         """
         if hasattr(self.shape, "needs_remove"):
             self.kill()
         else:
-            angle = round(degrees(self.shape.body.angle), 0)
+            # keep within -180 to 179, the turn prewarm makes, so a
+            # rolling wheel reuses rotations.
+            angle = (round(degrees(self.shape.body.angle)) + 180) % 360 - 180
             if angle != self._old_angle:
-                self.image = rotozoom(self.original_image, -angle, 1)
+                self.image = ROTATIONS.get(self.original_image, -angle)
                 self.rect = self.image.get_rect()
                 self._old_angle = angle
                 self.dirty = 1
 
-            self.rect.center = self.shape.bb.center()
+            # only redrawn when it moved a pixel, or turned.
+            old_center = self.rect.center
+            offset = kwargs.get("offset", (0, 0))
+            center = self.shape.bb.center()
+            stepper = kwargs.get("stepper")
+            if stepper is not None:
+                body = self.shape.body
+                drawn = stepper.drawn_position(body)
+                offset = (
+                    offset[0] + drawn[0] - body.position[0],
+                    offset[1] + drawn[1] - body.position[1],
+                )
+            self.rect.center = center[0] + offset[0], center[1] + offset[1]
+            if self.rect.center != old_center:
+                self.dirty = 1
 
 
 class Ball(ShapeSprite):
@@ -70,3 +123,5 @@ class Ball(ShapeSprite):
         self.rect = Rect(0, 0, rect.width, rect.width)
         self.original_image = resources.gfx("yarnball.png", convert_alpha=True)
         self.pymunk_shapes = (body, self.shape)
+        # balls roll all the way around.
+        self.prewarm()
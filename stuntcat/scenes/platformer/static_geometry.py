@@ -0,0 +1,146 @@
+"""
+Static geometry module.
+
+Maps are drawn with many fixed boxes, often touching or overlapping, like
+a floor of tiles. Each would be a pymunk shape to check collisions with,
+and balls catch on the seams between them.
+
+merge_boxes joins them into fewer boxes covering the same area, which
+don't overlap. The merged boxes are saved in the user cache next to the
+baked maps, named by a hash of the .tmx file like them, so they are only
+merged again when the map changes.
+
+::Example::
+
+    >>> boxes = static_boxes(tmxdata)
+    >>> add_static_boxes(space, boxes, profile)
+
+"""
+import json
+import os
+import threading
+from bisect import bisect_left
+
+from stuntcat.cache_paths import default_cache_path, file_hash
+
+MAP_FIXED = "fixed"
+
+
+def merge_boxes(boxes):  # pylint:disable=too-many-locals
+    """
+    Join boxes into fewer boxes covering the same area, with no overlaps.
+
+    The area is cut on every box edge into a grid of cells. Covered cells
+    next to each other in a row are joined, then the same runs in the rows
+    below. This is not always the fewest boxes, but is for floors, walls
+    and stacks of tiles.
+
+    :param boxes: (x, y, width, height) of each box.
+    :return: list of (x, y, width, height).
+    """
+    boxes = [box for box in boxes if box[2] > 0 and box[3] > 0]
+    x_edges = sorted({box[0] for box in boxes} | {box[0] + box[2] for box in boxes})
+    y_edges = sorted({box[1] for box in boxes} | {box[1] + box[3] for box in boxes})
+
+    covered = [[False] * (len(x_edges) - 1) for _ in range(len(y_edges) - 1)]
+    for x_pos, y_pos, width, height in boxes:
+        first_column = bisect_left(x_edges, x_pos)
+        last_column = bisect_left(x_edges, x_pos + width)
+        first_row = bisect_left(y_edges, y_pos)
+        last_row = bisect_left(y_edges, y_pos + height)
+        for row in range(first_row, last_row):
+            covered[row][first_column:last_column] = [True] * (
+                last_column - first_column
+            )
+
+    merged = []
+    # (first column, end column): row the box started on.
+    open_runs = {}
+    for row, cells in enumerate(covered + [[]]):
+        runs = set()
+        column = 0
+        while column < len(cells):
+            if cells[column]:
+                start = column
+                while column < len(cells) and cells[column]:
+                    column += 1
+                runs.add((start, column))
+            column += 1
+        for run in list(open_runs):
+            if run not in runs:
+                # the run stopped, so its box is finished.
+                start_row = open_runs.pop(run)
+                merged.append(
+                    (
+                        x_edges[run[0]],
+                        y_edges[start_row],
+                        x_edges[run[1]] - x_edges[run[0]],
+                        y_edges[row] - y_edges[start_row],
+                    )
+                )
+        for run in runs:
+            open_runs.setdefault(run, row)
+    return sorted(merged)
+
+
+def map_boxes(tmxdata):
+    """
+    The fixed boxes of a map.
+
+    :param tmxdata: the pytmx.TiledMap.
+    :return: list of (x, y, width, height).
+    """
+    return [
+        (obj.x, obj.y, obj.width, obj.height)
+        for obj in tmxdata.objects
+        if obj.type == MAP_FIXED
+    ]
+
+
+def cache_path(tmx_path, map_hash, path=None):
+    """
+    Where the merged boxes of a map are saved.
+
+    :param tmx_path: the .tmx file.
+    :param map_hash: file_hash of the .tmx file.
+    :param path: directory to keep them in, the user map cache if None.
+    """
+    path = default_cache_path("maps") if path is None else path
+    name = os.path.splitext(os.path.basename(tmx_path))[0]
+    return os.path.join(path, "%s-%s.static.json" % (name, map_hash))
+
+
+def static_boxes(tmxdata, path=None):
+    """
+    The merged fixed boxes of a map, from the cache if saved before.
+
+    :param tmxdata: the pytmx.TiledMap, or map_cache.BakedMap.
+    :param path: directory to keep them in, the user map cache if None.
+    :return: list of (x, y, width, height).
+    """
+    # baked maps know the hash of their .tmx, so it isn't read again.
+    map_hash = getattr(tmxdata, "source_hash", None) or file_hash(tmxdata.filename)
+    json_path = cache_path(tmxdata.filename, map_hash, path)
+    try:
+        with open(json_path, encoding="utf-8") as json_file:
+            return [tuple(box) for box in json.load(json_file)["boxes"]]
+    except (OSError, ValueError, KeyError):
+        # not saved yet, or from an older version.
+        pass
+
+    boxes = merge_boxes(map_boxes(tmxdata))
+    _save(json_path, {"boxes": boxes})
+    return boxes
+
+
+def _save(json_path, saved):
+    """Write the json, renaming at the end so it's never half written."""
+    tmp_path = "%s.%s-%s.tmp" % (json_path, os.getpid(), threading.get_ident())
+    try:
+        os.makedirs(os.path.dirname(json_path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as json_file:
+            json.dump(saved, json_file)
+        os.replace(tmp_path, json_path)
+    except OSError as err:
+        # the map still loads without it, like on a read only home.
+        print("could not save merged boxes %s: %s" % (json_path, err))
@@ -0,0 +1,213 @@
+"""
+Physics stepper module.
+
+Steps a pymunk space by the real frame time. The time is added to an
+accumulator and used up in physics frames of a fixed length, so the
+simulated time keeps up with the wall clock, and slow frames can't make
+it spiral.
+
+Each physics frame is split into substeps. Fast bodies, and joints with
+suddenly changing forces, need small substeps to not tunnel or wobble.
+A cat at rest does not. So the number of substeps is picked from how
+fast the bodies are going, and how the joints did in the last physics
+frame.
+
+The time left in the accumulator, as alpha, is used to draw the bodies
+in between where they were before the last physics frame and where they
+are now, so they move smoothly when frames and physics frames differ.
+
+::Example::
+
+    >>> stepper = PhysicsStepper(space)
+    >>> stepper.advance(time_delta)
+    >>> stepper.describe()
+    '1 frames, 8 substeps, 0.2 ms'
+    >>> stepper.drawn_position(body)
+    (120.5, 300.25)
+
+"""
+import math
+import time
+
+FRAME_MS = 1000 / 30.0
+MIN_SUBSTEPS = 4
+MAX_SUBSTEPS = 30
+MAX_FRAMES = 3  # most physics frames per tick, so slow frames don't spiral.
+MAX_TRAVEL = 4.0  # pixels a body may move in a substep.
+STRESS_FORCE = 2000.0  # change in joint force that needs the most substeps.
+
+
+class PhysicsStepper:  # pylint:disable=too-many-instance-attributes
+    """
+    Steps a pymunk space with an accumulator and adaptive substeps.
+
+    :param space: the pymunk.Space.
+    :param frame_ms: length of a physics frame.
+    :param min_substeps: fewest substeps in a physics frame.
+    :param max_substeps: most substeps in a physics frame.
+    :param max_frames: most physics frames run for one advance.
+    :param max_travel: pixels a body may move in one substep.
+    :param stress_force: change in a joint force between physics frames
+                         at which max_substeps are used.
+    """
+
+    def __init__(
+        self,
+        space,
+        *,
+        frame_ms=FRAME_MS,
+        min_substeps=MIN_SUBSTEPS,
+        max_substeps=MAX_SUBSTEPS,
+        max_frames=MAX_FRAMES,
+        max_travel=MAX_TRAVEL,
+        stress_force=STRESS_FORCE,
+    ):  # pylint:disable=too-many-arguments
+        self.space = space
+        self.frame_ms = frame_ms
+        self.min_substeps = min_substeps
+        self.max_substeps = max_substeps
+        self.max_frames = max_frames
+        self.max_travel = max_travel
+        self.stress_force = stress_force
+        self.accumulator = 0.0
+        self.substeps = min_substeps
+
+        # about the last advance.
+        self.frames = 0
+        self.steps = 0
+        self.solver_ms = 0.0
+        self.speed = 0.0
+        # the first frame gets the most substeps, as the joints settle.
+        self.force = stress_force
+        self._forces = {}
+        # body positions before the last physics frame, to draw from.
+        self.last_positions = {}
+
+        self.total_frames = 0
+        self.total_steps = 0
+        self.dropped_ms = 0.0
+
+    def pick_substeps(self, speed, force):
+        """
+        How many substeps a physics frame needs.
+
+        :param speed: the fastest body speed, in pixels a second.
+        :param force: the biggest change in a joint force.
+        """
+        travel = speed * self.frame_ms / 1000.0
+        by_speed = math.ceil(travel / self.max_travel)
+        by_stress = self.min_substeps + (self.max_substeps - self.min_substeps) * min(
+            1.0, force / self.stress_force
+        )
+        substeps = max(self.min_substeps, by_speed, int(math.ceil(by_stress)))
+        return min(self.max_substeps, substeps)
+
+    def _fastest(self):
+        """The speed of the fastest body."""
+        return max((body.velocity.length for body in self.space.bodies), default=0.0)
+
+    def _stress(self, step_seconds):
+        """
+        The biggest change in a joint force since the last physics frame.
+        Joints holding a resting weight have a big force that does not
+        change, and need no more substeps.
+        """
+        change = 0.0
+        forces = {}
+        for constraint in self.space.constraints:
+            force = constraint.impulse / step_seconds
+            change = max(change, abs(force - self._forces.get(constraint, 0.0)))
+            forces[constraint] = force
+        self._forces = forces
+        return change
+
+    @property
+    def alpha(self):
+        """
+        How far we are between the last physics frame and the next, from 0 to 1.
+        """
+        return self.accumulator / self.frame_ms
+
+    def drawn_position(self, body):
+        """
+        Where to draw a body, between the last two physics frames by alpha.
+
+        :param body: a pymunk.Body in the space.
+        :return: (x, y)
+        """
+        position = body.position
+        last = self.last_positions.get(body, position)
+        alpha = self.alpha
+        return (
+            last[0] + (position[0] - last[0]) * alpha,
+            last[1] + (position[1] - last[1]) * alpha,
+        )
+
+    def advance(self, time_delta):
+        """
+        Step the space by a frame time.
+
+        :param time_delta: The time delta in ms.
+        :return: The number of physics frames run.
+        """
+        self.accumulator += time_delta
+        frames = int(self.accumulator // self.frame_ms)
+        if frames > self.max_frames:
+            # drop the time we can not catch up on.
+            self.dropped_ms += (frames - self.max_frames) * self.frame_ms
+            frames = self.max_frames
+            self.accumulator %= self.frame_ms
+        else:
+            self.accumulator -= frames * self.frame_ms
+
+        steps = 0
+        start = time.perf_counter()
+        for frame in range(frames):
+            if frame == frames - 1:
+                self.last_positions = {
+                    body: body.position for body in self.space.bodies
+                }
+            # speeds now, so a jump since the last frame is stepped finely.
+            self.speed = self._fastest()
+            self.substeps = self.pick_substeps(self.speed, self.force)
+            step_seconds = self.frame_ms / 1000.0 / self.substeps
+            for _ in range(self.substeps):
+                self.space.step(step_seconds)
+            steps += self.substeps
+            self.force = self._stress(step_seconds)
+
+        self.solver_ms = (time.perf_counter() - start) * 1000
+        self.frames = frames
+        self.steps = steps
+        self.total_frames += frames
+        self.total_steps += steps
+        return frames
+
+    def describe(self):
+        """
+        The last advance, for the profiler overlay.
+        """
+        return "%s frames, %s substeps, %.1f ms" % (
+            self.frames,
+            self.steps,
+            self.solver_ms,
+        )
+
+    def stats(self):
+        """
+        Counters about the last advance and all of them.
+
+        :return: dict of frames, steps, solver_ms, speed, force, substeps,
+                 total_frames, total_steps and dropped_ms.
+        """
+        return {
+            "frames": self.frames,
+            "steps": self.steps,
+            "solver_ms": self.solver_ms,
+            "speed": self.speed,
+            "force": self.force,
+            "substeps": self.substeps,
+            "total_frames": self.total_frames,
+            "total_steps": self.total_steps,
+            "dropped_ms": self.dropped_ms,
+        }
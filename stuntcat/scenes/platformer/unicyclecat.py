@@ -184,6 +184,8 @@ def build_feet(
         resources.gfx("wheel.png", convert_alpha=True), feet_shape
     )
     feet_sprite.layer = 0
+    # the wheel rolls all the way around.
+    feet_sprite.prewarm()
 
     pymunk_objects.append(feet_body)
     pymunk_objects.append(feet_shape)
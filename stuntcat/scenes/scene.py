@@ -1,6 +1,7 @@
 """
 Scene module.
 """
+from stuntcat import resources
 
 
 class Scene:
@@ -32,3 +33,9 @@ class Scene:
 
         :param event: The event to process.
         """
+
+    def close(self):
+        """
+        Called when the scene is removed, to release its assets.
+        """
+        resources.CACHE.release(self)
@@ -1,12 +1,15 @@
 """A cat riding a unicycle.
 """
 
+import itertools
 import math
 
 import pygame
 from pygame.sprite import DirtySprite
 
 from stuntcat.resources import gfx, sfx
+from stuntcat.rotation_cache import RotationCache
+from stuntcat.scenes.unisharklazer.simulation import lerp
 
 
 class AnimatedCat(DirtySprite):
@@ -55,10 +58,22 @@ class AnimatedCat(DirtySprite):
                 self.frame_direction = not self.frame_direction
 
 
+# Degrees between the cached cat rotations.
+ROTATION_RESOLUTION = 1.0
+# The cat starts upright, facing right. These are rotated in its first
+# frames, about 8MB, and the other angles and the flipped images when
+# first needed.
+ROTATION_PREWARM_ANGLE = 10
+# Rotations prewarmed each frame, so the scene starts without waiting.
+ROTATION_PREWARM_PER_FRAME = 4
+# Most pixel memory for the rotated cats, twice what is prewarmed.
+ROTATION_MAX_BYTES = 16 * 1024 * 1024
+
+
 class Cat(AnimatedCat):
     """Cat sprite class."""
 
-    def __init__(self, cat_holder):
+    def __init__(self, cat_holder, rotation_resolution=ROTATION_RESOLUTION):
         AnimatedCat.__init__(self)
         self.cat_holder = cat_holder
         self.image = gfx("cat_unicycle1.png", convert_alpha=True)
@@ -73,6 +88,15 @@ class Cat(AnimatedCat):
             self.images.append(img)
             self.flipped_images.append(pygame.transform.flip(img, 1, 0))
 
+        self.rotations = RotationCache(
+            resolution=rotation_resolution, max_bytes=ROTATION_MAX_BYTES
+        )
+        self._prewarm = self.rotations.prewarm_steps(
+            self.images,
+            -ROTATION_PREWARM_ANGLE,
+            ROTATION_PREWARM_ANGLE,
+        )
+
     def get_image(self):
         """Return the image for the animated frame"""
         return (self.images, self.flipped_images)[
@@ -80,18 +104,24 @@ class Cat(AnimatedCat):
         ][self.frame - 1]
 
     def update(self, *args, **kwargs):
-        direction = self.cat_holder.player_data.cat_speed[0] > 0
-        location = self.cat_holder.player_data.cat_head_location
-        rotation = self.cat_holder.player_data.cat_angle
+        for _ in itertools.islice(self._prewarm, ROTATION_PREWARM_PER_FRAME):
+            pass
+        player_data = self.cat_holder.player_data
+        alpha = kwargs.get("alpha", 1.0)
+        direction = player_data.cat_speed[0] > 0
+        location = lerp(
+            player_data.last_cat_head_location, player_data.cat_head_location, alpha
+        )
+        rotation = player_data.last_cat_angle + alpha * (
+            player_data.cat_angle - player_data.last_cat_angle
+        )
 
         if self.last_direction != direction:
             self.dirty = True
             self.image = self.get_image()
 
         if self.changed(location[:], direction, rotation, self.frame):
-            self.image = pygame.transform.rotate(
-                self.get_image(), -self.cat_holder.player_data.cat_angle * 180 / math.pi
-            )
+            self.image = self.rotations.get(self.get_image(), -rotation * 180 / math.pi)
             size = self.image.get_rect().size
             self.dirty = True
             self.rect.x = int(location[0]) - size[0] * 0.5
@@ -5,9 +5,7 @@ import pygame
 import pygame.draw
 
 from pygame.surface import Surface
-from pygame.sprite import DirtySprite, collide_rect
-
-from stuntcat.resources import sfx
+from pygame.sprite import DirtySprite
 
 
 class ElephantAnimation:
@@ -80,6 +78,8 @@ class ElephantAnimation:
 class Elephant(DirtySprite):
     """
     Elephant sprite class.
+
+    Draws the state of an ElephantAnimation, which the simulation updates.
     """
 
     def __init__(self, scene):
@@ -87,10 +87,7 @@ class Elephant(DirtySprite):
 
         self.scene = scene
 
-        self.animation = ElephantAnimation()
-
-        # stamp.
-        sfx("foot_elephant.ogg")
+        self.animation = scene.sim.elephant
 
         self.rect = pygame.Rect([0, 0, self.scene.width // 2, self.scene.height])
         self.image = Surface((self.rect[2], self.rect[3])).convert()
@@ -99,52 +96,28 @@ class Elephant(DirtySprite):
         self.rect.x = -1000
         self.rect.y = -1000
 
-    def animate(self, total_time):
-        """
-        Animate the elephant
-        """
-        self.animation.update(total_time)
-
     def update(self, *args, **kwargs):
         """
         Update the elephant.
         """
-        # if self.animation.just_happened is not None:
-        #     print(self.animation.just_happened)
         from_top = 100
+        wire_height = kwargs["player_data"].cat_wire_height
 
-        if self.animation.just_happened == "offscreen":
-            self.dirty = True
-            self.rect.x = -1000
-            self.rect.y = -1000
-            sfx("foot_elephant.ogg", stop=1)
-        elif self.animation.just_happened == "poise left":
-            self.rect.x = 0
-            self.rect.y = from_top - self.scene.height
-            self.dirty = True
-            sfx("foot_elephant.ogg", play=1)
-        elif self.animation.just_happened == "stomp left":
-            # (self.height - self.image.get_height()) - self.scene.cat_wire_height
-            self.rect.y = self.scene.cat_wire_height - self.scene.height
-            self.rect.x = 0
-            self.dirty = True
-
-            if collide_rect(self, self.scene.cat):
-                self.scene.reset_on_death()
-                self.dirty = True
+        state = self.animation.states[self.animation.current_state]
+        if state == "poise left":
+            topleft = (0, from_top - self.scene.height)
+        elif state == "stomp left":
+            topleft = (0, wire_height - self.scene.height)
+        elif state == "poise right":
+            topleft = (self.scene.width // 2, from_top - self.scene.height)
+        elif state == "stomp right":
+            topleft = (self.scene.width // 2, wire_height - self.scene.height)
+        else:
+            topleft = (-1000, -1000)
 
-        elif self.animation.just_happened == "poise right":
-            self.rect.x = self.scene.width // 2
-            self.rect.y = from_top - self.scene.height
-            self.dirty = True
-            sfx("foot_elephant.ogg", play=1)
-        elif self.animation.just_happened == "stomp right":
-            self.rect.x = self.scene.width // 2
-            self.rect.y = self.scene.cat_wire_height - self.scene.height
+        if topleft != self.rect.topleft:
+            self.rect.topleft = topleft
             self.dirty = True
-            if collide_rect(self, self.scene.cat):
-                self.scene.reset_on_death()
-                self.dirty = True
 
     def render(self, screen, width, height):
         """
@@ -198,19 +171,3 @@ class Elephant(DirtySprite):
                     [0.5 * width, height - 100],
                 ],
             )
-
-    def collide(self, width):
-        """
-        Collide with the elephant.
-
-        :param width:
-        """
-        state = self.animation.states[self.animation.current_state]
-        if state == "stomp left":
-            if self.scene.cat_head_location[0] < width / 2:
-                self.scene.reset_on_death()
-                self.dirty = True
-        elif state == "stomp right":
-            if self.scene.cat_head_location[0] > width / 2:
-                self.scene.reset_on_death()
-                self.dirty = True
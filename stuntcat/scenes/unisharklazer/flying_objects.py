@@ -1,46 +1,56 @@
 """
 Fish module
 """
-import math
 import random
 
-from pygame.sprite import DirtySprite
-from pygame.math import Vector2
+from stuntcat.resources import gfx
+from stuntcat.scenes.unisharklazer.simulation import FLYING_OBJECT_OFFSET, lerp
+from stuntcat.scenes.unisharklazer.sprite_pool import PooledSprite
 
-from stuntcat.resources import gfx, sfx, distance
 
-
-class FlyingObject(DirtySprite):
+class FlyingObject(PooledSprite):
     """
     Flying Object class for things that are tossed to the cat.
+
+    A view onto one projectile in the ProjectilePool, which does the moving.
+    Made once and then reused from a SpritePool, see attach.
     """
 
-    def __init__(self, group, pos, vel, image):
-        DirtySprite.__init__(self, group)
+    def __init__(self, image):
+        PooledSprite.__init__(self)
         self.image = image
         self.rect = self.image.get_rect()
-        self.rect.topleft = pos
-        self.velocity = Vector2(vel)
-
-        self.last_pos = [self.rect.x, self.rect.y]
-        self.pos = [self.rect.x, self.rect.y]
+        self.projectiles = None
+        self.index = None
+        self.serial = None
+
+    def attach(self, projectiles, index):
+        """
+        Show a projectile with this sprite.
+
+        :param projectiles: the ProjectilePool.
+        :param index: the index of the projectile.
+        """
+        self.projectiles = projectiles
+        self.index = index
+        self.serial = projectiles.serial[index]
+        self.rect.topleft = projectiles.pos[index]
+        self.dirty = 1
 
     def update(self, *args, **kwargs):
-        if self.last_pos != self.pos[:2]:
-            self.dirty = True
-            self.rect.x = self.pos[0] - 25
-            self.rect.y = self.pos[1] - 25
-        self.last_pos = self.pos[:2]
-
-        dt_scaled = kwargs["time_delta"]
-        height = kwargs["height"]
-
-        self.pos[0] += self.velocity[0] * dt_scaled  # speed of the throw
-        self.velocity[1] += 0.2 * dt_scaled  # gravity
-        self.pos[1] += self.velocity[1] * dt_scaled  # y velocity
-        # check out of bounds
-        if self.pos[1] > height:
+        projectiles, index = self.projectiles, self.index
+        if not projectiles.is_alive(index, self.serial):
             self.kill()
+            return
+
+        pos = lerp(projectiles.last_pos[index], projectiles.pos[index], kwargs["alpha"])
+        topleft = (
+            int(pos[0]) - FLYING_OBJECT_OFFSET,
+            int(pos[1]) - FLYING_OBJECT_OFFSET,
+        )
+        if topleft != self.rect.topleft:
+            self.dirty = True
+            self.rect.topleft = topleft
 
 
 class Fish(FlyingObject):
@@ -50,22 +60,15 @@ class Fish(FlyingObject):
 
     colors = ["red", "yellow", "green"]
 
-    def __init__(self, group, pos, vel):
-        image = gfx("fish_" + random.choice(Fish.colors) + ".png", convert_alpha=True)
-        FlyingObject.__init__(self, group, pos, vel, image)
+    def __init__(self):
+        self.images = [
+            gfx("fish_" + color + ".png", convert_alpha=True) for color in Fish.colors
+        ]
+        FlyingObject.__init__(self, self.images[0])
 
-    def update(self, *args, **kwargs):
-        FlyingObject.update(self, *args, **kwargs)
-
-        if (
-            distance(
-                [self.rect[0], self.rect[1]], kwargs["player_data"].cat_head_location
-            )
-            < 100
-        ):
-            kwargs["player_data"].increment_score()
-            self.kill()
-            sfx("eatfish.ogg", play=1)
+    def attach(self, projectiles, index):
+        self.image = random.choice(self.images)
+        FlyingObject.attach(self, projectiles, index)
 
 
 class NotFish(FlyingObject):
@@ -73,26 +76,6 @@ class NotFish(FlyingObject):
     Not-fish sprite class.
     """
 
-    def __init__(self, group, pos, vel):
+    def __init__(self):
         image = gfx("ring.png", convert_alpha=True)
-        FlyingObject.__init__(self, group, pos, vel, image)
-
-    def update(self, *args, **kwargs):
-        FlyingObject.update(self, *args, **kwargs)
-
-        if (
-            distance(
-                [self.rect[0], self.rect[1]], kwargs["player_data"].cat_head_location
-            )
-            < 50
-        ):
-            self.kill()
-            kwargs["player_data"].angle_to_not_fish = (
-                math.atan2(
-                    kwargs["player_data"].cat_head_location[1] - self.rect[1],
-                    kwargs["player_data"].cat_head_location[0] - self.rect[0],
-                )
-                - math.pi / 2
-            )
-            side = 1 if kwargs["player_data"].angle_to_not_fish < 0 else -1
-            kwargs["player_data"].cat_angular_vel += side * random.uniform(0.08, 0.15)
+        FlyingObject.__init__(self, image)
@@ -0,0 +1,156 @@
+"""
+Projectiles module.
+
+Everything thrown at the cat lives in one pool of numpy arrays, one
+array per field rather than one object per projectile. So moving them,
+culling them and testing them against the cat is done for all of them
+at once, however many the crowd throws.
+
+::Example::
+
+    >>> pool = ProjectilePool()
+    >>> index = pool.throw(FISH, (0, 270), (5, -10))
+    >>> pool.integrate(1.0, 0.2)
+    >>> pool.hits((100, 200), (100, 50), 25)
+
+"""
+import numpy
+
+FISH = 0
+NOT_FISH = 1
+
+
+class ProjectilePool:
+    """
+    Positions, velocities, kinds and alive flags of the thrown things.
+
+    A projectile is an index into the arrays. Indexes are reused, so
+    each throw also gets a serial number, to tell a new projectile
+    apart from an old one in the same slot.
+    """
+
+    def __init__(self, capacity=32):
+        self.pos = numpy.zeros((capacity, 2))
+        self.last_pos = numpy.zeros((capacity, 2))
+        self.velocity = numpy.zeros((capacity, 2))
+        self.kind = numpy.zeros(capacity, dtype=numpy.int8)
+        self.alive = numpy.zeros(capacity, dtype=bool)
+        self.serial = numpy.zeros(capacity, dtype=numpy.int64)
+        self._next_serial = 1
+
+    def __len__(self):
+        return int(numpy.count_nonzero(self.alive))
+
+    @property
+    def capacity(self):
+        """
+        How many projectiles fit before the arrays grow.
+        """
+        return len(self.alive)
+
+    def count(self, kind):
+        """
+        How many of one kind are alive.
+
+        :param kind: FISH or NOT_FISH.
+        """
+        return int(numpy.count_nonzero(self.alive & (self.kind == kind)))
+
+    def _grow(self):
+        """Double the size of the arrays."""
+        capacity = self.capacity
+        for name in ("pos", "last_pos", "velocity", "kind", "alive", "serial"):
+            old = getattr(self, name)
+            new = numpy.zeros((capacity * 2,) + old.shape[1:], dtype=old.dtype)
+            new[:capacity] = old
+            setattr(self, name, new)
+
+    def throw(self, kind, pos, velocity):
+        """
+        Add a projectile.
+
+        :param kind: FISH or NOT_FISH.
+        :param pos: where it starts.
+        :param velocity: how fast it is thrown.
+        :return: the index of the projectile.
+        """
+        free = numpy.flatnonzero(~self.alive)
+        if not free.size:
+            self._grow()
+            free = numpy.flatnonzero(~self.alive)
+        index = int(free[0])
+
+        self.pos[index] = int(pos[0]), int(pos[1])
+        self.last_pos[index] = self.pos[index]
+        self.velocity[index] = velocity
+        self.kind[index] = kind
+        self.alive[index] = True
+        self.serial[index] = self._next_serial
+        self._next_serial += 1
+        return index
+
+    def kill(self, index):
+        """
+        Remove a projectile.
+
+        :param index: the index of the projectile.
+        """
+        self.alive[index] = False
+
+    def is_alive(self, index, serial):
+        """
+        Is this throw still flying?
+
+        :param index: the index of the projectile.
+        :param serial: the serial number it was thrown with.
+        """
+        return bool(self.alive[index]) and self.serial[index] == serial
+
+    def remember(self):
+        """
+        Store the positions before a step.
+        """
+        numpy.copyto(self.last_pos, self.pos)
+
+    def integrate(self, time_delta, gravity):
+        """
+        Move all of the projectiles.
+
+        Dead slots are moved too, as that is cheaper than picking out
+        the live ones. They are reset when they are thrown again.
+
+        :param time_delta: scaled time delta.
+        :param gravity: added to the y velocity per time unit.
+        """
+        self.pos[:, 0] += self.velocity[:, 0] * time_delta  # speed of the throw
+        self.velocity[:, 1] += gravity * time_delta  # gravity
+        self.pos[:, 1] += self.velocity[:, 1] * time_delta  # y velocity
+
+    def cull_below(self, height):
+        """
+        Kill the projectiles that have fallen out of the bottom.
+
+        :param height: y position of the bottom.
+        :return: indexes of the killed projectiles.
+        """
+        out = self.alive & (self.pos[:, 1] > height)
+        self.alive[out] = False
+        return numpy.flatnonzero(out)
+
+    def hits(self, point, radii, offset=0, candidates=None):
+        """
+        Find the live projectiles near a point.
+
+        :param point: Position as a two item tuple-like.
+        :param radii: hit radius for each kind, indexed by kind.
+        :param offset: subtracted from positions before testing.
+        :param candidates: sorted indexes to test, like from a SpatialGrid.
+                           All of them if None.
+        :return: indexes of the projectiles within their radius.
+        """
+        if candidates is None:
+            candidates = numpy.arange(self.capacity)
+        delta = self.pos[candidates] - offset - numpy.asarray(point, dtype=float)
+        distance_squared = numpy.einsum("ij,ij->i", delta, delta)
+        limits = numpy.asarray(radii, dtype=float)[self.kind[candidates]] ** 2
+        return candidates[self.alive[candidates] & (distance_squared < limits)]
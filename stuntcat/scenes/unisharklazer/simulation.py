@@ -0,0 +1,640 @@
+"""
+Simulation of the cat unicycle game rules.
+
+Nothing in here needs a display, a mixer or any sprites. Sounds the game
+should play are collected as cues, which the scene plays. So it can be
+run headless, many game seconds per wall second.
+
+::Example::
+
+    >>> sim = CatUniSimulation(960, 540, seed=1)
+    >>> sim.run(60 * 1000)
+
+"""
+import math
+import random
+
+from stuntcat.scenes.unisharklazer.elephant import ElephantAnimation
+from stuntcat.scenes.unisharklazer.projectiles import FISH, NOT_FISH, ProjectilePool
+from stuntcat.scenes.unisharklazer.shark import SharkAnimation
+from stuntcat.scenes.unisharklazer.spatial_grid import INF, SpatialGrid
+
+# The physics constants were tuned for a frame time of 17ms.
+STEP_MS = 17
+STEP_SCALE = STEP_MS / 17.0
+MAX_STEPS = 8  # most steps per frame, so slow frames don't spiral.
+
+CAT_MAX_JUMPING_TIME = 600  # ms
+CAT_JUMP_SPEED = 0.07
+
+# Thrown things used to be moved by both the scene and their sprite,
+# so they have always flown at twice the speed.
+FLYING_OBJECT_SPEED = 2.0
+FLYING_OBJECT_GRAVITY = 0.2
+FLYING_OBJECT_OFFSET = 25  # from the thrown position to the sprite corner.
+FISH_RADIUS = 100
+NOT_FISH_RADIUS = 50
+
+
+def lerp(pos_a, pos_b, alpha):
+    """
+    Linear interpolation between two positions.
+
+    :param pos_a: Position as a two item tuple-like.
+    :param pos_b: Position as a two item tuple-like.
+    :param alpha: 0 gives pos_a, 1 gives pos_b.
+    """
+    return [
+        pos_a[0] + (pos_b[0] - pos_a[0]) * alpha,
+        pos_a[1] + (pos_b[1] - pos_a[1]) * alpha,
+    ]
+
+
+class PlayerData:  # pylint:disable=too-many-instance-attributes
+    """
+    Data about the player that gets passed around a lot at the minute.
+    """
+
+    def __init__(self, width, height):
+        self._score = 0
+
+        self.angle_to_not_fish = 0.0
+
+        self.cat_wire_height = height - 100
+
+        self.cat_start_pos = [width / 2, height - 100]
+        self.cat_location = self.cat_start_pos[:]
+
+        self.cat_speed = [0, 0]
+        self.cat_speed_max = 8
+        self.cat_fall_speed_max = 16
+        self.cat_roll_speed = 0.01
+        self.cat_angle = 0
+        self.cat_angular_vel = 0
+        self.cat_head_location = None
+        self.place_head()
+
+        # where the cat was one step ago, for drawing in between steps.
+        self.last_cat_head_location = self.cat_head_location[:]
+        self.last_cat_angle = self.cat_angle
+
+    def increment_score(self):
+        """
+        Increase the score.
+        """
+        self._score += 1
+
+    def place_head(self):
+        """
+        Put the head above the cat, from its location and angle.
+        """
+        self.cat_head_location = [
+            int(self.cat_location[0] + 100 * math.cos(self.cat_angle - math.pi / 2)),
+            int(self.cat_location[1] + 100 * math.sin(self.cat_angle - math.pi / 2)),
+        ]
+
+    def remember(self):
+        """
+        Store the cat position before a step.
+        """
+        self.last_cat_head_location = self.cat_head_location[:]
+        self.last_cat_angle = self.cat_angle
+
+    def reset(self):
+        """
+        Reset the player data.
+        """
+        self.cat_location = self.cat_start_pos[:]
+        self.cat_speed = [0, 0]
+        self.cat_angle = 0
+        self.cat_angular_vel = 0
+        self._score = 0
+        self.place_head()
+
+    @property
+    def score(self):
+        """
+        Get the player's score.
+        """
+        return self._score
+
+
+class FixedTimestep:
+    """
+    Turns variable frame times into a whole number of fixed steps.
+
+    The time left over is kept for the next frame, and as alpha can be
+    used to draw in between the last two steps.
+    """
+
+    def __init__(self, step=STEP_MS, max_steps=MAX_STEPS):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, time_delta):
+        """
+        Add a frame time.
+
+        :param time_delta: The time delta in ms.
+        :return: The number of steps to run.
+        """
+        self.accumulator += time_delta
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps:
+            # drop the time we can not catch up on.
+            steps = self.max_steps
+            self.accumulator %= self.step
+        else:
+            self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self):
+        """
+        How far we are towards the next step, from 0 to 1.
+        """
+        return self.accumulator / self.step
+
+
+class CatUniSimulation:  # pylint:disable=too-many-instance-attributes
+    """
+    The cat unicycle rules, run with a fixed timestep.
+    """
+
+    meow_names = ["cat_meow01.ogg", "cat_meow02.ogg", "cat_meow03.ogg"]
+    boing_names = ["boing1.ogg", "boing2.ogg", "boing3.ogg"]
+
+    def __init__(self, width, height, seed=None):
+        self.width, self.height = width, height
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.timestep = FixedTimestep()
+
+        # (kind, name, kwargs) of sounds, for the scene to play.
+        self.cues = []
+        # (index, serial) of projectiles thrown since the scene last looked.
+        self.thrown = []
+
+        self.player_data = PlayerData(width, height)
+        self.total_time = 0  # ms
+        self.steps = 0
+
+        self.left_pressed = False
+        self.right_pressed = False
+
+        self.last_meow = None
+        self.next_meow = 0
+        self._reset_meow()
+
+        self.touching_ground = True
+        self.jumping = False
+        self.jumping_time = 0
+
+        self.people_mad = False
+        self.people_mad_duration = 3000  # ms
+        self.people_mad_current_time = 0
+        self.next_notfish = 0
+        self.notfish_time = 0
+
+        self.shark = SharkAnimation()
+        self.elephant = ElephantAnimation()
+        self.shark_active = False  # is the shark enabled yet
+        self.elephant_active = False
+
+        # where the elephant stomps, and the shark lazer hits.
+        self.zones = SpatialGrid(width, height)
+        self.zones.add_zone("stomp left", (-INF, -INF, width / 2, INF))
+        self.zones.add_zone("stomp right", (width / 2, -INF, INF, INF))
+        lazer_top = self.player_data.cat_wire_height - 3
+        self.zones.add_zone("lazer", (-INF, lazer_top, INF, INF))
+
+        # things to catch
+        self.projectiles = ProjectilePool()
+        self._throw(FISH, (0, height / 2), (10, -5))
+
+        # difficulty varibles
+        self.number_of_not_fish = 0
+
+    @property
+    def alpha(self):
+        """
+        How far we are between the last step and the next, from 0 to 1.
+        """
+        return self.timestep.alpha
+
+    def update(self, time_delta):
+        """
+        Run as many fixed steps as fit in the time delta.
+
+        :param time_delta: The time delta in ms.
+        :return: The number of steps run.
+        """
+        steps = self.timestep.advance(time_delta)
+        for _ in range(steps):
+            self.step()
+        return steps
+
+    def run(self, milliseconds):
+        """
+        Run the simulation for some game time, as fast as possible.
+
+        :param milliseconds: how much game time to run.
+        """
+        for _ in range(int(milliseconds // STEP_MS)):
+            self.step()
+            del self.cues[:]
+            del self.thrown[:]
+
+    def pop_cues(self):
+        """
+        Return the sound cues since last time, and forget them.
+        """
+        cues, self.cues = self.cues, []
+        return cues
+
+    def pop_thrown(self):
+        """
+        Return the projectiles thrown since last time, and forget them.
+        """
+        thrown, self.thrown = self.thrown, []
+        return thrown
+
+    def _sfx(self, snd, **kwargs):
+        self.cues.append(("sfx", snd, kwargs))
+
+    def step(self):
+        """
+        Advance the game by one fixed step.
+        """
+        self.steps += 1
+        self.player_data.remember()
+        self.projectiles.remember()
+
+        self.increase_difficulty()
+
+        self.total_time += (
+            STEP_MS  # keep track of the total number of ms passed during the game
+        )
+        dt_scaled = STEP_SCALE
+
+        ##cat physics
+        self.player_data.cat_angular_vel *= (
+            0.9 ** dt_scaled
+        )  # max(0.9/(max(0.1,dt_scaled)),0.999)
+
+        # make the cat slide in the direction it's rotated
+        self.player_data.cat_speed[0] += math.sin(self.player_data.cat_angle) * (
+            dt_scaled * self.player_data.cat_roll_speed
+        )
+
+        # add gravity
+        self.player_data.cat_speed[1] = min(
+            self.player_data.cat_speed[1] + (1 * dt_scaled),
+            self.player_data.cat_fall_speed_max,
+        )
+
+        self._move_cat()
+        self._cat_out_of_bounds()
+
+        # check for collision with the elephant stomp
+        if self.elephant_active:
+            self._elephant()
+        if self.shark_active or self.shark.get_state() == "leaving":
+            self._shark()
+
+        self._cat_jumping(STEP_MS)
+        self._cats_meow(STEP_MS)
+        self._angry_people(STEP_MS)
+        self._collide_flying_objects()
+        self._spawn_flying_objects()
+
+    def increase_difficulty(self):
+        """ Periodically increase the difficulty."""
+        self.number_of_not_fish = 0
+        if self.player_data.score > 3:
+            self.number_of_not_fish = 1
+        if self.player_data.score > 9:
+            self.number_of_not_fish = 1
+        if self.player_data.score > 15:
+            self.number_of_not_fish = 2
+        if self.player_data.score > 19:
+            self.number_of_not_fish = 1
+        if self.player_data.score > 25:
+            self.number_of_not_fish = 2
+        if self.player_data.score > 35:
+            self.number_of_not_fish = 3
+        if self.player_data.score >= 50:
+            self.number_of_not_fish = int((self.player_data.score - 20) / 10)
+
+        if self.player_data.score >= 10:
+            self.shark_active = True
+
+        # Elephant doesn't work yet, so let's not use it
+
+    #        if self.player_data.score >= 20:
+    #            self.elephant_active = True
+
+    def annoy_crowd(self):
+        """ Annoy the crowd."""
+        self.people_mad = True
+        self.people_mad_current_time = 0
+
+    def reset_on_death(self):
+        """Reset on death.
+
+        What to do when you die, reset the level.
+        """
+        self.player_data.reset()
+        # draw from the start, not across the jump back to it.
+        self.player_data.remember()
+        self.projectiles.remember()
+        self.total_time = 0
+
+        self.elephant.last_animation = 0
+        self.elephant.current_state = 0
+        self.elephant.just_happened = None
+        self.elephant_active = False
+        self.elephant.update(self.total_time)
+
+        # make the shark leave
+        self.shark_active = False
+        self.shark.last_animation = 0
+
+        if self.shark.get_state() in ("aiming", "fire laser"):
+            self.shark.just_happened = None
+            self.shark.set_state("leaving")
+            self.shark.applaud = False
+        else:
+            self.shark.just_happened = None
+            self.shark.set_state("offscreen")
+            self.shark.update(self.total_time)
+
+        self._sfx("shark_appear.ogg", fadeout=1000)
+
+    def _reset_meow(self):
+        self.next_meow = self.random.uniform(5000, 10000)
+
+    def _meow(self):
+        # Play a meow sound, but not the same one twice in a row
+        meow_names = self.meow_names[:]
+        if self.last_meow in self.meow_names:
+            meow_names.remove(self.last_meow)
+        self.last_meow = self.random.choice(meow_names)
+        self._sfx(self.last_meow, play=1)
+        self._reset_meow()
+
+    def _elephant(self):
+        """Stomp the cat."""
+        self.elephant.update(self.total_time)
+
+        if self.elephant.just_happened == "offscreen":
+            self._sfx("foot_elephant.ogg", stop=1)
+        elif self.elephant.just_happened in ("poise left", "poise right"):
+            self._sfx("foot_elephant.ogg", play=1)
+
+        state = self.elephant.states[self.elephant.current_state]
+        if state in ("stomp left", "stomp right") and self.zones.in_zone(
+            state, self.player_data.cat_head_location
+        ):
+            self.reset_on_death()
+
+    def _shark(self):
+        """What the shark does when it changes state."""
+        self.shark.update(self.total_time)
+        just_happened = self.shark.just_happened
+
+        if just_happened == "offscreen":
+            self._sfx("shark_gone.ogg", stop=1)
+
+        elif just_happened == "about_to_appear":
+            self.cues.append(("music", None, {"stop": True}))
+            self.shark.applaud = True
+            self._sfx("shark_appear.ogg", play=1)
+
+        elif just_happened == "poise":
+            self._sfx("shark_attacks.ogg", play=1)
+
+        elif just_happened == "fire laser":
+            self._fire_laserbeam()
+
+        elif just_happened == "leaving":
+            self._sfx("shark_appear.ogg", fadeout=3500)
+            self._sfx("shark_attacks.ogg", stop=1)
+            self._sfx("shark_gone.ogg", play=1)
+            if self.shark.lazered:
+                self._sfx("boo.ogg", play=True)
+                self.reset_on_death()
+                self.shark.lazered = False
+                self.annoy_crowd()
+            elif self.shark.applaud:
+                self._sfx("applause.ogg", play=1)
+
+    def _fire_laserbeam(self):
+        """Fires the shark's head mounted laser cannon."""
+        self._sfx("shark_lazer.ogg", play=1)
+
+        if self.zones.in_zone("lazer", self.player_data.cat_location):
+            self._sfx("cat_shot.ogg", play=1)
+
+            self.shark.lazered = True
+        else:
+            self.shark.lazered = False
+
+    def _move_cat(self):
+        """Move, accelerate, and tilt the cat."""
+        dt_scaled = STEP_SCALE
+
+        # accelerate the cat left or right
+        if self.right_pressed:
+            self.player_data.cat_speed[0] = min(
+                self.player_data.cat_speed[0] + 0.3 * dt_scaled,
+                self.player_data.cat_speed_max,
+            )
+            self.player_data.cat_angle -= 0.003 * dt_scaled
+
+        if self.left_pressed:
+            self.player_data.cat_speed[0] = max(
+                self.player_data.cat_speed[0] - 0.3 * dt_scaled,
+                -self.player_data.cat_speed_max,
+            )
+            self.player_data.cat_angle += 0.003 * dt_scaled
+
+        # make the cat fall
+        angle_sign = 1 if self.player_data.cat_angle > 0 else -1
+        self.player_data.cat_angular_vel += 0.0002 * angle_sign * dt_scaled
+        self.player_data.cat_angle += self.player_data.cat_angular_vel * dt_scaled
+        if (
+            self.player_data.cat_angle > math.pi / 2
+            or self.player_data.cat_angle < -math.pi / 2
+        ) and self.player_data.cat_location[1] > self.height - 160:
+            self._sfx("cat_crash.ogg", play=1)
+            self.reset_on_death()
+
+        # move cat
+        self.player_data.cat_location[0] += self.player_data.cat_speed[0] * dt_scaled
+        self.player_data.cat_location[1] += self.player_data.cat_speed[1] * dt_scaled
+        if (
+            self.player_data.cat_location[1] > self.player_data.cat_wire_height
+            and self.player_data.cat_location[0] > 0.25 * self.width
+        ):
+            self.touching_ground = True
+            self.player_data.cat_location[1] = self.player_data.cat_wire_height
+            self.player_data.cat_speed[1] = 0
+        else:
+            self.touching_ground = False
+
+    def _cat_out_of_bounds(self):
+        """check for out of bounds"""
+
+        # in the pool
+        if self.player_data.cat_location[1] > self.height:
+            self._sfx("splash.ogg", play=1)
+            self._meow()
+            self.reset_on_death()
+
+        # to the right of screen.
+        if self.player_data.cat_location[0] > self.width:
+            self.player_data.cat_location[0] = self.width
+            if self.player_data.cat_angle > 0:
+                self.player_data.cat_angle *= 0.7
+
+        self.player_data.place_head()
+
+        if (
+            self.player_data.cat_location[0] > 0.98 * self.width
+            and self.player_data.cat_location[1] > self.player_data.cat_wire_height - 30
+        ):
+            # bump the cat back in
+            self._meow()
+            self._sfx(self.random.choice(self.boing_names), play=True)
+            self.player_data.cat_angular_vel -= 0.01 * STEP_SCALE
+            self.player_data.cat_speed[0] = -5
+            self.player_data.cat_speed[1] = -20
+
+    def _cat_jumping(self, time_delta):
+        """jumping physics"""
+        if self.jumping:
+            self.player_data.cat_speed[1] -= (
+                time_delta
+                * ((CAT_MAX_JUMPING_TIME - self.jumping_time) / CAT_MAX_JUMPING_TIME)
+                * CAT_JUMP_SPEED
+            )
+            self.jumping_time += time_delta
+            if self.jumping_time >= CAT_MAX_JUMPING_TIME:
+                self.jumping = False
+
+    def _cats_meow(self, time_delta):
+        """meow timing"""
+        if self.next_meow <= 0:
+            self._meow()
+        self.next_meow -= time_delta
+
+    def _angry_people(self, time_delta):
+        """angry people (increased throwing of not-fish)"""
+
+        if self.people_mad:
+            self.people_mad_current_time += time_delta
+            self.notfish_time += time_delta
+            if self.notfish_time >= self.next_notfish:
+                self.next_notfish = self.random.randint(100, 400)
+                self.notfish_time = 0
+                self._spawn_not_fish()
+            if self.people_mad_current_time >= self.people_mad_duration:
+                self.people_mad = False
+
+    def _collide_flying_objects(self):
+        """object physics"""
+        projectiles = self.projectiles
+
+        # move fish and not fish, and check out of bounds
+        projectiles.integrate(STEP_SCALE * FLYING_OBJECT_SPEED, FLYING_OBJECT_GRAVITY)
+        projectiles.cull_below(self.height)
+
+        # check collision with the cat
+        head = self.player_data.cat_head_location
+        radii = (FISH_RADIUS, NOT_FISH_RADIUS)  # indexed by kind
+        for index in projectiles.hits(head, radii, FLYING_OBJECT_OFFSET):
+            projectiles.kill(index)
+            if projectiles.kind[index] == FISH:
+                self.player_data.increment_score()
+                self._sfx("eatfish.ogg", play=1)
+                continue
+
+            hit_point = projectiles.pos[index] - FLYING_OBJECT_OFFSET
+            self.player_data.angle_to_not_fish = (
+                math.atan2(head[1] - hit_point[1], head[0] - hit_point[0])
+                - math.pi / 2
+            )
+            side = 1 if self.player_data.angle_to_not_fish < 0 else -1
+            self.player_data.cat_angular_vel += side * self.random.uniform(0.08, 0.15)
+            self._sfx(self.random.choice(self.boing_names), play=True)
+
+    def _throw(self, kind, pos, velocity):
+        index = self.projectiles.throw(kind, pos, velocity)
+        self.thrown.append((index, self.projectiles.serial[index]))
+        return index
+
+    def _spawn_flying_objects(self):
+        """Throws random objects at the cat."""
+        width, height = self.width, self.height
+
+        # refresh lists
+        while self.projectiles.count(FISH) < 1 and not self.people_mad:
+            # choose a side of the screen
+            if self.random.choice([0, 1]) == 0:
+                self._throw(
+                    FISH,
+                    (0, height / 2),  # random.randint(0, height / 2),
+                    (self.random.randint(3, 7), -self.random.randint(5, 12)),
+                )
+            else:
+                self._throw(
+                    FISH,
+                    (width, height / 2),  # random.randint(0, height / 2),
+                    (-self.random.randint(3, 7), -self.random.randint(5, 12)),
+                )
+        while self.projectiles.count(NOT_FISH) < self.number_of_not_fish:
+            self._spawn_not_fish()
+
+    def _spawn_not_fish(self):
+        """Choose a side of the screen."""
+
+        velocity_multiplier = 1
+        x_pos = 0
+        if self.random.randint(0, 1):
+            velocity_multiplier *= -1
+            x_pos = self.width
+        self._throw(
+            NOT_FISH,
+            (x_pos, self.height / 2),
+            (
+                self.random.randint(3, 7) * velocity_multiplier,
+                -self.random.randint(5, 12),
+            ),
+        )
+
+    def start_jump(self):
+        """Start jumping, if on the ground."""
+        if self.touching_ground and not self.jumping:
+            self.jumping = True
+            self.jumping_time = 0
+            self.player_data.cat_speed[1] -= 12.5
+            self._sfx("cat_jump.ogg", play=1)
+
+    def stop_jump(self):
+        """Stop jumping."""
+        self.jumping = False
+        self._sfx("cat_jump.ogg", fadeout=50)
+
+    def tilt_left(self):
+        """Push the cat over to the left."""
+        self.player_data.cat_angular_vel -= self.random.uniform(
+            0.01 * math.pi, 0.03 * math.pi
+        )
+
+    def tilt_right(self):
+        """Push the cat over to the right."""
+        self.player_data.cat_angular_vel += self.random.uniform(
+            0.01 * math.pi, 0.03 * math.pi
+        )
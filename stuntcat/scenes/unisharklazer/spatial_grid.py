@@ -0,0 +1,193 @@
+"""
+Spatial grid module.
+
+The play area is split into square cells. Thrown things are sorted into
+the cells they are in each step, so finding what is near the cat only
+looks at the few cells around it, however many things are flying.
+
+Zones, like where the elephant stomps, are boxes put into the cells they
+cover once, and looked up by point.
+
+::Example::
+
+    >>> grid = SpatialGrid(960, 540, cell_size=128)
+    >>> grid.rebuild(projectiles.pos, projectiles.alive)
+    >>> candidates = grid.near((100, 200), 100)
+    >>> grid.add_zone("stomp left", (-INF, -INF, 480, INF))
+    >>> grid.zones_at((100, 200))
+    ['stomp left']
+
+Run this module to benchmark it against testing every thing.
+
+    python -m stuntcat.scenes.unisharklazer.spatial_grid
+
+With one query a step, ProjectilePool.hits testing every thing at once
+with numpy is faster than sorting them into the grid, even with 30000
+things. So the simulation only uses the grid for its zones. The grid
+pays off when many points are looked up after each rebuild.
+
+"""
+import time
+
+import numpy
+
+INF = float("inf")
+
+
+class SpatialGrid:
+    """
+    A uniform grid over the play area.
+
+    Points outside of the area go in the nearest edge cell, so nothing
+    is missed, it is just tested more.
+
+    :param width: width of the play area.
+    :param height: height of the play area.
+    :param cell_size: width and height of a cell.
+    """
+
+    def __init__(self, width, height, cell_size=128):
+        self.cell_size = cell_size
+        self.columns = max(1, int(numpy.ceil(width / float(cell_size))))
+        self.rows = max(1, int(numpy.ceil(height / float(cell_size))))
+        num_cells = self.columns * self.rows
+
+        # indexes of the points, sorted by cell, and where each cell starts.
+        self._order = numpy.zeros(0, dtype=numpy.intp)
+        self._starts = numpy.zeros(num_cells + 1, dtype=numpy.intp)
+        self._zones = {}
+        self._cell_zones = [[] for _ in range(num_cells)]
+
+    def _column(self, x_pos):
+        # clamped before dividing, as zones can go to INF.
+        x_pos = min(max(x_pos, 0), self.columns * self.cell_size - 1)
+        return int(x_pos // self.cell_size)
+
+    def _row(self, y_pos):
+        y_pos = min(max(y_pos, 0), self.rows * self.cell_size - 1)
+        return int(y_pos // self.cell_size)
+
+    def rebuild(self, points, alive):
+        """
+        Sort points into their cells. Call after they move.
+
+        :param points: array of x, y positions, one row per point.
+        :param alive: bool array, points that are False are left out.
+        """
+        num_cells = self.columns * self.rows
+        columns = numpy.clip(
+            (points[:, 0] // self.cell_size).astype(numpy.intp), 0, self.columns - 1
+        )
+        rows = numpy.clip(
+            (points[:, 1] // self.cell_size).astype(numpy.intp), 0, self.rows - 1
+        )
+        cells = rows * self.columns + columns
+        # dead points go in a cell past the end, which is never looked at.
+        cells[~alive] = num_cells
+
+        self._order = numpy.argsort(cells, kind="stable")
+        self._starts = numpy.searchsorted(
+            cells[self._order], numpy.arange(num_cells + 1)
+        )
+
+    def near(self, point, radius):
+        """
+        Indexes of the points in the cells within radius of a point.
+
+        Some may be further than radius, so test them after.
+
+        :param point: Position as a two item tuple-like.
+        :param radius: how far to look.
+        :return: sorted array of point indexes.
+        """
+        first_column = self._column(point[0] - radius)
+        last_column = self._column(point[0] + radius)
+        chunks = []
+        last_row = self._row(point[1] + radius)
+        for row in range(self._row(point[1] - radius), last_row + 1):
+            # cells in a row are next to each other in the order.
+            start = self._starts[row * self.columns + first_column]
+            end = self._starts[row * self.columns + last_column + 1]
+            if end > start:
+                chunks.append(self._order[start:end])
+        if not chunks:
+            return self._order[:0]
+        return numpy.sort(numpy.concatenate(chunks))
+
+    def add_zone(self, name, box):
+        """
+        Add a zone, to be found by zones_at.
+
+        :param name: the zone name.
+        :param box: (left, top, right, bottom), which can be INF.
+        """
+        self._zones[name] = box
+        left, top, right, bottom = box
+        for row in range(self._row(top), self._row(bottom) + 1):
+            for column in range(self._column(left), self._column(right) + 1):
+                self._cell_zones[row * self.columns + column].append(name)
+
+    def zones_at(self, point):
+        """
+        Names of the zones a point is inside of, edges not included.
+
+        :param point: Position as a two item tuple-like.
+        """
+        names = self._cell_zones[
+            self._row(point[1]) * self.columns + self._column(point[0])
+        ]
+        return [
+            name
+            for name in names
+            if self._zones[name][0] < point[0] < self._zones[name][2]
+            and self._zones[name][1] < point[1] < self._zones[name][3]
+        ]
+
+    def in_zone(self, name, point):
+        """
+        Is a point inside of a zone?
+
+        :param name: the zone name.
+        :param point: Position as a two item tuple-like.
+        """
+        return name in self.zones_at(point)
+
+
+def benchmark(counts=(10, 100, 300, 1000), repeat=200):
+    """
+    Time finding the thrown things near the cat, with and without the grid.
+
+    :param counts: how many things to throw.
+    :param repeat: steps to time for each count.
+    """
+    # pylint:disable=import-outside-toplevel
+    from stuntcat.scenes.unisharklazer.projectiles import ProjectilePool
+
+    radii = (100, 50)
+    head = (480, 340)
+    rng = numpy.random.default_rng(1)
+    print("things   every one ms   grid ms (rebuild + query)")
+    for count in counts:
+        pool = ProjectilePool(capacity=count)
+        for _ in range(count):
+            pool.throw(rng.integers(2), rng.uniform(0, 960, 2), (0, 0))
+        pool.pos[:, 1] = rng.uniform(0, 540, count)
+        grid = SpatialGrid(960, 540)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            every = pool.hits(head, radii)
+        every_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            grid.rebuild(pool.pos, pool.alive)
+            hits = pool.hits(head, radii, candidates=grid.near(head, max(radii)))
+        grid_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        assert list(hits) == list(every)
+        print("%6d %14.4f %9.4f" % (count, every_ms, grid_ms))
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,77 @@
+"""
+Sprite pool module.
+
+Sprites which are killed go back into their pool, to be used again
+for the next spawn, rather than being made from scratch each time.
+
+::Example::
+
+    >>> pool = SpritePool(Fish, size=4)
+    >>> fish = pool.acquire(allsprites)
+    >>> fish.kill()  # back into the pool.
+
+"""
+from typing import Optional
+
+from pygame.sprite import DirtySprite
+
+
+class PooledSprite(DirtySprite):
+    """
+    A DirtySprite which goes back to its pool when killed.
+    """
+
+    pool = None  # type: Optional[SpritePool]
+
+    def kill(self):
+        was_alive = self.alive()
+        DirtySprite.kill(self)
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
+
+class SpritePool:
+    """
+    Keeps killed sprites to be used again.
+
+    :param factory: called with no arguments to make a new sprite.
+    :param size: how many sprites to make up front.
+    """
+
+    def __init__(self, factory, size=0):
+        self.factory = factory
+        self.free = []
+        self.created = 0
+        self.reused = 0
+        for _ in range(size):
+            self.free.append(self._create())
+
+    def _create(self):
+        sprite = self.factory()
+        sprite.pool = self
+        self.created += 1
+        return sprite
+
+    def acquire(self, *groups):
+        """
+        Get a sprite from the pool, or a new one if it is empty.
+
+        :param groups: sprite groups to add the sprite to.
+        :return: the sprite.
+        """
+        if self.free:
+            sprite = self.free.pop()
+            self.reused += 1
+        else:
+            sprite = self._create()
+        sprite.add(*groups)
+        sprite.dirty = 1
+        return sprite
+
+    def release(self, sprite):
+        """
+        Put a sprite back in the pool. Called by PooledSprite.kill.
+
+        :param sprite: the sprite.
+        """
+        self.free.append(sprite)
@@ -0,0 +1,19 @@
+"""Shared test fixtures."""
+import pytest
+
+from stuntcat import resources
+from stuntcat.cache_paths import default_cache_path
+
+
+@pytest.fixture(autouse=True)
+def user_cache(tmp_path_factory, monkeypatch):
+    """
+    Caches go in a temp dir kept for the test run, never the user cache.
+
+    The resources caches were made on import, so they are pointed there too.
+    """
+    cache_home = tmp_path_factory.getbasetemp() / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    monkeypatch.setattr(resources.PCM_CACHE, "path", default_cache_path("sounds"))
+    monkeypatch.setattr(resources.MAP_CACHE, "path", default_cache_path("maps"))
+    return cache_home
@@ -0,0 +1,56 @@
+"""Tests for the asset cache."""
+import pygame
+
+from stuntcat.asset_cache import AssetCache, asset_bytes
+
+
+def _image(name):
+    return ("image", name, False, False)
+
+
+def test_counts_bytes_hits_and_misses():
+    """Sizes are estimated from the pixels, and lookups are counted."""
+    cache = AssetCache()
+    surf = pygame.Surface((10, 10), 0, 32)
+    assert asset_bytes(surf) == 400
+
+    cache.put(_image("a.png"), surf)
+    assert cache.get(_image("a.png")) is surf
+    assert cache.get(_image("b.png")) is None
+    assert cache.stats() == {
+        "entries": 1,
+        "bytes": 400,
+        "pinned_bytes": 0,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+    }
+
+
+def test_evicts_least_recently_used():
+    """Over budget, the oldest unused asset is dropped."""
+    cache = AssetCache(max_bytes=800)
+    for name in ("a.png", "b.png"):
+        cache.put(_image(name), pygame.Surface((10, 10), 0, 32))
+    cache.get(_image("a.png"))
+    cache.put(_image("c.png"), pygame.Surface((10, 10), 0, 32))
+
+    assert _image("a.png") in cache
+    assert _image("b.png") not in cache
+    assert cache.bytes == 800
+    assert cache.evictions == 1
+
+
+def test_pinned_assets_stay_until_released():
+    """A scene's assets are not dropped until it releases them."""
+    cache = AssetCache(max_bytes=400)
+    scene = object()
+    cache.pin(scene, [_image("a.png")])
+    cache.put(_image("a.png"), pygame.Surface((10, 10), 0, 32))
+    cache.put(_image("b.png"), pygame.Surface((10, 10), 0, 32))
+    assert _image("a.png") in cache
+    assert cache.pinned() == 400
+
+    cache.release(scene)
+    assert _image("a.png") not in cache
+    assert _image("b.png") in cache
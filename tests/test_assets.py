@@ -0,0 +1,57 @@
+"""Tests for the asset manifest and preloader."""
+import pygame
+
+from stuntcat import resources
+from stuntcat.assets import MANIFEST, Preloader, image
+from stuntcat.scenes.unisharklazer.flying_objects import Fish
+from stuntcat.scenes.unisharklazer.simulation import CatUniSimulation
+
+
+def test_manifest_files_exist():
+    """Every asset in the manifest is in the data directory."""
+    paths = {
+        "image": resources.image_path,
+        "sound": resources.sound_path,
+        "map": resources.map_path,
+    }
+    for assets in MANIFEST.values():
+        for kind, name, _, _ in assets:
+            with open(paths[kind](name), "rb"):
+                pass
+
+
+def test_manifest_has_the_cat_scene_sounds():
+    """The random sounds picked by the simulation are all listed."""
+    names = {asset[1] for asset in MANIFEST["CatUniScene"]}
+    assert set(CatUniSimulation.meow_names) <= names
+    assert set(CatUniSimulation.boing_names) <= names
+    assert {"fish_%s.png" % color for color in Fish.colors} <= names
+
+
+def test_preloader_fills_the_cache():
+    """Preloaded images are found by gfx, and progress reaches 1."""
+    pygame.init()
+    pygame.display.set_mode((32, 32))
+    preloader = Preloader([image("ring.png"), image("seat.png", convert=True)])
+    assert preloader.progress == 0.0
+    preloader.start()
+    while not preloader.done:
+        preloader.update()
+    assert preloader.progress == 1.0
+    assert resources.is_cached("image", "seat.png", convert=True)
+
+    # already loaded, so there is nothing left to preload.
+    assert Preloader([image("ring.png")]).assets == []
+
+
+def test_load_batch_converts_on_the_main_thread():
+    """Batch loaded images are converted and cached like gfx does."""
+    pygame.init()
+    screen = pygame.display.set_mode((32, 32))
+    resources.load_batch(
+        images=[("fish_red.png", False, True), ("wheel.png", True, False)],
+        max_workers=2,
+    )
+    assert resources.is_cached("image", "fish_red.png", convert_alpha=True)
+    wheel = resources.gfx("wheel.png", convert=True)
+    assert wheel.get_bitsize() == screen.get_bitsize()
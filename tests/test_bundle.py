@@ -0,0 +1,78 @@
+"""Tests for the pre-decoded image bundle."""
+import os
+
+import pygame
+
+from stuntcat import resources
+from stuntcat.bundle import ImageBundle, build_bundle
+from stuntcat.resources import image_path
+
+
+def test_bundle_images_match_the_pngs(tmp_path):
+    """Images from the bundle have the same pixels as the PNGs."""
+    images_path = os.path.dirname(image_path("shark.png"))
+    bundle_path = str(tmp_path / "images.bundle")
+    count = build_bundle(images_path, bundle_path)
+    assert count == len(os.listdir(images_path))
+
+    bundle = ImageBundle(bundle_path)
+    assert "shark.png" in bundle
+    for name in ("shark.png", "background.png", "ring.png"):
+        surf = bundle.load(name)
+        png = pygame.image.load(image_path(name))
+        assert surf.get_size() == png.get_size()
+        for pos in ((0, 0), (surf.get_width() // 2, surf.get_height() // 2)):
+            assert surf.get_at(pos) == png.get_at(pos)
+
+
+def test_drawing_does_not_change_the_bundle(tmp_path):
+    """The mapping is copy on write."""
+    images_path = os.path.dirname(image_path("shark.png"))
+    bundle_path = str(tmp_path / "images.bundle")
+    build_bundle(images_path, bundle_path)
+
+    ImageBundle(bundle_path).load("ring.png").fill((1, 2, 3, 4))
+    assert ImageBundle(bundle_path).load("ring.png").get_at((0, 0)) != (1, 2, 3, 4)
+
+
+def test_changed_images_are_not_current(tmp_path):
+    """A PNG changed after bundling is seen, even with the same size."""
+    images_path = tmp_path / "images"
+    images_path.mkdir()
+    red = pygame.Surface((4, 4))
+    red.fill((255, 0, 0))
+    pygame.image.save(red, str(images_path / "red.png"))
+    pygame.image.save(red, str(images_path / "same.png"))
+    bundle_path = str(tmp_path / "images.bundle")
+    build_bundle(str(images_path), bundle_path)
+
+    # touched, like after a checkout, but the same pixels.
+    os.utime(str(images_path / "same.png"), ns=(0, 0))
+    red.fill((0, 0, 255))
+    pygame.image.save(red, str(images_path / "red.png"))
+    os.utime(str(images_path / "red.png"), ns=(1, 1))
+
+    bundle = ImageBundle(bundle_path)
+    assert bundle.is_current("same.png", str(images_path / "same.png"))
+    assert not bundle.is_current("red.png", str(images_path / "red.png"))
+    # only the bundle was shipped.
+    missing = str(tmp_path / "missing.png")
+    assert ImageBundle(bundle_path).is_current("red.png", missing)
+
+
+def test_decode_image_skips_a_stale_bundle(tmp_path, monkeypatch):
+    """The PNG is loaded when the bundled pixels are out of date."""
+    images_path = os.path.dirname(image_path("shark.png"))
+    bundle_path = str(tmp_path / "images.bundle")
+    build_bundle(images_path, bundle_path)
+    bundle = ImageBundle(bundle_path)
+    monkeypatch.setattr(resources, "_BUNDLE", [bundle])
+
+    loaded = []
+    monkeypatch.setattr(pygame.image, "load", loaded.append)
+    resources.decode_image("ring.png")
+    assert loaded == []
+
+    monkeypatch.setattr(bundle, "_current", {"ring.png": False})
+    resources.decode_image("ring.png")
+    assert loaded == [image_path("ring.png")]
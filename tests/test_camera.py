@@ -0,0 +1,78 @@
+"""Tests for the platformer camera."""
+import pygame
+
+from stuntcat.scenes.platformer.camera import Camera
+
+
+class Chunks:
+    """Like a BakedMap, with 100 pixel chunks in a row."""
+
+    chunk_size = 100
+
+    def __init__(self, count):
+        self.chunks = {(column, 0): column for column in range(count)}
+
+    def chunk(self, column, row):
+        return self.chunks.get((column, row))
+
+    def chunk_rect(self, column, row):
+        return pygame.Rect(column * 100, row * 100, 100, 100)
+
+
+def test_camera_follows_outside_of_the_deadzone():
+    """The view moves when the point leaves the middle, inside its bounds."""
+    camera = Camera((100, 100), bounds=pygame.Rect(0, 0, 1000, 100), deadzone=0.5)
+    assert not camera.follow((50, 50))
+    assert not camera.follow((70, 50))
+    assert camera.follow((80, 50))
+    assert camera.rect.topleft == (5, 0)
+    assert camera.to_screen((80, 50)) == (75, 50)
+    assert camera.offset == (-5, 0)
+
+    camera.look_at((2000, 50))
+    assert camera.rect.right == 1000
+    assert not camera.follow(None)
+
+    bb = camera.bb()
+    assert (bb.left, bb.bottom, bb.right, bb.top) == (836, -64, 1064, 164)
+
+
+def test_camera_visible_chunks():
+    """Only the chunks under the view are looked up."""
+    camera = Camera((150, 100))
+    camera.look_at((275, 50))
+    assert [key for key, _ in camera.visible_chunks(Chunks(10))] == [
+        (2, 0),
+        (3, 0),
+    ]
+    assert camera.visible_chunks(Chunks(2)) == []
+
+
+def test_platformer_hides_sprites_the_camera_does_not_see():
+    """
+    Sprites of shapes outside of the view are hidden, and not updated,
+    but still removed with their shapes.
+    """
+    from stuntcat.game import Game
+    from stuntcat.scenes.platformer.platformer import PlatformerScene
+
+    game = Game()
+    scene = PlatformerScene(game)
+    try:
+        scene.tick(1000 / 30.0)
+        assert scene.shown and all(asprite.visible for asprite in scene.shown)
+
+        scene.camera.bounds = None
+        scene.camera.look_at((100000, 0))
+        assert scene.cull_sprites() == set()
+        assert not any(asprite.visible for asprite in scene.sprites)
+
+        # removed shapes lose their sprites, though not seen or updated.
+        asprite = next(iter(scene.shape_sprites.values()))
+        asprite.shape.needs_remove = True
+        scene.cull_sprites()
+        assert not asprite.alive()
+        assert asprite.shape not in scene.shape_sprites
+    finally:
+        scene.close()
+        game.close()
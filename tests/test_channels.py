@@ -0,0 +1,44 @@
+"""Tests for the channel manager."""
+import pygame
+import pytest
+
+from stuntcat.channels import ChannelManager
+
+SOUNDS = {
+    "shot": ("cat", 10, 1),
+    "boing": ("cat", 2, 1),
+    "meow": ("cat", 3, 1),
+}
+
+
+@pytest.fixture(name="sound")
+def fixture_sound():
+    """A second of silence, with the mixer going."""
+    pygame.mixer.init(44100, -16, 2, 512)
+    yield pygame.mixer.Sound(buffer=bytes(44100 * 4))
+    pygame.mixer.quit()
+
+
+def test_priority_steals_and_drops(sound):
+    """Full groups give way to higher priority sounds only."""
+    channels = ChannelManager(groups={"cat": 2}, sounds=SOUNDS)
+    assert channels.play(sound, "boing") is not None
+    assert channels.play(sound, "meow") is not None
+
+    # full, so the shot takes the boing channel.
+    assert channels.play(sound, "shot") is not None
+    assert channels.stolen == 1
+    # the boing is lower than everything playing, so it is dropped.
+    assert channels.play(sound, "boing") is None
+    assert channels.stats()["dropped_sounds"] == {"boing": 1}
+
+
+def test_voice_limit_restarts_the_oldest(sound):
+    """A sound at its voice limit restarts on its own channel."""
+    channels = ChannelManager(groups={"cat": 3}, sounds=SOUNDS)
+    channels.play(sound, "boing")
+    channels.play(sound, "boing")
+    assert channels.limited == 1
+    busy = [pygame.mixer.Channel(index).get_busy() for index in range(3)]
+    assert busy.count(True) == 1
+    assert pygame.mixer.get_num_channels() >= 3
@@ -0,0 +1,69 @@
+"""Tests for the dirty rect updating."""
+import pygame
+from pygame import Rect
+
+from stuntcat.dirty_rects import DirtyRectUpdater, merge_rects, union_area
+
+
+def test_union_area_counts_overlaps_once():
+    """Two 10x10 rects overlapping by 5x10 cover 150 pixels."""
+    assert union_area([Rect(0, 0, 10, 10), Rect(5, 0, 10, 10)]) == 150
+    assert union_area([Rect(0, 0, 10, 10), Rect(20, 20, 10, 10)]) == 200
+    assert union_area([Rect(0, 0, 10, 10), Rect(2, 2, 2, 2)]) == 100
+    assert union_area([]) == 0
+
+
+def test_merge_rects_leaves_no_overlaps():
+    """Chains of overlapping rects become one."""
+    rects = [Rect(0, 0, 10, 10), Rect(30, 0, 10, 10), Rect(8, 0, 25, 5)]
+    assert merge_rects(rects) == [Rect(0, 0, 40, 10)]
+    assert merge_rects([Rect(0, 0, 5, 5), Rect(10, 10, 5, 5)]) == [
+        Rect(0, 0, 5, 5),
+        Rect(10, 10, 5, 5),
+    ]
+
+
+def test_full_flip_above_the_threshold():
+    """Small updates are partial, most of the screen is a flip."""
+    pygame.display.init()
+    screen = pygame.display.set_mode((100, 100))
+    updater = DirtyRectUpdater(screen.get_rect(), full_fraction=0.5)
+
+    updater.update([Rect(0, 0, 10, 10), Rect(5, 5, 10, 10)])
+    assert not updater.full
+    assert (updater.count, updater.area, updater.overlap) == (2, 175, 25)
+    assert updater.merged == 1
+
+    updater.update([Rect(0, 0, 100, 80)])
+    assert updater.full
+    assert updater.stats()["full_frames"] == 1
+    assert "full" in updater.describe()
+
+
+def test_fit_has_an_overhead():
+    """Rect updates are fitted as a fixed time plus a time per pixel."""
+    updater = DirtyRectUpdater(Rect(0, 0, 100, 100))
+    for area in (100, 5000, 300, 8000, 2000):
+        updater._fit(area, 2.0 + 0.001 * area)  # pylint:disable=protected-access
+    assert abs(updater.ms_per_pixel - 0.001) < 1e-9
+    assert abs(updater.overhead_ms - 2.0) < 1e-6
+
+    # a flip of 7ms is worth it above 5ms of pixels, half the screen.
+    updater.full_ms = 7.0
+    assert abs(updater.threshold - 0.5) < 1e-6
+
+
+def test_rects_are_timed_again_after_many_flips():
+    """Rects are updated now and then, even when flips look faster."""
+    pygame.display.init()
+    screen = pygame.display.set_mode((100, 100))
+    updater = DirtyRectUpdater(screen.get_rect(), resample_frames=3)
+    updater.full_ms = 0.0
+    updater.ms_per_pixel = 1.0
+
+    fulls = []
+    for _ in range(5):
+        updater.update([Rect(0, 0, 10, 10)])
+        fulls.append(updater.full)
+    assert fulls[:4] == [True, True, True, False]
+    assert updater.partial_frames == 1
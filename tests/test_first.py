@@ -22,4 +22,5 @@ def test_first(pg):
 
 def test_game(pg):
     from stuntcat.game import Game
-    Game()
+    game = Game()
+    game.close()
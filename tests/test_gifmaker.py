@@ -0,0 +1,146 @@
+"""Tests for the gifmaker background encoding."""
+import threading
+
+import pygame
+
+from stuntcat.gifmaker import FrameRing, GifEncoder, GifMaker
+
+
+class FakeBackend:
+    """Remembers the frames it is given."""
+
+    def __init__(self, size, name="fake"):
+        self.size = size
+        self.output_path = "/tmp/%s.gif" % name
+        self.frames = []
+        self.finished = False
+
+    def write(self, surf):
+        """Keep the frame."""
+        self.frames.append(surf)
+
+    def finish(self):
+        """Mark as finished."""
+        self.finished = True
+
+
+def test_encoder_writes_frames_in_the_background():
+    """All queued frames are written, then the backend is finished."""
+    backends = []
+
+    def make_backend(size):
+        backends.append(FakeBackend(size))
+        return backends[-1]
+
+    encoder = GifEncoder(make_backend, max_queued=10)
+    encoder.start()
+    for _ in range(5):
+        assert encoder.add(pygame.Surface((4, 3)))
+    encoder.finish()
+    encoder.join(5)
+
+    assert encoder.done and encoder.error is None
+    assert encoder.written == 5
+    assert backends[0].size == (4, 3)
+    assert backends[0].finished
+    assert encoder.output_path == "/tmp/fake.gif"
+
+
+def test_encoder_drops_frames_when_full():
+    """Adding never blocks, frames are dropped when the queue is full."""
+    encoder = GifEncoder(FakeBackend, max_queued=2)
+    assert encoder.add(pygame.Surface((4, 3)))
+    assert encoder.add(pygame.Surface((4, 3)))
+    assert not encoder.add(pygame.Surface((4, 3)))
+    assert (encoder.captured, encoder.dropped) == (2, 1)
+
+
+def test_encoder_finish_after_an_error():
+    """Finishing never blocks when the encoder stopped with a full queue."""
+
+    def broken_backend(size):
+        raise BrokenPipeError(size)
+
+    encoder = GifEncoder(broken_backend, max_queued=2)
+    assert encoder.add(pygame.Surface((4, 3)))
+    assert encoder.add(pygame.Surface((4, 3)))
+    encoder.start()
+    encoder.join(5)
+    assert encoder.done and isinstance(encoder.error, BrokenPipeError)
+    assert encoder.add(pygame.Surface((4, 3)))
+    assert encoder.add(pygame.Surface((4, 3)))
+
+    finished = threading.Thread(target=encoder.finish, daemon=True)
+    finished.start()
+    finished.join(2)
+    assert not finished.is_alive()
+
+
+def test_gifmaker_progress():
+    """Recording with g captures frames, which are encoded after."""
+    gif_maker = GifMaker(seconds=None)
+    gif_maker._make_backend = FakeBackend  # pylint:disable=protected-access
+    screen = pygame.Surface((8, 6))
+    key_g = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_g)
+
+    gif_maker.update([key_g], screen)
+    gif_maker.update([], screen)
+    assert gif_maker.progress()["recording"]
+    assert gif_maker.progress()["captured"] == 2
+
+    gif_maker.update([key_g], screen)
+    gif_maker.wait()
+    progress = gif_maker.progress()
+    assert not progress["recording"]
+    assert progress["encoding"] == 0
+
+
+def test_gifmaker_names_each_gif():
+    """Gifs saving at the same time have their own output and PNG names."""
+    gif_maker = GifMaker(path="/tmp", stream=False)
+    # pylint:disable=protected-access
+    first = gif_maker._make_backend((4, 3), gif_maker._next_name())
+    second = gif_maker._make_backend((4, 3), gif_maker._next_name())
+    assert first.output_path != second.output_path
+    assert first.prefix != second.prefix
+    assert first.output_path.startswith("/tmp/anim-")
+
+
+def test_frame_ring_keeps_the_last_frames():
+    """The ring reuses its frames, keeping the newest, oldest first."""
+    screen = pygame.Surface((8, 6))
+    ring = FrameRing(screen, 3, scale=0.5)
+    frames = list(ring.frames)
+    assert frames[0].get_size() == (4, 3)
+    assert ring.nbytes == 3 * 3 * frames[0].get_pitch()
+
+    for shade in range(5):
+        screen.fill((shade, shade, shade))
+        ring.capture(screen)
+
+    assert len(ring) == 3
+    assert [frame.get_at((0, 0))[0] for frame in ring.ordered()] == [2, 3, 4]
+    assert ring.frames == frames
+
+
+def test_instant_replay_saves_the_ring():
+    """The instant replay key encodes the frames kept in the ring."""
+    gif_maker = GifMaker(fps=10, replay_seconds=0.5)
+    gif_maker._make_backend = FakeBackend  # pylint:disable=protected-access
+    screen = pygame.Surface((8, 6))
+    for _ in range(8):
+        gif_maker.update([], screen)
+    assert len(gif_maker.ring) == 5
+
+    key_h = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_h)
+    gif_maker.update([key_h], screen)
+    gif_maker.wait()
+    assert gif_maker._saving_replay.written == 5  # pylint:disable=protected-access
+
+    # capturing goes on in the spare ring, without making new frames.
+    frames = list(gif_maker._spare_ring.frames)  # pylint:disable=protected-access
+    assert len(gif_maker.ring) == 1
+    gif_maker.update([key_h], screen)
+    gif_maker.wait()
+    assert gif_maker.ring.frames == frames
+    assert len(gif_maker.ring) == 1
@@ -0,0 +1,20 @@
+"""Tests for lazy importing of the scenes."""
+from stuntcat import scenes
+from stuntcat.import_times import import_times
+
+
+def test_scenes_load_by_name():
+    """Every registered scene can be imported."""
+    for name in scenes.SCENES:
+        scene_class = scenes.load_scene(name)
+        assert scene_class.__name__ == name
+        assert issubclass(scene_class, scenes.Scene)
+    assert scenes.CatUniScene is scenes.load_scene("CatUniScene")
+
+
+def test_game_does_not_import_the_platformer():
+    """pymunk and pytmx wait until the platformer is played."""
+    names = {name.strip() for _, _, name in import_times("stuntcat.game")}
+    assert "stuntcat.game" in names
+    assert "stuntcat.scenes.unisharklazer" in names
+    assert not names & {"pymunk", "pytmx", "stuntcat.scenes.platformer.platformer"}
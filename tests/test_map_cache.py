@@ -0,0 +1,83 @@
+"""Tests for the baked map cache."""
+import os
+import shutil
+
+import pygame
+
+from stuntcat.cache_paths import file_hash
+from stuntcat.map_cache import MapCache
+from stuntcat.resources import map_path
+
+TILED_MAP = """<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.0" orientation="orthogonal" renderorder="right-down"
+ width="20" height="2" tilewidth="32" tileheight="32" nextobjectid="2">
+ <tileset firstgid="1" name="red" tilewidth="32" tileheight="32" tilecount="1"
+  columns="1">
+  <image source="red.png" width="32" height="32"/>
+ </tileset>
+ <layer name="ground" width="20" height="2">
+  <data encoding="csv">
+0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,0,0,0
+  </data>
+ </layer>
+ <objectgroup name="objects">
+  <object id="1" type="fixed" x="0" y="32" width="640" height="32"/>
+ </objectgroup>
+</map>
+"""
+
+
+def test_maps_are_baked_once(tmp_path):
+    """The map is parsed and drawn once, then loads from the baked file."""
+    pygame.display.init()
+    pygame.display.set_mode((32, 32))
+    red = pygame.Surface((32, 32))
+    red.fill((255, 0, 0))
+    pygame.image.save(red, str(tmp_path / "red.png"))
+    tmx_path = str(tmp_path / "ground.tmx")
+    with open(tmx_path, "w") as tmx_file:
+        tmx_file.write(TILED_MAP)
+
+    map_cache = MapCache(str(tmp_path / "cache"), chunk_size=256)
+    baked = map_cache.load(tmx_path)
+    assert (map_cache.hits, map_cache.misses) == (0, 1)
+    baked = map_cache.load(tmx_path)
+    assert (map_cache.hits, map_cache.misses) == (1, 1)
+    assert baked.source_hash == file_hash(tmx_path)
+
+    assert (baked.width, baked.height, baked.tilewidth) == (20, 2, 32)
+    assert [(obj.type, obj.width) for obj in baked.objects] == [("fixed", 640)]
+    # tiles at x 0 and 512, each in its own chunk.
+    assert sorted(baked.chunks) == [(0, 0), (2, 0)]
+    assert baked.chunks[(0, 0)].get_at((0, 40)) == (255, 0, 0, 255)
+    assert baked.chunks[(0, 0)].get_at((40, 40))[3] == 0
+    assert baked.chunk_rect(2, 0).topleft == (512, 0)
+
+    # chunks are converted for the display once, when first drawn.
+    mapped = baked.chunks[(0, 0)]
+    chunk = baked.chunk(0, 0)
+    assert chunk is not mapped
+    assert chunk.get_at((0, 40)) == (255, 0, 0, 255)
+    assert baked.chunk(0, 0) is chunk
+    assert baked.chunk(1, 0) is None
+
+    # a changed map is baked again.
+    with open(tmx_path, "a") as tmx_file:
+        tmx_file.write("\n")
+    map_cache.load(tmx_path)
+    assert map_cache.misses == 2
+    assert len(os.listdir(str(tmp_path / "cache"))) == 2
+
+
+def test_maps_without_tiles(tmp_path):
+    """A map with no tiles has no chunks."""
+    tmx_path = str(tmp_path / "untitled.tmx")
+    shutil.copy(map_path("untitled.tmx"), tmx_path)
+    map_cache = MapCache(str(tmp_path / "cache"))
+    map_cache.load(tmx_path)
+    baked = map_cache.load(tmx_path)
+    assert map_cache.hits == 1
+    assert not baked.chunks
+    assert len(baked.objects) == 7
+    assert baked.filename == tmx_path
@@ -0,0 +1,36 @@
+"""Tests for the decoded sound cache."""
+import os
+
+import pygame
+
+from stuntcat.pcm_cache import PcmCache
+from stuntcat.resources import sound_path
+
+
+def test_second_load_comes_from_the_cache(tmp_path):
+    """Sounds decode once, then load from the saved samples."""
+    pygame.mixer.init(44100, -16, 2, 512)
+    try:
+        pcm_cache = PcmCache(str(tmp_path))
+        first = pcm_cache.load(sound_path("boo.ogg"))
+        assert (pcm_cache.hits, pcm_cache.misses) == (0, 1)
+        assert len(os.listdir(str(tmp_path))) == 1
+
+        second = pcm_cache.load(sound_path("boo.ogg"))
+        assert (pcm_cache.hits, pcm_cache.misses) == (1, 1)
+        assert second.get_raw() == first.get_raw()
+    finally:
+        pygame.mixer.quit()
+
+
+def test_key_has_the_mixer_format(tmp_path):
+    """A different mixer format needs a different cache file."""
+    pcm_cache = PcmCache(str(tmp_path))
+    pygame.mixer.init(44100, -16, 2, 512)
+    stereo = pcm_cache.key(sound_path("boo.ogg"))
+    pygame.mixer.quit()
+    pygame.mixer.init(22050, -16, 1, 512)
+    mono = pcm_cache.key(sound_path("boo.ogg"))
+    pygame.mixer.quit()
+    assert stereo != mono
+    assert stereo.split("-")[0] == mono.split("-")[0]
@@ -0,0 +1,38 @@
+"""Tests for the platformer physics profiles."""
+import pytmx
+
+from stuntcat import resources
+from stuntcat.scenes.platformer.physics import (
+    PROFILES,
+    PhysicsProfile,
+    add_static_boxes,
+    load_space,
+)
+
+
+def test_physics_profile():
+    """Spaces get the profile settings, and static boxes share a body."""
+    space = PhysicsProfile(iterations=5, sleep_time=0.5).make_space()
+    assert space.iterations == 5
+    assert space.sleep_time_threshold == 0.5
+
+    rects = [(0, 0, 32, 32), (64, 0, 32, 64)]
+    shapes = add_static_boxes(space, rects, PROFILES["default"])
+    assert {shape.body for shape in shapes} == {space.static_body}
+    assert shapes[1].bb.left == 64 and shapes[1].bb.top == 64
+
+    space = PROFILES["plain"].make_space()
+    shapes = add_static_boxes(space, rects, PROFILES["plain"])
+    assert len({shape.body for shape in shapes}) == 2
+
+
+def test_benchmark_map_settles():
+    """The yarn balls of the benchmark map fall asleep."""
+    tmxdata = pytmx.TiledMap(resources.map_path("benchmark.tmx"))
+    assert PROFILES["hash"].hash_size(tmxdata) == (64, 8780)
+
+    space, balls = load_space(tmxdata, PROFILES["default"])
+    assert len(balls) == 200
+    for _ in range(600):
+        space.step(1 / 300.0)
+    assert any(ball.is_sleeping for ball in balls)
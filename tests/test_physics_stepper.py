@@ -0,0 +1,63 @@
+"""Tests for the platformer physics stepper."""
+import math
+
+import pymunk
+
+from stuntcat.scenes.platformer.stepper import PhysicsStepper
+
+
+def test_physics_stepper_accumulates_time():
+    """Frame time is used up in fixed frames, dropping what can not catch up."""
+    space = pymunk.Space()
+    stepper = PhysicsStepper(space, frame_ms=10, max_frames=3)
+    assert stepper.advance(5) == 0
+    assert stepper.advance(25) == 3
+    assert stepper.accumulator == 0
+    assert stepper.advance(100) == 3
+    assert stepper.stats()["dropped_ms"] == 70
+    assert stepper.total_frames == 6
+
+
+def test_physics_stepper_substeps():
+    """Fast bodies and changing joint forces get more substeps."""
+    stepper = PhysicsStepper(
+        pymunk.Space(), min_substeps=4, max_substeps=30, max_travel=4.0
+    )
+    assert stepper.pick_substeps(0, 0) == 4
+    # 1200 pixels a second moves 40 pixels in a 1/30 second frame.
+    assert stepper.pick_substeps(1200, 0) == 10
+    assert stepper.pick_substeps(0, stepper.stress_force) == 30
+    assert stepper.pick_substeps(100000, 0) == 30
+
+    space = pymunk.Space()
+    body = pymunk.Body(1, 1)
+    space.add(body, pymunk.Circle(body, 5))
+    stepper = PhysicsStepper(space)
+    stepper.advance(1000 / 30.0)
+    assert stepper.steps == 30
+    stepper.advance(1000 / 30.0)
+    assert stepper.steps == 4
+
+    # a fast body gets more substeps in the same frame.
+    body.velocity = 1200, 0
+    stepper.advance(1000 / 30.0)
+    assert stepper.steps == 10
+
+
+def test_physics_stepper_drawn_position():
+    """Bodies are drawn between their last two physics frames, by alpha."""
+    space = pymunk.Space()
+    body = pymunk.Body(1, 1)
+    body.velocity = 300, 0
+    space.add(body, pymunk.Circle(body, 5))
+    stepper = PhysicsStepper(space, frame_ms=10)
+    assert stepper.drawn_position(body) == (0, 0)
+
+    stepper.advance(12.5)
+    assert stepper.alpha == 0.25
+    # 300 pixels a second is 3 pixels a physics frame.
+    assert math.isclose(body.position.x, 3)
+    assert math.isclose(stepper.drawn_position(body)[0], 0.75)
+
+    stepper.advance(5)
+    assert math.isclose(stepper.drawn_position(body)[0], 2.25)
@@ -0,0 +1,66 @@
+"""Tests for the platformer shape sprites."""
+import math
+
+import pygame
+import pymunk
+
+from stuntcat.scenes.platformer.sprite import ROTATIONS, ShapeSprite
+from stuntcat.scenes.platformer.stepper import PhysicsStepper
+
+
+def test_shape_sprite_dirty_only_when_moved_or_turned():
+    """Sprites are only redrawn when their shape moved or turned."""
+    body = pymunk.Body(1, 1)
+    body.position = 50, 50
+    shape = pymunk.Circle(body, 10)
+    shape.cache_bb()
+    asprite = ShapeSprite(pygame.Surface((20, 20)), shape)
+
+    asprite.update()
+    assert asprite.dirty == 1 and asprite.rect.center == (50, 50)
+
+    asprite.dirty = 0
+    asprite.update()
+    assert asprite.dirty == 0
+
+    body.position = 60, 50
+    shape.cache_bb()
+    asprite.update()
+    assert asprite.dirty == 1 and asprite.rect.center == (60, 50)
+
+    asprite.dirty = 0
+    body.angle = 1.0
+    asprite.update()
+    assert asprite.dirty == 1
+
+
+def test_shape_sprite_prewarm_covers_a_turn():
+    """After prewarm, turning all the way around rotates nothing more."""
+    body = pymunk.Body(1, 1)
+    shape = pymunk.Circle(body, 10)
+    shape.cache_bb()
+    asprite = ShapeSprite(pygame.Surface((20, 20)), shape)
+    asprite.prewarm()
+
+    misses = ROTATIONS.misses
+    for angle in range(-720, 721, 7):
+        body.angle = math.radians(angle + 0.3)
+        asprite.update()
+    assert ROTATIONS.misses == misses
+
+
+def test_shape_sprite_drawn_between_physics_frames():
+    """With the stepper, sprites are drawn where its alpha puts the body."""
+    space = pymunk.Space()
+    body = pymunk.Body(1, 1)
+    body.position = 50, 50
+    body.velocity = 600, 0
+    shape = pymunk.Circle(body, 10)
+    space.add(body, shape)
+    stepper = PhysicsStepper(space, frame_ms=10)
+    stepper.advance(15)
+    asprite = ShapeSprite(pygame.Surface((20, 20)), shape)
+
+    asprite.update(offset=(-50, 0), stepper=stepper)
+    # half way from x 50 to 56.
+    assert asprite.rect.center == (3, 50)
@@ -0,0 +1,38 @@
+"""Tests for the frame profiler."""
+import pygame
+
+from stuntcat.profiler import FrameProfiler, percentile
+
+
+def test_percentile():
+    """Percentiles of the samples, and 0 without any."""
+    samples = list(range(100))
+    assert percentile(samples, 0.5) == 50
+    assert percentile(samples, 0.99) == 99
+    assert percentile([], 0.5) == 0.0
+
+
+def test_profiler(tmpdir):
+    """Phases are timed in a window, drawn over the screen, and exported."""
+    pygame.init()
+    profiler = FrameProfiler(window=10, keep_frames=True)
+    for _ in range(20):
+        with profiler.phase("tick"):
+            pass
+        with profiler.phase("tick"):
+            pass
+        profiler.end_frame()
+    assert len(profiler.samples["tick"]) == 10
+    assert set(profiler.percentiles("tick")) == {"p50", "p95", "p99"}
+
+    screen = pygame.Surface((200, 100))
+    screen.fill((1, 2, 3))
+    profiler.event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3))
+    assert profiler.draw(screen)
+    profiler.restore(screen)
+    assert screen.get_at((0, 0)) == (1, 2, 3)
+
+    path = str(tmpdir.join("timings.csv"))
+    profiler.export(path)
+    with open(path) as csv_file:
+        assert len(csv_file.readlines()) == 21
@@ -0,0 +1,110 @@
+"""Recording games and playing them back."""
+import pygame
+
+from stuntcat.game import Game
+from stuntcat.replay import ReplayPlayer, ReplayRecorder, replay_check
+
+
+def _key(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=0)
+
+
+def _record(path, frames, start=None):
+    """
+    Record frames through Game.frame, from the loading scene.
+
+    :param start: called on the game before the first frame.
+    """
+    game = Game(seed=42)
+    game.FPS = 0
+    game.recorder = ReplayRecorder(path, game.seed)
+    if start is not None:
+        start(game)
+    for time_delta, events in frames:
+        game.frame(time_delta, events)
+    game.recorder.close(game)
+    return game
+
+
+def _play(path):
+    """Play a replay in a new game, returning the player."""
+    replayed = ReplayPlayer(path)
+    game = Game(seed=replayed.seed)
+    replayed.play(game)
+    assert replay_check(game) == replayed.check
+    return replayed
+
+
+def test_replay(tmpdir):
+    """A replay plays back to the same state as it was recorded."""
+    path = str(tmpdir.join("game.replay"))
+    frames = [
+        (33.0, []),
+        (16.5, [_key(pygame.K_RIGHT)]),
+        (41.25, [_key(pygame.K_a)]),
+    ] * 20
+
+    game = Game(seed=42)
+    game.FPS = 0
+    game.scenes[0].next_scene()
+    recorder = ReplayRecorder(path, game.seed)
+    for time_delta, events in frames:
+        game.tick(time_delta)
+        game.render()
+        game.events(events)
+        recorder.record(time_delta, events)
+    recorder.close(game)
+
+    replayed = _play(path)
+    assert replayed.seed == 42
+    assert replayed.frames[1][1][0].key == pygame.K_RIGHT
+    assert replayed.check["steps"] > 0
+
+
+def test_replay_from_loading_event(tmpdir):
+    """
+    The cat scene started by an event records the events after it,
+    in a frame without a tick or render.
+    """
+    path = str(tmpdir.join("game.replay"))
+    frames = [(33.0, [_key(pygame.K_SPACE), _key(pygame.K_RIGHT)])] + [
+        (33.0, []),
+        (16.5, [_key(pygame.K_LEFT)]),
+        (41.25, [_key(pygame.K_d)]),
+    ] * 20
+
+    game = _record(path, frames)
+    assert game.cat_scene is not None
+
+    replayed = _play(path)
+    time_delta, events, render = replayed.frames[0]
+    assert time_delta is None
+    assert not render
+    assert [event.key for event in events] == [pygame.K_RIGHT]
+    assert len(replayed.frames) == len(frames)
+    assert replayed.check["steps"] > 0
+
+
+def test_replay_from_loading_tick(tmpdir):
+    """The cat scene started by a tick records its first render and events."""
+    path = str(tmpdir.join("game.replay"))
+    frames = [(33.0, [_key(pygame.K_RIGHT)])] + [
+        (33.0, []),
+        (16.5, [_key(pygame.K_LEFT)]),
+        (41.25, [_key(pygame.K_d)]),
+    ] * 20
+
+    def start(game):
+        # the loading scene waits for its music and the preloader.
+        pygame.mixer.music.stop()
+        game.scenes[0].preloader.finish()
+
+    game = _record(path, frames, start)
+    assert game.cat_scene is not None
+
+    replayed = _play(path)
+    time_delta, events, render = replayed.frames[0]
+    assert time_delta is None
+    assert render
+    assert [event.key for event in events] == [pygame.K_RIGHT]
+    assert replayed.check["steps"] > 0
@@ -0,0 +1,43 @@
+"""Tests for the rotated image cache."""
+import pygame
+
+from stuntcat.rotation_cache import RotationCache
+
+
+def test_rotation_cache():
+    """Angles round to the resolution, and old rotations are dropped."""
+    image = pygame.Surface((10, 20))
+    rotations = RotationCache(resolution=5.0, max_entries=2)
+    first = rotations.get(image, 41)
+    assert rotations.get(image, 39) is first  # both round to 40.
+    assert first.get_size() == pygame.transform.rotate(image, 40).get_size()
+    assert (rotations.hits, rotations.misses) == (1, 1)
+
+    rotations.get(image, 0)
+    rotations.get(image, 90)
+    assert len(rotations) == 2 and rotations.evictions == 1
+
+    rotations.prewarm([image], -10, 10)
+    assert rotations.stats()["entries"] == 2
+
+
+def test_rotation_cache_max_bytes():
+    """The pixel memory kept stays within max_bytes."""
+    image = pygame.Surface((10, 10), 0, 32)
+    rotations = RotationCache(max_bytes=1000)
+    rotations.get(image, 0)
+    assert rotations.bytes == 400
+    rotations.prewarm([image], 0, 10)
+    assert rotations.bytes <= 1000 and rotations.evictions > 0
+
+
+def test_rotation_cache_prewarm_steps():
+    """Prewarming a step at a time skips the angles already rotated."""
+    image = pygame.Surface((10, 10), 0, 32)
+    rotations = RotationCache()
+    steps = rotations.prewarm_steps([image], -2, 2)
+    assert len(rotations) == 0
+    assert next(steps) == (image, -2)
+    rotations.get(image, 0)
+    assert list(steps) == [(image, -1), (image, 1), (image, 2)]
+    assert len(rotations) == 5 and rotations.misses == 1
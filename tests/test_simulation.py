@@ -0,0 +1,98 @@
+"""Tests for the headless cat unicycle simulation."""
+from stuntcat.scenes.unisharklazer.projectiles import FISH, NOT_FISH, ProjectilePool
+from stuntcat.scenes.unisharklazer.simulation import (
+    CatUniSimulation,
+    FixedTimestep,
+    STEP_MS,
+)
+
+
+def state(sim):
+    """What should be the same in two runs of the same game."""
+    pd = sim.player_data
+    return (
+        sim.total_time,
+        pd.score,
+        pd.cat_location[:],
+        pd.cat_angle,
+        sim.projectiles.pos[sim.projectiles.alive].tolist(),
+        sim.shark.get_state(),
+    )
+
+
+def test_fixed_timestep():
+    """Frame times become whole steps, with the rest kept as alpha."""
+    timestep = FixedTimestep(step=10, max_steps=3)
+    assert timestep.advance(25) == 2
+    assert timestep.alpha == 0.5
+    assert timestep.advance(5) == 1
+    assert timestep.advance(1000) == 3
+    assert timestep.accumulator < 10
+
+
+def test_projectile_pool():
+    """Projectiles grow the pool, move, hit, and reuse dead slots."""
+    pool = ProjectilePool(capacity=2)
+    fish = pool.throw(FISH, (0, 0), (1, 0))
+    ring = pool.throw(NOT_FISH, (200, 0), (0, 0))
+    pool.throw(NOT_FISH, (0, 1000), (0, 0))
+    assert pool.capacity == 4
+    assert pool.count(NOT_FISH) == 2
+    pool.integrate(1.0, 0.0)
+    assert list(pool.cull_below(500)) == [2]
+    assert list(pool.hits((0, 0), (10, 10))) == [fish]
+    assert list(pool.hits((200, 0), (1000, 10))) == [fish, ring]
+    serial = pool.serial[fish]
+    pool.kill(fish)
+    assert pool.throw(FISH, (0, 0), (0, 0)) == fish
+    assert not pool.is_alive(fish, serial)
+
+
+def test_same_seed_same_game():
+    """The same seed plays the same game."""
+    sim_a = CatUniSimulation(960, 540, seed=3)
+    sim_b = CatUniSimulation(960, 540, seed=3)
+    sim_a.run(30 * 1000)
+    sim_b.run(30 * 1000)
+    assert state(sim_a) == state(sim_b)
+
+
+def test_frame_rate_independent():
+    """ 30fps and 60fps frame times give the same game."""
+    sim_a = CatUniSimulation(960, 540, seed=5)
+    sim_b = CatUniSimulation(960, 540, seed=5)
+    sim_a.right_pressed = sim_b.right_pressed = True
+    for _ in range(100):
+        sim_a.update(STEP_MS * 2)
+    for _ in range(200):
+        sim_b.update(STEP_MS)
+    assert state(sim_a) == state(sim_b)
+
+
+def test_shark_and_cues():
+    """The shark fires, and its sounds are cued for the scene to play."""
+    sim = CatUniSimulation(960, 540, seed=7)
+    sim.player_data._score = 60
+    seen = set()
+    for _ in range(2000):
+        sim.step()
+        seen.add(sim.shark.get_state())
+        sim.player_data._score = max(sim.player_data.score, 60)
+    assert "fire laser" in seen
+    names = [name for _, name, _ in sim.pop_cues()]
+    assert "shark_lazer.ogg" in names
+    assert sim.pop_cues() == []
+
+
+def test_reset_on_death_is_not_interpolated():
+    """The cat is drawn at the start after dying, not across the jump."""
+    sim = CatUniSimulation(960, 540, seed=1)
+    start_head = sim.player_data.cat_head_location[:]
+    sim.player_data.cat_location = [100, 600]
+    sim.player_data.cat_angle = 1.0
+    sim.step()
+    pd = sim.player_data
+    assert pd.cat_location[0] != 100
+    assert pd.last_cat_head_location == pd.cat_head_location
+    assert pd.cat_head_location == start_head
+    assert pd.last_cat_angle == pd.cat_angle == 0
@@ -0,0 +1,35 @@
+"""Tests for the spatial grid."""
+import numpy
+
+from stuntcat.scenes.unisharklazer.projectiles import ProjectilePool
+from stuntcat.scenes.unisharklazer.spatial_grid import INF, SpatialGrid
+
+
+def test_near_finds_the_same_hits_as_testing_every_one():
+    """The grid only narrows down, it never misses a hit."""
+    rng = numpy.random.RandomState(2)
+    pool = ProjectilePool(capacity=200)
+    for _ in range(200):
+        # some outside of the play area too.
+        pool.throw(rng.randint(2), rng.uniform(-200, 1160, 2), (0, 0))
+    pool.kill(3)
+    grid = SpatialGrid(960, 540, cell_size=100)
+    grid.rebuild(pool.pos, pool.alive)
+
+    for head in ((0, 0), (480, 270), (950, 530), (-50, 600)):
+        candidates = grid.near(head, 100)
+        assert 3 not in candidates
+        assert len(candidates) < 200
+        every = pool.hits(head, (100, 50))
+        assert list(pool.hits(head, (100, 50), candidates=candidates)) == list(every)
+
+
+def test_zones():
+    """Points are in zones, not counting the edges."""
+    grid = SpatialGrid(960, 540)
+    grid.add_zone("stomp left", (-INF, -INF, 480, INF))
+    grid.add_zone("lazer", (-INF, 437, INF, INF))
+    assert grid.zones_at((10, -500)) == ["stomp left"]
+    assert sorted(grid.zones_at((10, 440))) == ["lazer", "stomp left"]
+    assert grid.zones_at((480, 437)) == []
+    assert grid.in_zone("lazer", (5000, 5000))
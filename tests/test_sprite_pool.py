@@ -0,0 +1,20 @@
+"""Tests for the pools of reused sprites."""
+from pygame.sprite import LayeredDirty
+
+from stuntcat.scenes.unisharklazer.sprite_pool import PooledSprite, SpritePool
+
+
+def test_kill_releases_to_pool():
+    """Killed sprites go back to the pool once, and are reused first."""
+    group = LayeredDirty()
+    pool = SpritePool(PooledSprite, size=1)
+    sprite = pool.acquire(group)
+    assert sprite in group and pool.created == 1 and pool.reused == 1
+
+    sprite.kill()
+    sprite.kill()  # killing twice only releases it once.
+    assert pool.free == [sprite]
+
+    assert pool.acquire(group) is sprite
+    pool.acquire(group)
+    assert pool.created == 2 and len(group) == 2
@@ -0,0 +1,67 @@
+"""Tests for merging the fixed boxes of maps."""
+import os
+import shutil
+
+import pytmx
+
+from stuntcat import resources
+from stuntcat.cache_paths import file_hash
+from stuntcat.scenes.platformer.static_geometry import (
+    cache_path,
+    map_boxes,
+    merge_boxes,
+    static_boxes,
+)
+
+
+def area(boxes):
+    """The area the boxes cover, counting overlaps twice."""
+    return sum(width * height for _, _, width, height in boxes)
+
+
+def test_merge_boxes():
+    """Touching and overlapping boxes join into fewer boxes."""
+    # a floor of four tiles, and a wall overlapping its left end.
+    floor = [(x, 96, 32, 32) for x in range(0, 128, 32)]
+    wall = [(0, 0, 32, 128)]
+    merged = merge_boxes(floor + wall)
+    assert merged == [(0, 0, 32, 96), (0, 96, 128, 32)]
+    assert area(merged) == 32 * 128 + 96 * 32
+
+    # apart boxes stay apart.
+    assert merge_boxes([(0, 0, 10, 10), (20, 0, 10, 10)]) == [
+        (0, 0, 10, 10),
+        (20, 0, 10, 10),
+    ]
+    assert merge_boxes([]) == []
+
+
+def test_static_boxes_cached(tmpdir):
+    """Merged boxes are saved in the cache dir, by the hash of the map."""
+    tmx_path = str(tmpdir.join("untitled.tmx"))
+    shutil.copy(resources.map_path("untitled.tmx"), tmx_path)
+    tmxdata = pytmx.TiledMap(tmx_path)
+    cache_dir = str(tmpdir.join("cache"))
+
+    boxes = static_boxes(tmxdata, cache_dir)
+    saved = cache_path(tmx_path, file_hash(tmx_path), cache_dir)
+    assert os.listdir(cache_dir) == [os.path.basename(saved)]
+    assert static_boxes(tmxdata, cache_dir) == boxes
+    # nothing is written next to the map.
+    assert sorted(os.listdir(str(tmpdir))) == ["cache", "untitled.tmx"]
+
+    # a changed map is merged again, saved by its new hash.
+    with open(tmx_path, "a", encoding="utf-8") as tmx_file:
+        tmx_file.write("\n")
+    assert static_boxes(tmxdata, cache_dir) == boxes
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_static_boxes_of_a_baked_map(tmpdir):
+    """A baked map's hash is used, so the .tmx isn't hashed again."""
+    tmxdata = pytmx.TiledMap(resources.map_path("untitled.tmx"))
+    tmxdata.source_hash = "baked"
+    cache_dir = str(tmpdir.join("cache"))
+    boxes = static_boxes(tmxdata, cache_dir)
+    assert os.listdir(cache_dir) == ["untitled-baked.static.json"]
+    assert boxes == merge_boxes(map_boxes(tmxdata))